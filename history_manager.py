@@ -1,12 +1,20 @@
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from tabulate import tabulate
 from typing import List, Optional, Dict, Any
 
+# Serialises read-modify-write of history.json between threads (background jobs, the Studio page)
+_history_lock = threading.Lock()
+
 class HistoryManager:
     def __init__(self, history_file='.mydb/history.json'):
         self.history_file = history_file
+        # Parsed entries and the (inode, mtime, size) of the file they were read from
+        self._cache = None
+        self._cache_key = None
         self._ensure_history_file()
 
     def _ensure_history_file(self):
@@ -16,8 +24,13 @@ class HistoryManager:
             with open(self.history_file, 'w') as f:
                 json.dump([], f)
 
-    def add_entry(self, command, details, status='success', error=None):
-        """Add a new entry to history"""
+    def add_entry(self, command, details, status='success', error=None, data=None, started_at=None):
+        """
+        Add a new entry to history, optionally with structured data (e.g. a migration profile).
+
+        When started_at (a time.monotonic() reading taken as the operation began) is
+        given, the entry records the operation's duration for latency statistics.
+        """
         entry = {
             'timestamp': datetime.now().isoformat(),
             'command': command,
@@ -25,41 +38,141 @@ class HistoryManager:
             'status': status,
             'error': error
         }
-        
-        history = self._read_history()
-        history.append(entry)
-        self._write_history(history)
+        if started_at is not None:
+            entry['duration'] = round(time.monotonic() - started_at, 3)
+        if data is not None:
+            entry['data'] = data
+
+        with _history_lock:
+            history = self._read_history()
+            history.append(entry)
+            self._write_history(history)
+
+    def _file_key(self):
+        stat = os.stat(self.history_file)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
 
     def _read_history(self):
-        """Read history from file"""
-        with open(self.history_file, 'r') as f:
-            return json.load(f)
+        """Read history from file, reusing the parsed entries while the file is unchanged"""
+        key = self._file_key()
+        if key != self._cache_key:
+            with open(self.history_file, 'r') as f:
+                self._cache = json.load(f)
+            self._cache_key = key
+        return list(self._cache)
 
     def _write_history(self, history):
-        """Write history to file"""
-        with open(self.history_file, 'w') as f:
+        """Write history to file, replacing it atomically so readers never see a partial file"""
+        temp_path = f"{self.history_file}.tmp"
+        with open(temp_path, 'w') as f:
             json.dump(history, f, indent=2)
+        os.replace(temp_path, self.history_file)
+        self._cache = list(history)
+        self._cache_key = self._file_key()
+
+    @staticmethod
+    def _format_entry(entry):
+        timestamp = datetime.fromisoformat(entry['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        status_symbol = '✓' if entry['status'] == 'success' else '✗'
+        return [
+            timestamp,
+            status_symbol,
+            entry['command'],
+            entry['details'],
+            entry['error'] if entry['error'] else ''
+        ]
 
     def get_history(self, limit=None):
         """Get formatted history"""
         history = self._read_history()
         if limit:
             history = history[-limit:]
-        
-        formatted_entries = []
-        for entry in history:
-            timestamp = datetime.fromisoformat(entry['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
-            status_symbol = '✓' if entry['status'] == 'success' else '✗'
-            formatted_entries.append([
-                timestamp,
-                status_symbol,
-                entry['command'],
-                entry['details'],
-                entry['error'] if entry['error'] else ''
-            ])
-        
-        return formatted_entries
+        return [self._format_entry(entry) for entry in history]
+
+    def get_commands(self) -> List[str]:
+        """Distinct command names in the history, sorted"""
+        return sorted({entry['command'] for entry in self._read_history()})
+
+    def get_durations(self, since: Optional[datetime] = None) -> Dict[str, List[float]]:
+        """
+        Recorded command durations, for latency statistics.
+
+        Args:
+            since (datetime, optional): Only entries at or after this time
+
+        Returns:
+            dict: Command name to the durations (seconds) of its entries that recorded one
+        """
+        since_text = since.isoformat() if since else None
+        durations = {}
+        for entry in self._read_history():
+            if entry.get('duration') is None or (since_text and entry['timestamp'] < since_text):
+                continue
+            durations.setdefault(entry['command'], []).append(entry['duration'])
+        return durations
+
+    def query_history(self, command: Optional[str] = None, status: Optional[str] = None,
+                      since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      offset: int = 0, limit: int = 50):
+        """
+        Get one page of formatted history entries matching the filters, newest first.
+
+        Args:
+            command (str, optional): Only entries of this command
+            status (str, optional): 'success' for successful entries, 'failed' for all others
+            since (datetime, optional): Only entries at or after this time
+            until (datetime, optional): Only entries before this time
+            offset (int): Matching entries to skip
+            limit (int): Maximum entries returned
+
+        Returns:
+            tuple: (total number of matching entries, formatted entries of the page)
+        """
+        # ISO timestamps sort as text, so the date filter needs no parsing
+        since_text = since.isoformat() if since else None
+        until_text = until.isoformat() if until else None
+
+        total = 0
+        page = []
+        for entry in reversed(self._read_history()):
+            if command and entry['command'] != command:
+                continue
+            if status and (entry['status'] == 'success') != (status == 'success'):
+                continue
+            if since_text and entry['timestamp'] < since_text:
+                continue
+            if until_text and entry['timestamp'] >= until_text:
+                continue
+            if offset <= total < offset + limit:
+                page.append(self._format_entry(entry))
+            total += 1
+        return total, page
     
+    def get_migration_profile(self, branch, migration_number, direction='up') -> Optional[Dict[str, Any]]:
+        """
+        Find the per-statement profile of the latest run of a migration.
+
+        Args:
+            branch (str): Branch the migration belongs to
+            migration_number (int): Migration number
+            direction (str): 'up' for applies, 'down' for rollbacks
+
+        Returns:
+            dict: {'timestamp', 'command', 'statements'} or None if no profiled run is recorded
+        """
+        for entry in reversed(self._read_history()):
+            data = entry.get('data') or {}
+            if data.get('direction') != direction:
+                continue
+            for migration in data.get('migrations', []):
+                if migration.get('branch') == branch and migration.get('number') == migration_number:
+                    return {
+                        'timestamp': entry['timestamp'],
+                        'command': entry['command'],
+                        'statements': migration.get('statements', [])
+                    }
+        return None
+
     def clear_history(self, before_date: Optional[datetime] = None) -> bool:
         """
         Clear history entries.
@@ -71,15 +184,16 @@ class HistoryManager:
             bool: True if operation was successful, False otherwise
         """
         try:
-            if before_date:
-                history = self._read_history()
-                filtered_history = [
-                    entry for entry in history 
-                    if datetime.fromisoformat(entry['timestamp']) >= before_date
-                ]
-                self._write_history(filtered_history)
-            else:
-                self._write_history([])
+            with _history_lock:
+                if before_date:
+                    history = self._read_history()
+                    filtered_history = [
+                        entry for entry in history
+                        if datetime.fromisoformat(entry['timestamp']) >= before_date
+                    ]
+                    self._write_history(filtered_history)
+                else:
+                    self._write_history([])
             
             # Add entry about clearing history
             self.add_entry(
@@ -1,9 +1,18 @@
 #!/usr/bin/env python
 import click
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+import io
 import json
 import os
+import queue
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
 import shutil
 from typing import List
@@ -11,14 +20,64 @@ from tabulate import tabulate
 import csv
 from history_manager import HistoryManager
 import pandas as pd
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+from utils.pdf_export import PaginatedPDFTable
+from utils.sql_tokenizer import iter_sql_statements, prefetch, split_directives
+from utils.columnar import (
+    COLUMNAR_FORMATS, ColumnarWriter, arrow_schema_for_columns, detect_columnar_format,
+    iter_columnar_batches, mysql_type_for_field, read_columnar_schema
+)
+from utils.compression import (
+    COMPRESSION_EXTENSIONS, detect_compression, open_compressed, read_text_stream, strip_compression_extension
+)
+from utils.bundle import (
+    BINARY_TYPES, BUNDLE_VERSION, LOAD_DATA_OPTIONS, MANIFEST_FILE, decode_binary_values, file_sha256,
+    parse_mysql_csv_line, plan_pk_chunks, split_deferred_indexes, write_mysql_csv_rows
+)
+from utils.chunked import ChunkedStatement, ChunkProgress, has_chunked_directive
+from utils.migration_plan import (
+    DML_KINDS, DML_ROWS_PER_SECOND, INDEX_BUILD_BYTES_PER_SECOND, REBUILD_BYTES_PER_SECOND,
+    classify_alter, ddl_target, format_duration, statement_kind, summarize_explain
+)
+from utils.column_profile import DEFAULT_PROFILE_CHUNK_SIZE, DEFAULT_TOP_K, TableProfiler
+from utils.table_analysis import COLUMNS_QUERY
+from utils.schema_dump import (
+    ROUTINES_QUERY, TRIGGERS_QUERY, delimited, order_views, strip_definer, unqualify
+)
+from utils.schema_fingerprint import FINGERPRINT_QUERIES, FingerprintStore, compare_fingerprints, fingerprint_rows
+from utils.online_ddl import (
+    ONLINE_DDL_UNSUPPORTED_ERRORS, ShadowTableCopy, inplace_alter, parse_alter_table, quote_identifier,
+    rename_clause
+)
+
+# Statements kept (truncated) for the history log of a migration run
+MAX_RECORDED_STATEMENTS = 1000
+MAX_RECORDED_STATEMENT_LENGTH = 1000
+
+# Statements slower than this get their lock wait looked up in performance_schema
+PROFILE_LOCK_WAIT_THRESHOLD = 0.01
+
+# Applied migrations folded into a baseline are archived here, inside the branch's migrations directory
+SQUASHED_MIGRATIONS_DIR = 'squashed'
+
+# Defaults for `-- mydb:online` shadow table copies
+ONLINE_COPY_CHUNK_SIZE = 1000
+
+# Background jobs run DatabaseManager instances on several threads; writes of the
+# config and migration state files are serialized by these
+_config_lock = threading.Lock()
+_migrations_lock = threading.Lock()
 
 class MigrationManager:
-    def __init__(self, config_path='.mydb/migrations.json'):
+    def __init__(self, config_path='.mydb/migrations.json', migrations_dir='migrations'):
         self.config_path = config_path
+        self.migrations_dir = migrations_dir
         self.migrations = self._load_migrations()
+        # Per-branch lookup structures over self.migrations (kept current by add_migration,
+        # set_status and replace_branch) and over the migrations/ tree (rebuilt when it changes)
+        self._index = {}
+        self._dir_index = {}
+        # Branches changed through this instance since it last saved
+        self._dirty = set()
 
     def _load_migrations(self):
         if not os.path.exists(self.config_path):
@@ -28,61 +87,186 @@ class MigrationManager:
             return json.load(f)
 
     def _save_migrations(self):
-        with open(self.config_path, 'w') as f:
-            json.dump(self.migrations, f, indent=4)
+        """
+        Save the branches changed through this instance on top of the latest saved state.
 
-    def create_migration(self, name, description, branch):
-        migration_number = self._get_next_migration_number(branch)
-        timestamp = datetime.now().isoformat()
-        
-        migration = {
-            "number": migration_number,
-            "name": name,
-            "description": description,
-            "branch": branch,
-            "status": "pending",
-            "created_at": timestamp,
-            "applied_at": None
-        }
+        Other instances (e.g. a background job) may have saved since this one loaded, so
+        the file is re-read under a lock and only this instance's branches are replaced;
+        the rest of self.migrations is refreshed from it.
+        """
+        with _migrations_lock:
+            migrations = self._load_migrations()
+            for branch in self._dirty:
+                if branch in self.migrations:
+                    migrations[branch] = self.migrations[branch]
+                else:
+                    migrations.pop(branch, None)
+            for branch in set(self.migrations) | set(migrations):
+                if branch not in self._dirty:
+                    self._index.pop(branch, None)
+            self.migrations = migrations
+            self._dirty.clear()
+
+            # Write to a temporary file first so an interrupted save never truncates the state
+            temp_path = f"{self.config_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(self.migrations, f, indent=4)
+            os.replace(temp_path, self.config_path)
 
-        if branch not in self.migrations:
-            self.migrations[branch] = []
-        self.migrations[branch].append(migration)
-        self._save_migrations()
+    def get_migration_status(self, branch):
+        return self.migrations.get(branch, [])
 
-        return migration_number
+    def get_current_migration(self, branch):
+        """Get the number of the last applied migration of a branch, or -1."""
+        applied = self._branch_index(branch)['applied']
+        return applied[-1] if applied else -1
 
-    def _get_next_migration_number(self, branch):
-        if branch not in self.migrations or not self.migrations[branch]:
-            return 1
-        return max(m["number"] for m in self.migrations[branch]) + 1
+    def _branch_index(self, branch):
+        """
+        Get the index of a branch's migrations, building it on first use.
 
-    def apply_migration(self, migration_number, branch):
-        for migration in self.migrations.get(branch, []):
-            if migration["number"] == migration_number:
-                migration["status"] = "applied"
-                migration["applied_at"] = datetime.now().isoformat()
-                self._save_migrations()
-                return True
-        return False
-
-    def rollback_migration(self, migration_number, branch):
-        for migration in self.migrations.get(branch, []):
-            if migration["number"] == migration_number:
-                migration["status"] = "rolled_back"
-                migration["applied_at"] = None
-                self._save_migrations()
-                return True
-        return False
+        add_migration and set_status keep the index current; code that replaces a branch's
+        list goes through replace_branch, which drops it. Records must not be edited in place
+        anywhere else.
+        """
+        index = self._index.get(branch)
+        if index is None:
+            by_number = {m['migration_number']: m for m in self.migrations.get(branch, [])}
+            index = {
+                'by_number': by_number,
+                'numbers': sorted(by_number),
+                'applied': sorted(n for n, m in by_number.items() if m['status'] == 'applied'),
+                'pending': sorted(n for n, m in by_number.items() if m['status'] == 'pending'),
+            }
+            self._index[branch] = index
+        return index
 
-    def get_migration_status(self, branch):
-        return self.migrations.get(branch, [])
+    def replace_branch(self, branch, migrations):
+        """
+        Replace a branch's migration records (merges, squashes, restores).
 
-    def get_current_migration(self, branch):
-        applied_migrations = [m for m in self.migrations.get(branch, []) if m["status"] == "applied"]
-        if not applied_migrations:
-            return -1
-        return max(m["number"] for m in applied_migrations)
+        The records are copied, so branches never share a record and a status change on
+        one branch can't leak into another.
+        """
+        self.migrations[branch] = [dict(migration) for migration in migrations]
+        self._index.pop(branch, None)
+        self._dirty.add(branch)
+
+    def get_migration(self, branch, migration_number):
+        """Get a migration record by branch and number, or None."""
+        return self._branch_index(branch)['by_number'].get(migration_number)
+
+    def get_next_pending(self, branch):
+        """Get the lowest-numbered pending migration of a branch, or None."""
+        index = self._branch_index(branch)
+        return index['by_number'][index['pending'][0]] if index['pending'] else None
+
+    def get_max_migration_number(self, branch):
+        """Get the highest recorded migration number of a branch, or -1."""
+        numbers = self._branch_index(branch)['numbers']
+        return numbers[-1] if numbers else -1
+
+    def get_unapplied_after(self, branch, after, upto=None):
+        """Get migrations numbered above `after` (and up to `upto`) that are not applied, in order."""
+        index = self._branch_index(branch)
+        numbers = index['numbers']
+        end = bisect_right(numbers, upto) if upto is not None else len(numbers)
+        return [
+            index['by_number'][n] for n in numbers[bisect_right(numbers, after):end]
+            if index['by_number'][n]['status'] != 'applied'
+        ]
+
+    def add_migration(self, branch, migration):
+        """Record a new migration for a branch."""
+        index = self._branch_index(branch)
+        self.migrations.setdefault(branch, []).append(migration)
+        self._dirty.add(branch)
+        number = migration['migration_number']
+        index['by_number'][number] = migration
+        insort(index['numbers'], number)
+        if migration['status'] in ('applied', 'pending'):
+            insort(index[migration['status']], number)
+
+    def set_status(self, branch, migration_number, status, **fields):
+        """
+        Change a migration's status and keep the index in step.
+
+        Extra keyword arguments are stored on the record; a value of None removes the key
+        unless it is applied_at, which is kept as null like the rest of the file.
+        """
+        index = self._branch_index(branch)
+        migration = index['by_number'].get(migration_number)
+        if migration is None:
+            return None
+        self._dirty.add(branch)
+
+        for tracked in ('applied', 'pending'):
+            if migration['status'] == tracked and status != tracked:
+                numbers = index[tracked]
+                del numbers[bisect_right(numbers, migration_number) - 1]
+            elif migration['status'] != tracked and status == tracked:
+                insort(index[tracked], migration_number)
+
+        migration['status'] = status
+        for field, value in fields.items():
+            if value is None and field != 'applied_at':
+                migration.pop(field, None)
+            else:
+                migration[field] = value
+        return migration
+
+    def _directory_index(self, branch):
+        """
+        Map migration numbers to directory names for a branch.
+
+        The branch directory is only rescanned when its mtime changes, which happens
+        whenever a migration directory is added, removed or renamed.
+        """
+        branch_dir = f"{self.migrations_dir}/{branch}"
+        try:
+            mtime = os.stat(branch_dir).st_mtime_ns
+        except FileNotFoundError:
+            self._dir_index.pop(branch, None)
+            return None
+
+        index = self._dir_index.get(branch)
+        if index is None or index['mtime'] != mtime:
+            by_number = {}
+            with os.scandir(branch_dir) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    prefix = entry.name.split('_')[0]
+                    if prefix.isdigit() and entry.is_dir():
+                        by_number.setdefault(int(prefix), entry.name)
+            index = {
+                'mtime': mtime,
+                'by_number': by_number,
+                'by_name': {name: number for number, name in by_number.items()},
+                'max_number': max(by_number, default=-1)
+            }
+            self._dir_index[branch] = index
+        return index
+
+    def get_migration_dir(self, branch, migration_number):
+        """Get the directory of a migration, e.g. 'migrations/main/0003_add_users', or None."""
+        index = self._directory_index(branch)
+        if index is None or migration_number not in index['by_number']:
+            return None
+        return f"{self.migrations_dir}/{branch}/{index['by_number'][migration_number]}"
+
+    def get_max_directory_number(self, branch):
+        """Get the highest migration number present on disk for a branch, or -1."""
+        index = self._directory_index(branch)
+        return index['max_number'] if index else -1
+
+    def migration_for_path(self, path):
+        """Resolve a path inside a migration directory to (branch, migration_number), or None."""
+        parts = os.path.relpath(path).replace(os.sep, '/').split('/')
+        if len(parts) < 3 or parts[0] != self.migrations_dir:
+            return None
+        index = self._directory_index(parts[1])
+        if index is None or parts[2] not in index['by_name']:
+            return None
+        return parts[1], index['by_name'][parts[2]]
 
 
 class DatabaseManager:
@@ -138,8 +322,24 @@ class DatabaseManager:
 
     def _save_config(self):
         """Save current configuration to JSON file"""
-        with open(self.config_path, 'w') as f:
+        temp_path = f"{self.config_path}.tmp"
+        with open(temp_path, 'w') as f:
             json.dump(self.config, f, indent=4)
+        os.replace(temp_path, self.config_path)
+
+    def _update_config(self, change):
+        """
+        Apply change(config) to the latest saved configuration and save it.
+
+        The file is re-read under a lock first, so instances working concurrently
+        (background jobs, the Studio page) add their change on top of each other's
+        instead of writing back the snapshot they started with.
+        """
+        with _config_lock:
+            config = self._load_config()
+            change(config)
+            self.config = config
+            self._save_config()
 
     def connect(self):
         """Create database connection"""
@@ -150,6 +350,29 @@ class DatabaseManager:
             click.echo(f"Error connecting to database: {e}")
             return False
 
+    def _create_pool(self, pool_size, **overrides):
+        """Create a connection pool for work spread across worker threads."""
+        return pooling.MySQLConnectionPool(
+            pool_name=f"mydb_{uuid.uuid4().hex[:12]}",
+            pool_size=min(max(pool_size, 1), pooling.CNX_POOL_MAXSIZE),
+            **dict(self.config['connection'], **overrides)
+        )
+
+    @staticmethod
+    def _decode(value):
+        """Decode bytes/bytearray values returned by some MySQL drivers."""
+        if isinstance(value, (bytes, bytearray)):
+            return value.decode('utf-8')
+        return value
+
+    def _branch_db_name(self, branch=None):
+        """Get the database name backing a branch ('main' uses the base database)."""
+        branch = branch or self.config['current_branch']
+        db_name = self.config['connection']['database']
+        if branch != 'main':
+            db_name = f"{db_name}_{branch}"
+        return db_name
+
     def see_databases(self):
         """List all configured databases."""
         databases = self.config.get('databases', {})
@@ -177,10 +400,9 @@ class DatabaseManager:
         temp_manager = DatabaseManager(config=new_config)
         if temp_manager.connect():
             # If connection successful, save the new database configuration
-            if 'databases' not in self.config:
-                self.config['databases'] = {}
-            self.config['databases'][name] = new_config['connection']
-            self._save_config()
+            def add_database(config):
+                config.setdefault('databases', {})[name] = new_config['connection']
+            self._update_config(add_database)
             click.echo(f"Successfully connected and saved database '{name}'.")
         else:
             click.echo("Failed to connect to the database. Configuration not saved.")
@@ -189,8 +411,9 @@ class DatabaseManager:
         """Connect back to the default mydb database."""
         home_config = self.config['databases'].get('mydb')
         if home_config:
-            self.config['connection'] = home_config
-            self._save_config()
+            def go_home(config):
+                config['connection'] = home_config
+            self._update_config(go_home)
             if self.connect():
                 click.echo("Successfully connected back to mydb database.")
             else:
@@ -198,14 +421,22 @@ class DatabaseManager:
         else:
             click.echo("Default mydb database not configured.")
 
-    def create_branch(self, branch_name):
-        """Create a new branch from current branch"""
+    def create_branch(self, branch_name, progress=None):
+        """
+        Create a new branch from current branch
+
+        Args:
+            branch_name (str): Name of the new branch
+            progress (callable, optional): Called with tables_done, tables_total, rows and table as tables are copied
+        """
         # add history code snippet 1 
+        started_at = time.monotonic()
         if branch_name in self.config['branches']:
             self.history_manager.add_entry(
                 command='create_branch',
                 details=f"Failed to create branch '{branch_name}' - branch already exists",
-                status='failed'
+                status='failed',
+                started_at=started_at
             )
             click.echo(f"Branch '{branch_name}' already exists!")
             return False
@@ -233,19 +464,24 @@ class DatabaseManager:
                 tables = cursor.fetchall()
             
                 # Copy schema and data
-                for (table_name,) in tables:
+                copied_rows = 0
+                for tables_done, (table_name,) in enumerate(tables, start=1):
                     if isinstance(table_name, bytearray):
                         table_name = table_name.decode('utf-8')
                     cursor.execute(f"CREATE TABLE {new_db_name}.{table_name} LIKE {current_db_name}.{table_name}")
                     cursor.execute(f"INSERT INTO {new_db_name}.{table_name} SELECT * FROM {current_db_name}.{table_name}")
+                    copied_rows += max(cursor.rowcount, 0)
+                    if progress:
+                        progress(tables_done=tables_done, tables_total=len(tables), rows=copied_rows, table=table_name)
 
             # Update config
-            self.config['branches'][branch_name] = {
-                'created_at': datetime.now().isoformat(),
-                'last_accessed': datetime.now().isoformat(),
-                'created_from': current_branch
-            }
-            self._save_config()
+            def add_branch(config):
+                config['branches'][branch_name] = {
+                    'created_at': datetime.now().isoformat(),
+                    'last_accessed': datetime.now().isoformat(),
+                    'created_from': current_branch
+                }
+            self._update_config(add_branch)
 
             # self.create_schema_migrations_table(branch_name)
             # click.echo(f"Initialized schema_migrations table in branch '{branch_name}'")
@@ -257,7 +493,8 @@ class DatabaseManager:
             self.history_manager.add_entry(
                 command='create_branch',
                 details=f"Successfully created branch '{branch_name}' from '{current_branch}'",
-                status='success'
+                status='success',
+                started_at=started_at
             )
             return True
 
@@ -267,7 +504,8 @@ class DatabaseManager:
             self.history_manager.add_entry(
                 command='create_branch',
                 details=f"Failed to create branch '{branch_name}' - {str(e)}",
-                status='failed'
+                status='failed',
+                started_at=started_at
             )
             click.echo(f"Error creating branch: {e}")
             return False
@@ -278,26 +516,30 @@ class DatabaseManager:
 
     def switch_branch(self, branch_name):
         """Switch to a different branch"""
+        started_at = time.monotonic()
         if branch_name not in self.config['branches']:
             self.history_manager.add_entry(
                 command='switch_branch',
                 details=f"Failed to switch branch '{branch_name}' - branch does not exist",
-                status='failed'
+                status='failed',
+                started_at=started_at
             )
             click.echo(f"Branch '{branch_name}' does not exist!")
             return False
 
         try:
             # Update current branch
-            self.config['current_branch'] = branch_name
-            self.config['branches'][branch_name]['last_accessed'] = datetime.now().isoformat()
-            self._save_config()
+            def switch(config):
+                config['current_branch'] = branch_name
+                config['branches'][branch_name]['last_accessed'] = datetime.now().isoformat()
+            self._update_config(switch)
             
             click.echo(f"Switched to branch '{branch_name}'")
             self.history_manager.add_entry(
                 command='switch_branch',
                 details=f"Successfully switched to branch '{branch_name}'",
-                status='success'
+                status='success',
+                started_at=started_at
             )
             return True
 
@@ -305,7 +547,8 @@ class DatabaseManager:
             self.history_manager.add_entry(
                 command='switch_branch',
                 details=f"Failed to switch branch '{branch_name}' - {str(e)}",
-                status='failed'
+                status='failed',
+                started_at=started_at
             )
             click.echo(f"Error switching branch: {e}")
             return False
@@ -335,8 +578,7 @@ class DatabaseManager:
             cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
             
             # Remove branch from config
-            del self.config['branches'][branch_name]
-            self._save_config()
+            self._update_config(lambda config: config['branches'].pop(branch_name, None))
             
             click.echo(f"Successfully deleted branch '{branch_name}'")
             return True
@@ -580,29 +822,11 @@ class DatabaseManager:
         """Get the next migration number for a specific branch."""
         branch = branch_name or self.config['current_branch']
     
-        # Set branch-specific migrations directory
-        branch_migrations_dir = f"migrations/{branch}"
-    
-        # Ensure the directory exists
-        if not os.path.exists(branch_migrations_dir):
-            os.makedirs(branch_migrations_dir, exist_ok=True)
-            return 0  # Start at 0000 if no migrations exist for the branch
-
-        # List all migration folders and find the highest number
-        existing_migrations = [
-            d for d in os.listdir(branch_migrations_dir) if os.path.isdir(os.path.join(branch_migrations_dir, d))
-        ]
-    
-        if not existing_migrations:
-            return 0  # Start at 0000 if no migrations exist
-    
-        # Extract migration numbers from folder names and find the highest one
-        migration_numbers = [
-            int(m.split('_')[0]) for m in existing_migrations if m.split('_')[0].isdigit()
-        ]
-        next_number = max(migration_numbers) + 1 if migration_numbers else 0
+        # Ensure the branch-specific migrations directory exists
+        os.makedirs(f"migrations/{branch}", exist_ok=True)
 
-        return next_number
+        # Start at 0000 if no migrations exist for the branch
+        return self.migration_manager.get_max_directory_number(branch) + 1
 
     def create_migration(self, name, description=None):
         """Create a new migration for the current branch."""
@@ -647,9 +871,7 @@ class DatabaseManager:
             }
 
             # Save metadata to JSON file
-            if branch not in self.migration_manager.migrations:
-                self.migration_manager.migrations[branch] = []
-            self.migration_manager.migrations[branch].append(migration_data)
+            self.migration_manager.add_migration(branch, migration_data)
             self.migration_manager._save_migrations()
 
             # Create metadata.json in migration directory (for backwards compatibility)
@@ -663,6 +885,11 @@ class DatabaseManager:
             click.echo(f"Error creating migration: {e}")
             return False
 
+    def get_next_pending_migration(self, branch_name=None):
+        """Get the first pending migration of a branch, or None."""
+        branch = branch_name or self.config['current_branch']
+        return self.migration_manager.get_next_pending(branch)
+
     def apply_migration(self, migration_number=None, branch_name=None):
         try:
             if not self.connect():
@@ -683,13 +910,11 @@ class DatabaseManager:
             cursor.execute(f"USE {db_name}")
 
             if migration_number is None:
-                pending_migrations = [m for m in self.migration_manager.migrations.get(branch, [])
-                                      if m['status'] == 'pending']
-                if not pending_migrations:
+                migration = self.get_next_pending_migration(branch)
+                if not migration:
                     click.echo(f"No pending migrations for branch '{branch}'")
                     return True, []
 
-                migration = pending_migrations[0]
                 migration_number = migration['migration_number']
                 migration_name = migration['name']
                 click.echo(f"Applying migration {migration_number:04d}_{migration_name}")
@@ -698,38 +923,23 @@ class DatabaseManager:
             if not migration_files:
                 return False, []
 
+            checksum = file_sha256(migration_files['up'])
             cursor.execute("START TRANSACTION")
 
-            executed_queries = []
-        
-            with open(migration_files['up'], 'r') as f:
-                sql = f.read()
-                if sql.strip():
-                    for statement in sql.split(';'):
-                        if statement.strip():
-                            cursor.execute(statement)
-                            executed_queries.append(statement.strip())
-
-            for migration in self.migration_manager.migrations.get(branch, []):
-                if migration['migration_number'] == migration_number:
-                    migration['status'] = 'applied'
-                    migration['applied_at'] = datetime.now().isoformat()
-                    break
+            executed_queries = self._execute_sql_file(cursor, migration_files['up'])
 
+            self.migration_manager.set_status(branch, migration_number, 'applied',
+                                              applied_at=datetime.now().isoformat(), checksum=checksum)
             self.migration_manager._save_migrations()
 
             cursor.execute("COMMIT")
+            self._record_schema_fingerprint(cursor, branch, migration_number)
             click.echo(f"Successfully applied migration {migration_number:04d} in branch '{branch}'")
             return True, executed_queries
 
         except Error as e:
             cursor.execute("ROLLBACK")
-            for migration in self.migration_manager.migrations.get(branch, []):
-                if migration['migration_number'] == migration_number:
-                    migration['status'] = 'failed'
-                    migration['error_message'] = str(e)
-                    break
-
+            self.migration_manager.set_status(branch, migration_number, 'failed', error_message=str(e))
             self.migration_manager._save_migrations()
             click.echo(f"Error applying migration {migration_number:04d}: {e}")
             return False, []
@@ -740,22 +950,603 @@ class DatabaseManager:
             if self.connection and self.connection.is_connected():
                 self.connection.close()
 
+    def apply_migration_to_branches(self, branches, migration_number=None, jobs=4):
+        """
+        Apply one of the current branch's migrations to several branches at once.
+
+        The migration is resolved once from the current branch and its up.sql runs
+        against every target branch's database, each in its own transaction on a pooled
+        connection. Branches that don't have the migration yet get a copy of its record
+        and files; migration state for all branches is saved once at the end.
+
+        Args:
+            branches (list): Branch names
+            migration_number (int, optional): Migration of the current branch to apply,
+                defaults to the current branch's next pending one
+            jobs (int): Number of branches migrated concurrently
+
+        Returns:
+            tuple: (bool, list) - (True if every branch succeeded, per-branch results)
+        """
+        unknown = [branch for branch in branches if branch not in self.config['branches']]
+        if unknown:
+            click.echo(f"Unknown branches: {', '.join(unknown)}")
+            return False, []
+
+        source = self.config['current_branch']
+        migration = self._resolve_migration(source, migration_number)
+        if not migration:
+            return migration_number is None, []
+        migration_files = self._get_migration_files(source, migration['migration_number'])
+        if not migration_files:
+            return False, []
+
+        results = []
+        targets = []
+        for branch in branches:
+            record = self._adopt_migration(branch, source, migration)
+            if record is None:
+                results.append(self._branch_result(
+                    branch, migration, error=f"Branch has a different migration {migration['migration_number']:04d}"
+                ))
+            elif record['status'] == 'applied':
+                results.append(self._branch_result(branch, migration, status='up to date'))
+            else:
+                targets.append(branch)
+
+        try:
+            if targets:
+                try:
+                    pool = self._create_pool(min(jobs, len(targets)))
+                except Error as e:
+                    click.echo(f"Error connecting to MySQL: {e}")
+                    return False, results
+
+                with ThreadPoolExecutor(max_workers=min(max(jobs, 1), pooling.CNX_POOL_MAXSIZE)) as executor:
+                    futures = [
+                        executor.submit(self._apply_branch_migration, pool, branch, migration, migration_files)
+                        for branch in targets
+                    ]
+                    for future in as_completed(futures):
+                        result = future.result()
+                        results.append(result)
+                        click.echo(f"[{result['branch']}] {result['status']} ({result['seconds']:.2f}s)")
+        finally:
+            self.migration_manager._save_migrations()
+
+        results.sort(key=lambda r: branches.index(r['branch']))
+        return all(r['status'] in ('applied', 'up to date') for r in results), results
+
+    def _resolve_migration(self, branch, migration_number=None):
+        """Get a branch's migration by number, or its next pending one; None (with a message) if there is none."""
+        if migration_number is None:
+            migration = self.get_next_pending_migration(branch)
+            if not migration:
+                click.echo(f"No pending migrations for branch '{branch}'")
+            return migration
+        migration = self.migration_manager.get_migration(branch, migration_number)
+        if not migration:
+            click.echo(f"Migration {migration_number:04d} not found in branch '{branch}'")
+        return migration
+
+    def _adopt_migration(self, branch, source, migration):
+        """
+        Get a branch's record of a migration from another branch, copying the record and files if missing.
+
+        Returns:
+            dict: The branch's record, or None if the branch has a different migration with that number
+        """
+        if branch == source:
+            return migration
+        number = migration['migration_number']
+        record = self.migration_manager.get_migration(branch, number)
+        if record is not None:
+            return record if record['name'] == migration['name'] else None
+
+        source_dir = self.migration_manager.get_migration_dir(source, number)
+        target_dir = f"{self.migration_manager.migrations_dir}/{branch}/{os.path.basename(source_dir)}"
+        if not os.path.exists(target_dir):
+            shutil.copytree(source_dir, target_dir)
+        record = dict(migration, branch=branch, status='pending', applied_at=None)
+        for field in ('checksum', 'error_message'):
+            record.pop(field, None)
+        self.migration_manager.add_migration(branch, record)
+        return record
+
+    @staticmethod
+    def _branch_result(branch, migration, status='failed', error=None):
+        return {'branch': branch, 'number': migration['migration_number'], 'status': status, 'statements': 0,
+                'seconds': 0.0, 'error': error, 'profile': []}
+
+    def _apply_branch_migration(self, pool, branch, migration, migration_files):
+        """Run a migration's up.sql against one branch over a pooled connection, returning a result dict."""
+        started_at = time.time()
+        result = self._branch_result(branch, migration)
+
+        connection = cursor = None
+        try:
+            connection = pool.get_connection()
+            cursor = connection.cursor()
+            cursor.execute(f"USE `{self._branch_db_name(branch)}`")
+            cursor.execute("START TRANSACTION")
+            checksum = file_sha256(migration_files['up'])
+            try:
+                result['profile'] = self._execute_sql_file(cursor, migration_files['up'])
+                cursor.execute("COMMIT")
+            except Error:
+                cursor.execute("ROLLBACK")
+                raise
+            self.migration_manager.set_status(branch, result['number'], 'applied', applied_at=datetime.now().isoformat(),
+                                              error_message=None, checksum=checksum)
+            self._record_schema_fingerprint(cursor, branch, result['number'])
+            result.update(status='applied', statements=len(result['profile']))
+        except Error as e:
+            self.migration_manager.set_status(branch, result['number'], 'failed', error_message=str(e))
+            result['error'] = str(e)
+        finally:
+            result['seconds'] = time.time() - started_at
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+        return result
+
+    def plan_migration(self, migration_number=None, branch_name=None, target_branch=None):
+        """
+        Estimate the cost of a migration without applying it.
+
+        DML statements are run through EXPLAIN; for DDL the size of the target table is
+        looked up in INFORMATION_SCHEMA.TABLES and the kind of ALTER decides whether the
+        table is rebuilt and which lock is held.
+
+        Args:
+            migration_number (int, optional): Migration to plan, defaults to the next pending one
+            branch_name (str, optional): Branch of the migration, defaults to the current branch
+            target_branch (str, optional): Branch whose database it is planned against, defaults to branch_name
+
+        Returns:
+            tuple: (bool, list) - (Success status, one report entry per statement)
+        """
+        cursor = None
+        try:
+            branch = branch_name or self.config['current_branch']
+            if migration_number is None:
+                migration = self.get_next_pending_migration(branch)
+                if not migration:
+                    click.echo(f"No pending migrations for branch '{branch}'")
+                    return True, []
+                migration_number = migration['migration_number']
+
+            migration_files = self._get_migration_files(branch, migration_number)
+            if not migration_files:
+                return False, []
+
+            if not self.connect():
+                return False, []
+
+            db_name = self._branch_db_name(target_branch or branch)
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute(f"USE `{db_name}`")
+            cursor.execute("""
+                SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH
+                FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = %s
+            """, (db_name,))
+            table_sizes = {
+                self._decode(row['TABLE_NAME']): (row['TABLE_ROWS'] or 0, row['DATA_LENGTH'] or 0, row['INDEX_LENGTH'] or 0)
+                for row in cursor.fetchall()
+            }
+
+            report = []
+            with open(migration_files['up'], 'r', encoding='utf-8') as f:
+                for index, statement in enumerate(iter_sql_statements(f), start=1):
+                    directives, statement = split_directives(statement)
+                    if not statement:
+                        continue
+                    report.append(self._plan_statement(cursor, index, statement, directives, table_sizes))
+
+            return True, report
+
+        except Error as e:
+            click.echo(f"Error planning migration: {e}")
+            return False, []
+
+        finally:
+            if cursor:
+                cursor.close()
+            if self.connection and self.connection.is_connected():
+                self.connection.close()
+
+    def _plan_statement(self, cursor, index, statement, directives, table_sizes):
+        """Build the dry-run report entry for one statement."""
+        kind = statement_kind(statement)
+        entry = {
+            'index': index,
+            'statement': ' '.join(statement.split())[:60],
+            'kind': kind,
+            'rows': 0,
+            'lock': 'metadata lock only',
+            'seconds': 0.0,
+            'flags': []
+        }
+
+        if kind in DML_KINDS:
+            entry['lock'] = 'none' if kind == 'SELECT' else 'row locks'
+            if 'chunked' in directives:
+                entry['lock'] = 'row locks, one chunk at a time'
+            try:
+                cursor.execute(f"EXPLAIN {statement}")
+                rows_examined, full_scans = summarize_explain(cursor.fetchall())
+            except Error as e:
+                entry['flags'].append(f"EXPLAIN failed: {e.msg}")
+                return entry
+            entry['rows'] = rows_examined
+            entry['seconds'] = rows_examined / DML_ROWS_PER_SECOND
+            entry['flags'].extend(f"full scan of `{table}`" for table in full_scans)
+            return entry
+
+        target = ddl_target(statement)
+        if not target:
+            return entry
+
+        operation, table_name, alter_spec = target
+        if table_name not in table_sizes:
+            entry['flags'].append(f"table `{table_name}` not found (created by this migration?)")
+            return entry
+
+        table_rows, data_length, index_length = table_sizes[table_name]
+        entry['rows'] = table_rows
+        if operation == 'ALTER':
+            cost_class, entry['lock'] = classify_alter(alter_spec)
+            if cost_class in ('copy', 'rebuild'):
+                entry['seconds'] = (data_length + index_length) / REBUILD_BYTES_PER_SECOND
+                entry['flags'].append(f"rebuilds `{table_name}`")
+                if 'online' in directives:
+                    entry['lock'] = 'NONE (online)'
+            elif cost_class == 'index':
+                entry['seconds'] = data_length / INDEX_BUILD_BYTES_PER_SECOND
+            else:
+                entry['rows'] = 0
+        elif operation == 'CREATE INDEX':
+            entry['lock'] = 'NONE'
+            entry['seconds'] = data_length / INDEX_BUILD_BYTES_PER_SECOND
+        elif operation in ('DROP', 'TRUNCATE'):
+            entry['flags'].append(f"removes {table_rows} rows")
+        else:
+            entry['rows'] = 0
+        return entry
+
+    def _execute_sql_file(self, cursor, file_path):
+        """
+        Execute a migration file statement by statement without loading it into memory.
+
+        Statements are tokenized on a background thread while the previous one runs.
+        Slow statements and periodic progress are reported as they complete.
+
+        Every statement is profiled: wall time, rows affected, warnings and, for
+        statements slower than PROFILE_LOCK_WAIT_THRESHOLD, the lock wait reported by
+        performance_schema when it is available.
+
+        Returns:
+            list: Profile dicts (statement, seconds, rows, warnings, lock_wait) for the
+                history log; statements past MAX_RECORDED_STATEMENTS are summed into one entry
+        """
+        if has_chunked_directive(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                statements = sum(1 for statement in iter_sql_statements(f) if split_directives(statement)[1])
+            if statements > 1:
+                # Chunks commit as they go; anything else in the file would be committed with
+                # them and run again when a failed migration is resumed
+                raise Error(msg="A mydb:chunked statement must be the only statement in its migration; "
+                                "move the other statements to their own migration")
+
+        total_size = os.path.getsize(file_path) or 1
+        read_size = [0]
+
+        def counted(lines):
+            for line in lines:
+                read_size[0] += len(line)
+                yield line
+
+        executed_queries = []
+        remainder = {'statement': None, 'seconds': 0.0, 'rows': 0, 'warnings': 0, 'lock_wait': None}
+        statement_count = 0
+        thread_id = self._performance_schema_thread_id(cursor)
+        started_at = last_report = time.time()
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for statement in prefetch(iter_sql_statements(counted(f))):
+                directives, statement = split_directives(statement)
+                if not statement:
+                    continue
+                statement_started_at = time.time()
+                rows = self._execute_statement(cursor, statement, directives)
+                elapsed = time.time() - statement_started_at
+                warnings = cursor.warning_count
+                statement_count += 1
+
+                lock_wait = None
+                if thread_id is not None and not directives and elapsed >= PROFILE_LOCK_WAIT_THRESHOLD:
+                    lock_wait = self._last_statement_lock_wait(cursor, thread_id)
+
+                if len(executed_queries) < MAX_RECORDED_STATEMENTS:
+                    recorded = statement
+                    if len(recorded) > MAX_RECORDED_STATEMENT_LENGTH:
+                        recorded = recorded[:MAX_RECORDED_STATEMENT_LENGTH] + '...'
+                    executed_queries.append({
+                        'statement': recorded,
+                        'seconds': round(elapsed, 6),
+                        'rows': rows,
+                        'warnings': warnings,
+                        'lock_wait': lock_wait
+                    })
+                else:
+                    remainder['seconds'] += elapsed
+                    remainder['rows'] += max(rows, 0)
+                    remainder['warnings'] += warnings
+
+                now = time.time()
+                if elapsed >= 1:
+                    preview = ' '.join(statement.split())[:60]
+                    click.echo(f"  [{statement_count}] {preview} ({elapsed:.2f}s)")
+                if now - last_report >= 2:
+                    percent = min(100, read_size[0] * 100 // total_size)
+                    click.echo(f"  ... {statement_count} statements executed ({percent}%)")
+                    last_report = now
+
+        if statement_count > MAX_RECORDED_STATEMENTS:
+            remainder['statement'] = f"... {statement_count - MAX_RECORDED_STATEMENTS} more statements"
+            remainder['seconds'] = round(remainder['seconds'], 6)
+            executed_queries.append(remainder)
+        click.echo(f"  Executed {statement_count} statements in {time.time() - started_at:.2f}s")
+        return executed_queries
+
+    def _performance_schema_thread_id(self, cursor):
+        """Get the performance_schema thread of this connection, or None if it is not available."""
+        try:
+            cursor.execute(
+                "SELECT THREAD_ID FROM performance_schema.threads WHERE PROCESSLIST_ID = CONNECTION_ID()"
+            )
+            row = cursor.fetchall()
+        except Error:
+            return None
+        return row[0][0] if row else None
+
+    def _last_statement_lock_wait(self, cursor, thread_id):
+        """Get the lock time in seconds of the statement this connection ran last."""
+        try:
+            cursor.execute("""
+                SELECT LOCK_TIME FROM performance_schema.events_statements_history
+                WHERE THREAD_ID = %s ORDER BY EVENT_ID DESC LIMIT 1
+            """, (thread_id,))
+            row = cursor.fetchall()
+        except Error:
+            return None
+        # performance_schema timers are in picoseconds
+        return round(row[0][0] / 1e12, 6) if row and row[0][0] is not None else None
+
+    def _execute_statement(self, cursor, statement, directives):
+        """
+        Run one migration statement, honouring its `-- mydb:` directives.
+
+        Returns:
+            int: Rows affected (or returned), -1 when unknown
+        """
+        if 'online' in directives:
+            return self._execute_online_alter(cursor, statement, directives['online'])
+        if 'chunked' in directives:
+            return self._execute_chunked(cursor, statement, directives['chunked'])
+
+        cursor.execute(statement)
+        if cursor.with_rows:
+            cursor.fetchall()
+        return cursor.rowcount
+
+    def _execute_online_alter(self, cursor, statement, options):
+        """
+        Run an ALTER TABLE without blocking writes to the table.
+
+        MySQL's in-place online DDL (ALGORITHM=INPLACE, LOCK=NONE) is tried first; when
+        the server rejects it for this change, or the directive says `copy`, the table
+        is rebuilt through a shadow table copy instead.
+
+        Args:
+            cursor: Cursor on the branch database
+            statement (str): The ALTER TABLE statement
+            options (list): Directive arguments, e.g. ['copy', 'chunk', '5000', 'sleep', '0.1']
+        """
+        parsed = parse_alter_table(statement)
+        if not parsed:
+            raise Error(msg=f"mydb:online only applies to ALTER TABLE statements: {statement[:60]}")
+        schema, table_name, alter_spec = parsed
+
+        force_copy = 'copy' in options
+        arguments = [option for option in options if option != 'copy']
+        settings = dict(zip(arguments[::2], arguments[1::2]))
+        chunk_size = int(settings.get('chunk', ONLINE_COPY_CHUNK_SIZE))
+        sleep_seconds = float(settings.get('sleep', 0))
+
+        if not force_copy:
+            try:
+                cursor.execute(inplace_alter(statement))
+                return cursor.rowcount
+            except Error as e:
+                if e.errno not in ONLINE_DDL_UNSUPPORTED_ERRORS:
+                    raise
+                click.echo(f"  In-place ALTER not possible for `{table_name}` ({e.msg}); using a shadow table copy")
+
+        cursor.execute("SELECT DATABASE()")
+        db_name = self._decode(cursor.fetchall()[0][0])
+        if schema and schema != db_name:
+            raise Error(msg=f"Shadow table copy only supports tables in the current database, not `{schema}`")
+        return self._shadow_copy_alter(cursor, db_name, table_name, alter_spec, chunk_size, sleep_seconds)
+
+    def _shadow_copy_alter(self, cursor, db_name, table_name, alter_spec, chunk_size, sleep_seconds):
+        """Apply an ALTER by backfilling a shadow table in chunks and swapping it in with RENAME TABLE."""
+        primary_key = self._get_primary_key(cursor, db_name, table_name)
+        if len(primary_key) != 1:
+            raise Error(msg=f"Shadow table copy needs a single-column primary key on `{table_name}`")
+
+        cursor.execute("""
+            SELECT COUNT(*) FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+            WHERE REFERENCED_TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME = %s
+        """, (db_name, table_name))
+        if cursor.fetchall()[0][0]:
+            raise Error(msg=f"`{table_name}` is referenced by foreign keys, which a shadow table copy would break")
+
+        # CREATE TABLE ... LIKE copies no foreign keys, so the swapped-in table would lose them
+        cursor.execute("""
+            SELECT COUNT(*) FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+        """, (db_name, table_name))
+        if cursor.fetchall()[0][0]:
+            raise Error(msg=f"`{table_name}` has foreign keys, which a shadow table copy would drop")
+
+        # Existing triggers stay on the original table and would be dropped with it after the swap
+        cursor.execute("""
+            SELECT COUNT(*) FROM INFORMATION_SCHEMA.TRIGGERS
+            WHERE EVENT_OBJECT_SCHEMA = %s AND EVENT_OBJECT_TABLE = %s
+        """, (db_name, table_name))
+        if cursor.fetchall()[0][0]:
+            raise Error(msg=f"`{table_name}` has triggers, which a shadow table copy would drop")
+
+        # The backfill matches columns by name, so a renamed column would lose its data
+        renamed = rename_clause(alter_spec)
+        if renamed:
+            raise Error(msg=f"Shadow table copy cannot rename (`{renamed}`); run the rename as a separate ALTER")
+
+        copy = ShadowTableCopy(table_name, alter_spec, primary_key[0])
+        old_columns = [self._decode(row[0]) for row in self._get_column_definitions(cursor, db_name, table_name)]
+        try:
+            for sql in copy.create_statements():
+                cursor.execute(sql)
+            new_columns = {self._decode(row[0]) for row in self._get_column_definitions(cursor, db_name, copy.shadow_table)}
+            columns = [column for column in old_columns if column in new_columns]
+            if copy.primary_key not in columns:
+                raise Error(msg=f"Shadow table copy cannot change the primary key column of `{table_name}`")
+
+            for sql in copy.trigger_statements(columns):
+                cursor.execute(sql)
+
+            cursor.execute(f"SELECT MIN({quote_identifier(copy.primary_key)}) FROM {quote_identifier(table_name)}")
+            low = cursor.fetchall()[0][0]
+            copied_rows = 0
+            last_report = time.time()
+            while low is not None:
+                cursor.execute(copy.next_boundary_query(), (low, chunk_size))
+                boundary = cursor.fetchall()
+                high = boundary[0][0] if boundary else None
+                if high is None:
+                    cursor.execute(copy.backfill_statement(columns, bounded=False), (low,))
+                else:
+                    cursor.execute(copy.backfill_statement(columns, bounded=True), (low, high))
+                copied_rows += max(cursor.rowcount, 0)
+                # Commit each chunk so its shared locks are released
+                cursor.execute("COMMIT")
+                low = high
+
+                if time.time() - last_report >= 2:
+                    click.echo(f"  ... copied {copied_rows} rows into `{copy.shadow_table}`")
+                    last_report = time.time()
+                if sleep_seconds:
+                    time.sleep(sleep_seconds)
+
+            cursor.execute(copy.swap_statement())
+        except Error:
+            for sql in copy.cleanup_statements():
+                try:
+                    cursor.execute(sql)
+                except Error:
+                    pass
+            raise
+
+        for sql in copy.drop_trigger_statements():
+            cursor.execute(sql)
+        cursor.execute(f"DROP TABLE {quote_identifier(copy.old_table)}")
+        click.echo(f"  Rebuilt `{table_name}` online ({copied_rows} rows copied)")
+        return copied_rows
+
+    def _execute_chunked(self, cursor, statement, options):
+        """
+        Run a large UPDATE/DELETE in key ranges, committing after every chunk.
+
+        Each chunk is a short transaction, so undo logs and row locks stay small and
+        replicas keep up. The next key is recorded after every commit; if the migration
+        fails and is applied again, the statement resumes from there instead of the start.
+        Because of those commits a chunked statement must be the only statement in its
+        migration (see _execute_sql_file), so resuming never re-runs anything else.
+
+        Args:
+            cursor: Cursor on the branch database
+            statement (str): The UPDATE or DELETE statement
+            options (list): Directive arguments, e.g. ['by', 'id', 'size', '5000', 'sleep', '0.1']
+        """
+        try:
+            chunked = ChunkedStatement(statement, options)
+        except ValueError as e:
+            raise Error(msg=str(e))
+
+        cursor.execute("SELECT DATABASE()")
+        db_name = self._decode(cursor.fetchall()[0][0])
+        cursor.execute(chunked.start_query())
+        low = cursor.fetchall()[0][0]
+        if low is None:
+            return 0
+        if not isinstance(low, int):
+            raise Error(msg=f"mydb:chunked needs an integer key column, `{chunked.key}` is not")
+
+        progress = ChunkProgress()
+        progress_key = chunked.progress_key(db_name)
+        resume_from = progress.get(progress_key)
+        if resume_from is not None and resume_from > low:
+            click.echo(f"  Resuming chunked statement at {chunked.key} >= {resume_from}")
+            low = resume_from
+
+        affected_rows = 0
+        chunk_count = 0
+        last_report = time.time()
+        while low is not None:
+            # The key `size` rows on starts the next chunk, so sparse keys never give empty chunks
+            cursor.execute(chunked.next_boundary_query(), (low, chunked.size))
+            boundary = cursor.fetchall()
+            high = boundary[0][0] if boundary else None
+            cursor.execute(chunked.chunk_statement(low, high))
+            affected_rows += max(cursor.rowcount, 0)
+            cursor.execute("COMMIT")
+            chunk_count += 1
+            low = high
+            if high is not None:
+                progress.set(progress_key, high)
+
+            if time.time() - last_report >= 2:
+                click.echo(f"  ... {affected_rows} rows affected in {chunk_count} chunks")
+                last_report = time.time()
+            if chunked.sleep and high is not None:
+                time.sleep(chunked.sleep)
+
+        progress.clear(progress_key)
+        click.echo(f"  Chunked statement affected {affected_rows} rows in {chunk_count} chunks")
+        return affected_rows
+
+    def _get_primary_key(self, cursor, db_name, table_name):
+        """Get the primary key column names of a table in key order."""
+        cursor.execute("""
+            SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY'
+            ORDER BY ORDINAL_POSITION
+        """, (db_name, table_name))
+        return [self._decode(row[0]) for row in cursor.fetchall()]
+
     def _get_migration_files(self, branch, migration_number):
         """Get migration files for a specific branch and migration number."""
-        branch_dir = f"migrations/{branch}"
-        if not os.path.exists(branch_dir):
+        if not os.path.exists(f"migrations/{branch}"):
             click.echo(f"No migrations directory for branch '{branch}'")
             return None
 
         # Find migration directory (accounts for named migrations)
-        migration_dirs = [d for d in os.listdir(branch_dir) 
-                        if d.startswith(f"{migration_number:04d}_")]
-        
-        if not migration_dirs:
+        migration_dir = self.migration_manager.get_migration_dir(branch, migration_number)
+        if not migration_dir:
             click.echo(f"Migration {migration_number:04d} not found in branch '{branch}'")
             return None
 
-        migration_dir = f"{branch_dir}/{migration_dirs[0]}"
         return {
             'up': f"{migration_dir}/up.sql",
             'down': f"{migration_dir}/down.sql",
@@ -775,10 +1566,8 @@ class DatabaseManager:
                 return True, f"No migrations found for branch '{branch}'", None
 
             # Get the current migration state
-            current_migration = max(
-                (m for m in migrations if m['status'] == 'applied'),
-                key=lambda x: x['migration_number'],
-                default=None
+            current_migration = self.migration_manager.get_migration(
+                branch, self.migration_manager.get_current_migration(branch)
             )
 
             # Prepare migration data for tabulation
@@ -796,6 +1585,160 @@ class DatabaseManager:
         except Exception as e:
             return False, f"Error getting migration status: {str(e)}", None
 
+    def squash_migrations(self, upto):
+        """
+        Replace migrations 0..upto of the current branch with one baseline migration.
+
+        The baseline up.sql is generated from the live schema (SHOW CREATE for tables,
+        views, routines and triggers, without DEFINER clauses), so it needs a branch
+        database migrated exactly up to `upto`. The replaced migration directories
+        are moved to migrations/<branch>/squashed/ and the baseline takes number
+        `upto`, so later migrations keep their numbers.
+
+        Args:
+            upto (int): Last migration number to fold into the baseline
+
+        Returns:
+            tuple: (bool, str) - (Success status, Message)
+        """
+        cursor = None
+        try:
+            branch = self.config['current_branch']
+            migrations = self.migration_manager.migrations.get(branch, [])
+            replaced = sorted((m for m in migrations if m['migration_number'] <= upto),
+                              key=lambda m: m['migration_number'])
+            if not replaced:
+                return False, f"No migrations up to {upto:04d} in branch '{branch}'"
+
+            not_applied = [m for m in replaced if m['status'] != 'applied']
+            if not_applied:
+                return False, (f"Migration {not_applied[0]['migration_number']:04d} is not applied; "
+                               f"apply migrations up to {upto:04d} before squashing")
+            applied_later = [m for m in migrations if m['migration_number'] > upto and m['status'] == 'applied']
+            if applied_later:
+                return False, (f"Migration {applied_later[0]['migration_number']:04d} is applied, so the live schema "
+                               f"is past {upto:04d}; squash from a branch database migrated exactly to {upto:04d}")
+
+            if not self.connect():
+                return False, "Failed to connect to the database."
+
+            cursor = self.connection.cursor()
+            cursor.execute(f"USE `{self._branch_db_name(branch)}`")
+            cursor.execute("SHOW FULL TABLES")
+            objects = [(self._decode(name), self._decode(table_type)) for name, table_type in cursor.fetchall()]
+
+            db_name = self._branch_db_name(branch)
+            tables, views = [], []
+            for name, table_type in sorted(objects):
+                if name == 'schema_migrations':
+                    continue
+                if table_type == 'VIEW':
+                    cursor.execute(f"SHOW CREATE VIEW `{name}`")
+                    views.append((name, self._decode(cursor.fetchone()[1])))
+                else:
+                    cursor.execute(f"SHOW CREATE TABLE `{name}`")
+                    # Drop the AUTO_INCREMENT counter so the baseline starts fresh tables at 1
+                    ddl = re.sub(r' AUTO_INCREMENT=\d+', '', self._decode(cursor.fetchone()[1]))
+                    tables.append((name, ddl))
+            # Views may select from other views, and their DDL names this branch's database
+            views = [(name, strip_definer(unqualify(ddl, db_name))) for name, ddl in order_views(views, db_name)]
+
+            routines = []
+            cursor.execute(ROUTINES_QUERY, (db_name,))
+            for name, routine_type in cursor.fetchall():
+                name, routine_type = self._decode(name), self._decode(routine_type)
+                cursor.execute(f"SHOW CREATE {routine_type} `{name}`")
+                ddl = cursor.fetchone()[2]
+                if ddl is None:
+                    return False, f"Cannot read the definition of {routine_type.lower()} '{name}'; squash needs its privileges"
+                routines.append((name, routine_type, strip_definer(self._decode(ddl))))
+
+            triggers = []
+            cursor.execute(TRIGGERS_QUERY, (db_name,))
+            for (name,) in cursor.fetchall():
+                name = self._decode(name)
+                cursor.execute(f"SHOW CREATE TRIGGER `{name}`")
+                triggers.append((name, strip_definer(self._decode(cursor.fetchone()[2]))))
+
+            branch_dir = self._init_branch_migrations(branch)
+            baseline_dir = f"{branch_dir}/{upto:04d}_baseline"
+            archive_dir = f"{branch_dir}/{SQUASHED_MIGRATIONS_DIR}"
+            os.makedirs(archive_dir, exist_ok=True)
+
+            # Move the replaced migrations out of the way before the baseline takes their number
+            for migration in replaced:
+                migration_dir = self.migration_manager.get_migration_dir(branch, migration['migration_number'])
+                if migration_dir:
+                    shutil.move(migration_dir, f"{archive_dir}/{os.path.basename(migration_dir)}")
+
+            os.makedirs(baseline_dir, exist_ok=True)
+            created_at = datetime.now()
+            header = (f"-- Migration: baseline\n"
+                      f"-- Created at: {created_at.isoformat()}\n"
+                      f"-- Branch: {branch}\n"
+                      f"-- Squashes migrations {replaced[0]['migration_number']:04d}-{upto:04d}\n")
+            with open(f"{baseline_dir}/up.sql", 'w') as f:
+                f.write(header + "-- Up Migration\n\n")
+                f.write("SET FOREIGN_KEY_CHECKS = 0;\n\n")
+                for _, ddl in tables:
+                    f.write(f"{ddl};\n\n")
+                # Routines before views, which may call functions
+                for _, _, ddl in routines:
+                    f.write(delimited(ddl) + "\n")
+                for _, ddl in views:
+                    f.write(f"{ddl};\n\n")
+                for _, ddl in triggers:
+                    f.write(delimited(ddl) + "\n")
+                f.write("SET FOREIGN_KEY_CHECKS = 1;\n")
+            with open(f"{baseline_dir}/down.sql", 'w') as f:
+                f.write(header + "-- Down Migration\n\n")
+                f.write("SET FOREIGN_KEY_CHECKS = 0;\n")
+                for name, _ in reversed(triggers):
+                    f.write(f"DROP TRIGGER IF EXISTS `{name}`;\n")
+                for name, _ in reversed(views):
+                    f.write(f"DROP VIEW IF EXISTS `{name}`;\n")
+                for name, routine_type, _ in reversed(routines):
+                    f.write(f"DROP {routine_type} IF EXISTS `{name}`;\n")
+                for name, _ in reversed(tables):
+                    f.write(f"DROP TABLE IF EXISTS `{name}`;\n")
+                f.write("SET FOREIGN_KEY_CHECKS = 1;\n")
+
+            baseline = {
+                "migration_number": upto,
+                "name": "baseline",
+                "description": f"Baseline replacing migrations {replaced[0]['migration_number']:04d}-{upto:04d}",
+                "branch": branch,
+                "created_at": created_at.strftime("%Y%m%d%H%M%S"),
+                "parent_branch": self.config['branches'][branch].get('created_from'),
+                "parent_migration_number": replaced[0].get('parent_migration_number'),
+                "status": "applied",
+                "applied_at": created_at.isoformat(),
+                "checksum": file_sha256(f"{baseline_dir}/up.sql"),
+                "squashes": [
+                    {"migration_number": m['migration_number'], "name": m['name'], "applied_at": m['applied_at']}
+                    for m in replaced
+                ]
+            }
+            with open(f"{baseline_dir}/metadata.json", 'w') as f:
+                json.dump(baseline, f, indent=4)
+
+            self.migration_manager.replace_branch(branch, [baseline] + [
+                m for m in migrations if m['migration_number'] > upto
+            ])
+            self.migration_manager._save_migrations()
+
+            return True, (f"Squashed {len(replaced)} migrations into {upto:04d}_baseline "
+                          f"({len(tables)} tables, {len(views)} views, {len(routines)} routines, "
+                          f"{len(triggers)} triggers); originals moved to {archive_dir}")
+
+        except Exception as e:
+            return False, f"Error squashing migrations: {str(e)}"
+        finally:
+            if cursor:
+                cursor.close()
+            if self.connection and self.connection.is_connected():
+                self.connection.close()
+
     def _get_parent_branch_migration_number(self, branch):
         """Get the last migration number from parent branch when this branch was created."""
         parent_branch = self.config['branches'][branch].get('created_from')
@@ -817,14 +1760,7 @@ class DatabaseManager:
 
     def get_current_migration(self):
         """Get the number of the last applied migration in current branch."""
-        branch = self.config['current_branch']
-        migrations = self.migration_manager.migrations.get(branch, [])
-
-        applied_migrations = [m for m in migrations if m['status'] == 'applied']
-        if not applied_migrations:
-            return -1
-
-        return max(m['migration_number'] for m in applied_migrations)
+        return self.migration_manager.get_current_migration(self.config['current_branch'])
 
     def rollback_migration(self, migration_number):
         """Rollback a specific migration."""
@@ -832,8 +1768,7 @@ class DatabaseManager:
             branch = self.config['current_branch']
         
             # Check if migration exists and is applied
-            migration = next((m for m in self.migration_manager.migrations.get(branch, [])
-                            if m['migration_number'] == migration_number), None)
+            migration = self.migration_manager.get_migration(branch, migration_number)
         
             if not migration or migration['status'] != 'applied':
                 click.echo(f"Migration {migration_number:04d} is not applied or doesn't exist")
@@ -860,23 +1795,15 @@ class DatabaseManager:
             cursor.execute("START TRANSACTION")
         
             try:
-                executed_queries = []
-            
                 # Apply down migration
-                with open(migration_files['down'], 'r') as f:
-                    sql = f.read()
-                    if sql.strip():
-                        for statement in sql.split(';'):
-                            if statement.strip():
-                                cursor.execute(statement)
-                                executed_queries.append(statement.strip())
+                executed_queries = self._execute_sql_file(cursor, migration_files['down'])
             
                 # Update migration status in JSON
-                migration['status'] = 'rolled_back'
-                migration['applied_at'] = None
+                self.migration_manager.set_status(branch, migration_number, 'rolled_back', applied_at=None, checksum=None)
                 self.migration_manager._save_migrations()
             
                 cursor.execute("COMMIT")
+                self._record_schema_fingerprint(cursor, branch, self.migration_manager.get_current_migration(branch))
                 click.echo(f"Successfully rolled back migration {migration_number:04d}")
                 return True, executed_queries
 
@@ -899,32 +1826,187 @@ class DatabaseManager:
         next_migration = current_migration + 1
         return self.apply_migration(next_migration)
 
-    def migrate_down(self):
-        current_migration = self.get_current_migration()
-        if current_migration > 0:
-            # We need to implement a rollback_migration method
-            return self.rollback_migration(current_migration)
-        else:
-            return False, []
-
-    def _get_parent_branch_pending_migrations(self, branch):
+    def migrate_up_all(self, target_number=None, save_every=10):
         """
-        Get pending migrations from source branch that need to be applied to current branch.
-        This considers the branch ancestry and ensures proper migration ordering.
+        Apply every pending migration of the current branch in order over one connection.
+
+        Stops at the first failure. Migration state is written to migrations.json every
+        `save_every` migrations and once more when the run ends, instead of after each one.
 
         Args:
-            branch (str): Source branch name to check migrations from
+            target_number (int, optional): Stop after applying this migration number
+            save_every (int): Number of applied migrations between state writes
 
         Returns:
-            list: List of tuples (migration_number, migration_name) that need to be applied
+            tuple: (bool, list) - (Success status, per-migration results with timing)
         """
+        branch = self.config['current_branch']
+        chain = self.migration_manager.get_unapplied_after(branch, self.get_current_migration(), target_number)
+        if not chain:
+            click.echo(f"No pending migrations for branch '{branch}'")
+            return True, []
+
+        results = []
+        cursor = None
+        unsaved = 0
         try:
-            # Get branch creation timestamps and parent information
-            source_created_at = datetime.fromisoformat(self.config['branches'][branch]['created_at'])
-            target_branch = self.config['current_branch']
-            target_created_at = datetime.fromisoformat(self.config['branches'][target_branch]['created_at'])
+            if not self.connect():
+                return False, results
 
-            # Determine common ancestor
+            cursor = self.connection.cursor()
+            cursor.execute(f"USE `{self._branch_db_name(branch)}`")
+
+            for migration in chain:
+                migration_number = migration['migration_number']
+                click.echo(f"Applying migration {migration_number:04d}_{migration['name']}")
+                started_at = time.time()
+                result = {'number': migration_number, 'name': migration['name'], 'statements': 0}
+                results.append(result)
+
+                migration_files = self._get_migration_files(branch, migration_number)
+                if not migration_files:
+                    result.update(status='failed', seconds=0.0, error='Migration files not found')
+                    return False, results
+
+                try:
+                    checksum = file_sha256(migration_files['up'])
+                    cursor.execute("START TRANSACTION")
+                    executed_queries = self._execute_sql_file(cursor, migration_files['up'])
+                    cursor.execute("COMMIT")
+                except Exception as e:
+                    # Not only SQL errors: up.sql may be unreadable or carry a malformed directive
+                    cursor.execute("ROLLBACK")
+                    self.migration_manager.set_status(branch, migration_number, 'failed', error_message=str(e))
+                    unsaved += 1
+                    result.update(status='failed', seconds=time.time() - started_at, error=str(e))
+                    click.echo(f"Error applying migration {migration_number:04d}: {e}")
+                    return False, results
+
+                self.migration_manager.set_status(branch, migration_number, 'applied', applied_at=datetime.now().isoformat(),
+                                                  error_message=None, checksum=checksum)
+                result.update(status='applied', seconds=time.time() - started_at, statements=len(executed_queries),
+                              profile=executed_queries)
+
+                unsaved += 1
+                if unsaved >= save_every:
+                    self.migration_manager._save_migrations()
+                    unsaved = 0
+
+            return True, results
+
+        finally:
+            if unsaved:
+                self.migration_manager._save_migrations()
+            if cursor and any(r.get('status') == 'applied' for r in results):
+                self._record_schema_fingerprint(cursor, branch, self.get_current_migration())
+            if cursor:
+                cursor.close()
+            if self.connection and self.connection.is_connected():
+                self.connection.close()
+
+    def _schema_fingerprint(self, cursor, db_name):
+        """Fingerprint a database's schema from normalized information_schema rows."""
+        rows_by_category = {}
+        for category, query in FINGERPRINT_QUERIES:
+            cursor.execute(query, (db_name,))
+            rows_by_category[category] = cursor.fetchall()
+        return fingerprint_rows(rows_by_category)
+
+    def _record_schema_fingerprint(self, cursor, branch, migration_number):
+        """Remember the schema a branch has after its migrations ran, for verify-migrations."""
+        try:
+            fingerprint = self._schema_fingerprint(cursor, self._branch_db_name(branch))
+        except Error as e:
+            click.echo(f"Warning: could not record schema fingerprint: {e}")
+            return
+        FingerprintStore().set(branch, fingerprint, migration_number)
+
+    def verify_migrations(self, branch_name=None, accept=False):
+        """
+        Detect drift between a branch's migrations, their files and its live schema.
+
+        Applied migrations whose up.sql no longer matches the checksum taken when they
+        were applied are reported, and the live schema fingerprint is compared with the
+        one recorded after the last migration ran.
+
+        Args:
+            branch_name (str, optional): Branch to verify, defaults to the current branch
+            accept (bool): Record the live schema as the expected one afterwards
+
+        Returns:
+            tuple: (bool, dict) - (True if no drift was found, {'files': [...], 'schema': {...}})
+        """
+        cursor = None
+        try:
+            branch = branch_name or self.config['current_branch']
+            files = []
+            for migration in self.migration_manager.migrations.get(branch, []):
+                if migration['status'] != 'applied':
+                    continue
+                migration_dir = self.migration_manager.get_migration_dir(branch, migration['migration_number'])
+                if not migration_dir or not os.path.exists(f"{migration_dir}/up.sql"):
+                    state = 'missing'
+                elif not migration.get('checksum'):
+                    state = 'no checksum'
+                elif file_sha256(f"{migration_dir}/up.sql") != migration['checksum']:
+                    state = 'modified'
+                else:
+                    state = 'ok'
+                files.append((migration['migration_number'], migration['name'], state))
+
+            if not self.connect():
+                return False, {'files': files, 'schema': {'status': 'Failed to connect to the database.'}}
+
+            cursor = self.connection.cursor()
+            live = self._schema_fingerprint(cursor, self._branch_db_name(branch))
+            store = FingerprintStore()
+            recorded = store.get(branch)
+            if recorded is None:
+                schema = {'status': 'no fingerprint recorded', 'added': [], 'removed': [], 'changed': []}
+            else:
+                schema = compare_fingerprints(recorded, live)
+                drifted = schema['added'] or schema['removed'] or schema['changed']
+                schema['status'] = 'drifted' if drifted else 'ok'
+            if accept:
+                store.set(branch, live, self.migration_manager.get_current_migration(branch))
+
+            ok = all(state in ('ok', 'no checksum') for _, _, state in files) and schema['status'] != 'drifted'
+            return ok, {'files': files, 'schema': schema}
+
+        except Error as e:
+            return False, {'files': [], 'schema': {'status': f"Error verifying migrations: {e}"}}
+        finally:
+            if cursor:
+                cursor.close()
+            if self.connection and self.connection.is_connected():
+                self.connection.close()
+
+    def migrate_down(self):
+        current_migration = self.get_current_migration()
+        if current_migration > 0:
+            # We need to implement a rollback_migration method
+            return self.rollback_migration(current_migration)
+        else:
+            return False, []
+
+    def _get_parent_branch_pending_migrations(self, branch):
+        """
+        Get pending migrations from source branch that need to be applied to current branch.
+        This considers the branch ancestry and ensures proper migration ordering.
+
+        Args:
+            branch (str): Source branch name to check migrations from
+
+        Returns:
+            list: List of tuples (migration_number, migration_name) that need to be applied
+        """
+        try:
+            # Get branch creation timestamps and parent information
+            source_created_at = datetime.fromisoformat(self.config['branches'][branch]['created_at'])
+            target_branch = self.config['current_branch']
+            target_created_at = datetime.fromisoformat(self.config['branches'][target_branch]['created_at'])
+
+            # Determine common ancestor
             source_lineage = self._get_branch_lineage(branch)
             target_lineage = self._get_branch_lineage(target_branch)
             common_ancestor = next((ancestor for ancestor in source_lineage if ancestor in target_lineage), None)
@@ -991,12 +2073,13 @@ class DatabaseManager:
     
         return lineage
 
-    def merge_branch(self, source_branch, target_branch):
+    def merge_branch(self, source_branch, target_branch, progress=None):
         """
         Merge complete contents (schema + data) from source_branch into target_branch.
         Args:
             source_branch (str): Name of the branch to merge from
             target_branch (str): Name of the branch to merge into
+            progress (callable, optional): Called with tables_done, tables_total, rows and table as tables are merged
         Returns:
             tuple: (bool, str) - (Success status, Message)
         """
@@ -1030,6 +2113,7 @@ class DatabaseManager:
                 return True, f"No tables found in source branch '{source_branch}' to merge."
 
             merged_tables = []
+            merged_rows = 0
             for table in tables:
                 cursor.execute(f"USE `{target_db}`")
                 cursor.execute(f"SHOW TABLES LIKE '{table}'")
@@ -1057,14 +2141,21 @@ class DatabaseManager:
                 """
                 cursor.execute(merge_query)
                 merged_tables.append(table)
+                merged_rows += max(cursor.rowcount, 0)
+                if progress:
+                    progress(tables_done=len(merged_tables), tables_total=len(tables), rows=merged_rows, table=table)
 
             # Update migration history
             source_migrations = self.migration_manager.migrations.get(source_branch, [])
             target_migrations = self.migration_manager.migrations.get(target_branch, [])
         
-            new_migrations = [m for m in source_migrations if m['migration_number'] > max([tm['migration_number'] for tm in target_migrations] + [0])]
-            target_migrations.extend(new_migrations)
-            self.migration_manager.migrations[target_branch] = sorted(target_migrations, key=lambda x: x['migration_number'])
+            target_max = max(self.migration_manager.get_max_migration_number(target_branch), 0)
+            new_migrations = [m for m in source_migrations if m['migration_number'] > target_max]
+            self.migration_manager.replace_branch(
+                target_branch,
+                sorted(target_migrations, key=lambda x: x['migration_number'])
+                + [dict(m, branch=target_branch) for m in sorted(new_migrations, key=lambda x: x['migration_number'])]
+            )
             self.migration_manager._save_migrations()
 
             self.connection.commit()
@@ -1078,19 +2169,103 @@ class DatabaseManager:
                 cursor.close()
                 self.connection.close() 
     
-    def export_data(self, table_name, file_path=None, export_format='csv'):
+    def profile_table(self, table_name, columns=None, sample_rows=None, top_k=DEFAULT_TOP_K,
+                      chunk_size=DEFAULT_PROFILE_CHUNK_SIZE, branch_name=None):
+        """
+        Profile a table's columns in one streaming pass over the rows.
+
+        Reports null ratios, approximate distinct counts, frequent values and, for
+        numeric columns, quantiles and a histogram, holding a fixed amount of state
+        per column however large the table is.
+
+        Args:
+            table_name (str): Table to profile
+            columns (list, optional): Columns to profile; all except large-object columns by default
+            sample_rows (int, optional): Profile only the first N rows
+            top_k (int): Number of frequent values reported per column
+            chunk_size (int): Rows fetched per batch
+            branch_name (str, optional): Branch to profile (defaults to the current branch)
+
+        Returns:
+            tuple: (bool, dict or str) - (Success status, Profile or error message)
         """
-        Export data from a specific table to a CSV or PDF file.
+        branch = branch_name or self.config['current_branch']
+        db_name = self._branch_db_name(branch)
+        try:
+            if not self.connect():
+                return False, "Failed to connect to the database."
+
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                ORDER BY ORDINAL_POSITION
+            """, (db_name, table_name))
+            table_columns = [(self._decode(name), self._decode(data_type)) for name, data_type in cursor.fetchall()]
+            if not table_columns:
+                return False, f"Table '{table_name}' does not exist in branch '{branch}'."
+            if columns:
+                unknown = set(columns) - {name for name, _ in table_columns}
+                if unknown:
+                    return False, f"Unknown columns in '{table_name}': {', '.join(sorted(unknown))}"
+                table_columns = [column for column in table_columns if column[0] in columns]
+
+            profiler = TableProfiler(table_columns, top_k=top_k)
+            if not profiler.columns:
+                return False, "No columns to profile (large-object columns are skipped)."
+
+            # Unbuffered: rows are pulled from the server one batch at a time
+            column_list = ', '.join(quote_identifier(name) for name in profiler.column_names)
+            cursor.execute(
+                f"SELECT {column_list} FROM {quote_identifier(db_name)}.{quote_identifier(table_name)}"
+                f"{self._limit_clause(sample_rows)}"
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                profiler.update(rows)
+
+            return True, profiler.result()
+
+        except Exception as e:
+            return False, f"Error profiling table: {str(e)}"
+        finally:
+            if 'cursor' in locals() and cursor:
+                cursor.close()
+            if self.connection and self.connection.is_connected():
+                self.connection.close()
+
+    def export_data(self, table_name, file_path=None, export_format='csv', batch_size=50000, compression=None,
+                    max_rows=None, progress=None):
+        """
+        Export data from a specific table to a CSV, PDF, Parquet or Arrow IPC file.
     
         Args:
             table_name (str): Name of the table to export
             file_path (str, optional): Path to save the exported file. If not provided, a default path will be used.
-            export_format (str): Format to export ('csv' or 'pdf'). Defaults to 'csv'.
+            export_format (str): Format to export ('csv', 'pdf', 'parquet' or 'arrow'). Defaults to 'csv'.
+            batch_size (int): Rows fetched per batch, and rows per row group for Parquet and Arrow exports.
+            compression (str, optional): 'gzip' or 'zstd'. CSV files are compressed as a stream,
+                Parquet and Arrow files use the codec internally. Detected from a CSV file_path if not
+                provided; Parquet and Arrow file paths must not carry a .gz/.zst suffix.
+            max_rows (int, optional): Export at most this many rows.
+            progress (callable, optional): Called with the rows written so far after each batch.
     
         Returns:
             tuple: (bool, str) - (Success status, Message or file path)
         """
         try:
+            export_format = export_format.lower()
+            if export_format in COLUMNAR_FORMATS and file_path and detect_compression(file_path):
+                # The codec is applied inside the file, which import_data reads by its plain extension
+                return False, (f"{export_format.capitalize()} files are compressed internally; name the file "
+                               f"'{strip_compression_extension(file_path)}' and pass the codec with --compress.")
+            if not compression and file_path:
+                compression = detect_compression(file_path)
+            if compression and export_format == 'pdf':
+                return False, "Compression is not supported for PDF exports."
+
             if not self.connect():
                 return False, "Failed to connect to the database."
 
@@ -1108,53 +2283,20 @@ class DatabaseManager:
             cursor.execute(f"SHOW TABLES LIKE %s", (table_name,))
             if not cursor.fetchone():
                 return False, f"Table '{table_name}' does not exist in branch '{branch}'."
-    
-            # Fetch all data from the table
-            cursor.execute(f"SELECT * FROM `{table_name}`")
-            rows = cursor.fetchall()
-    
-            if not rows:
-                return False, f"No data found in table '{table_name}'."
 
-            # Generate file path if not provided
-            if not file_path:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                file_path = f"exports/{db_name}_{table_name}_{timestamp}.{export_format}"
-        
-                # Ensure exports directory exists
-                os.makedirs("exports", exist_ok=True)
-    
-            if export_format.lower() == 'csv':
-                # Export to CSV
-                df = pd.DataFrame(rows)
-                df.to_csv(file_path, index=False)
-            elif export_format.lower() == 'pdf':
-                # Export to PDF
-                pdf = SimpleDocTemplate(file_path, pagesize=letter)
-                table_data = [list(rows[0].keys())] + [list(row.values()) for row in rows]
-                table = Table(table_data)
-                style = TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 12),
-                    ('TOPPADDING', (0, 1), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ])
-                table.setStyle(style)
-                pdf.build([table])
-            else:
-                return False, f"Unsupported export format: {export_format}"
-    
-            return True, file_path
+            # Every format is streamed in batches instead of fetched at once
+            if export_format == 'csv':
+                return self._export_csv(
+                    cursor, db_name, table_name, file_path, batch_size, compression, max_rows, progress
+                )
+            if export_format in COLUMNAR_FORMATS:
+                return self._export_columnar(
+                    db_name, table_name, file_path, export_format, batch_size, compression, max_rows, progress
+                )
+            if export_format == 'pdf':
+                return self._export_pdf(cursor, db_name, table_name, file_path, batch_size, max_rows, progress=progress)
+
+            return False, f"Unsupported export format: {export_format}"
 
         except Exception as e:
             return False, f"Error exporting data: {str(e)}"
@@ -1164,79 +2306,761 @@ class DatabaseManager:
             if self.connection and self.connection.is_connected():
                 self.connection.close()
 
-    def import_data(self, table_name, file_path, create_if_not_exists=False):
+    def _default_export_path(self, db_name, table_name, export_format, compression=None):
+        """Build a timestamped path in the exports directory."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Ensure exports directory exists
+        os.makedirs("exports", exist_ok=True)
+        file_path = f"exports/{db_name}_{table_name}_{timestamp}.{export_format}"
+        if compression:
+            file_path += COMPRESSION_EXTENSIONS[compression]
+        return file_path
+
+    def _limit_clause(self, max_rows):
+        """Build an optional LIMIT clause for row-capped exports."""
+        return f" LIMIT {int(max_rows)}" if max_rows else ""
+
+    def _export_csv(self, cursor, db_name, table_name, file_path, batch_size, compression=None, max_rows=None,
+                    progress=None):
+        """Stream a table into a CSV file, optionally through a gzip/zstd compressor."""
+        cursor.execute(f"SELECT * FROM `{table_name}`{self._limit_clause(max_rows)}")
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return False, f"No data found in table '{table_name}'."
+
+        if not file_path:
+            file_path = self._default_export_path(db_name, table_name, 'csv', compression)
+
+        with open_compressed(file_path, 'w', compression) as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=cursor.column_names)
+            writer.writeheader()
+            written = 0
+            while rows:
+                writer.writerows(rows)
+                written += len(rows)
+                if progress:
+                    progress(rows=written)
+                rows = cursor.fetchmany(batch_size)
+
+        return True, file_path
+
+    def _get_column_definitions(self, cursor, db_name, table_name):
+        """Get (name, data_type, column_type, precision, scale, is_nullable) rows for a table."""
+        cursor.execute("""
+            SELECT COLUMN_NAME, DATA_TYPE, COLUMN_TYPE, NUMERIC_PRECISION, NUMERIC_SCALE, IS_NULLABLE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+            ORDER BY ORDINAL_POSITION
+        """, (db_name, table_name))
+        return cursor.fetchall()
+
+    def _export_pdf(self, cursor, db_name, table_name, file_path, batch_size, max_rows=None, sample_size=200,
+                    progress=None):
+        """Stream a table into a PDF, laying out one page-sized table chunk at a time."""
+        cursor.execute(f"SELECT * FROM `{table_name}`{self._limit_clause(max_rows)}")
+        # Column widths are computed from the first batch only
+        rows = [list(row.values()) for row in cursor.fetchmany(max(batch_size, sample_size))]
+        if not rows:
+            return False, f"No data found in table '{table_name}'."
+
+        if not file_path:
+            file_path = self._default_export_path(db_name, table_name, 'pdf')
+
+        report = PaginatedPDFTable(file_path, cursor.column_names, rows[:sample_size], title=f"{db_name}.{table_name}")
+        written = 0
+        while rows:
+            report.add_rows(rows)
+            written += len(rows)
+            if progress:
+                progress(rows=written)
+            rows = [list(row.values()) for row in cursor.fetchmany(batch_size)]
+        report.close()
+
+        return True, file_path
+
+    def _export_columnar(self, db_name, table_name, file_path, export_format, batch_size, compression=None,
+                         max_rows=None, progress=None):
+        """Stream a table into a Parquet or Arrow IPC file, one row group per fetched batch."""
+        cursor = self.connection.cursor()
+        try:
+            schema = arrow_schema_for_columns(self._get_column_definitions(cursor, db_name, table_name))
+
+            columns_str = ", ".join(f"`{field.name}`" for field in schema)
+            cursor.execute(f"SELECT {columns_str} FROM `{table_name}`{self._limit_clause(max_rows)}")
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return False, f"No data found in table '{table_name}'."
+
+            if not file_path:
+                file_path = self._default_export_path(db_name, table_name, export_format)
+
+            metadata = {'table': table_name, 'database': db_name}
+            with ColumnarWriter(file_path, export_format, schema, metadata=metadata, compression=compression) as writer:
+                written = 0
+                while rows:
+                    writer.write_rows(rows)
+                    written += len(rows)
+                    if progress:
+                        progress(rows=written)
+                    rows = cursor.fetchmany(batch_size)
+
+            return True, file_path
+        finally:
+            cursor.close()
+
+    def import_data(self, table_name, file_path, create_if_not_exists=False, import_format=None, batch_size=10000,
+                    progress=None):
         """
-        Import data from a CSV file into a specific table.
+        Import data from a CSV, Parquet or Arrow IPC file into a specific table.
     
         Args:
             table_name (str): Name of the table to import data into
-            file_path (str): Path of the CSV file to import
+            file_path (str, file object or bytes): Path of the file to import, or its content as a binary
+                file object or bytes (e.g. an upload held in memory). Streams are read once and left open.
+                CSV files ending in .gz or .zst are decompressed on the fly.
             create_if_not_exists (bool): If True, create the table if it doesn't exist
+            import_format (str, optional): 'csv', 'parquet' or 'arrow'. Detected from the file (or stream)
+                name if not provided.
+            batch_size (int): Rows inserted per batch.
+            progress (callable, optional): Called with the rows inserted so far after each batch.
 
         Returns:
             tuple: (bool, str) - (Success status, Message)
         """
+        cursor = None
         try:
-            if not os.path.exists(file_path):
-                return False, f"File not found: {file_path}"
+            if isinstance(file_path, (bytes, bytearray, memoryview)):
+                file_path = io.BytesIO(file_path)
+            if isinstance(file_path, (str, os.PathLike)):
+                name = os.fspath(file_path)
+                if not os.path.exists(name):
+                    return False, f"File not found: {name}"
+            else:
+                # Uploads and open files carry a name to detect the format from
+                name = getattr(file_path, 'name', None)
+                name = name if isinstance(name, str) else ''
+
+            # Compressed files are decompressed as a stream while reading
+            compression = detect_compression(name)
+            import_format = (import_format or detect_columnar_format(strip_compression_extension(name)) or 'csv').lower()
+            if compression and import_format in COLUMNAR_FORMATS:
+                return False, f"Compressed {import_format} files are not supported; export them with --compress instead."
+            if import_format not in ('csv',) + COLUMNAR_FORMATS:
+                return False, f"Unsupported import format: {import_format}"
 
             if not self.connect():
                 return False, "Failed to connect to the database."
 
             cursor = self.connection.cursor()
             branch = self.config['current_branch']
-        
-            db_name = self.config['connection']['database']
-            if branch != 'main':
-                db_name = f"{db_name}_{branch}"
-        
-            cursor.execute(f"USE `{db_name}`")
+            cursor.execute(f"USE `{self._branch_db_name(branch)}`")
         
             # Check if table exists
             cursor.execute(f"SHOW TABLES LIKE '{table_name}'")
             table_exists = cursor.fetchone() is not None
+            if not table_exists and not create_if_not_exists:
+                return False, f"Table '{table_name}' does not exist in branch '{branch}'."
 
-            if not table_exists:
-                if not create_if_not_exists:
-                    return False, f"Table '{table_name}' does not exist in branch '{branch}'."
-                else:
+            if import_format in COLUMNAR_FORMATS:
+                if not table_exists:
+                    # Create the table with the column types recorded in the file
+                    schema = read_columnar_schema(file_path, import_format)
+                    create_table_query = f"CREATE TABLE `{table_name}` ("
+                    create_table_query += ", ".join([
+                        f"`{field.name}` {mysql_type_for_field(field)}{'' if field.nullable else ' NOT NULL'}"
+                        for field in schema
+                    ])
+                    create_table_query += ")"
+                    cursor.execute(create_table_query)
+                    self.connection.commit()
+                    print(f"Created new table '{table_name}' based on {import_format} schema.")
+
+                # Get table columns
+                cursor.execute(f"DESCRIBE `{table_name}`")
+                columns = [column[0] for column in cursor.fetchall()]
+
+                imported_rows = 0
+                for batch_columns, rows in iter_columnar_batches(file_path, import_format, batch_size):
+                    # Only insert columns that exist in the target table
+                    indexes = [i for i, col in enumerate(batch_columns) if col in columns]
+                    if not indexes or not rows:
+                        continue
+                    columns_str = ', '.join(f'`{batch_columns[i]}`' for i in indexes)
+                    placeholders = ', '.join(['%s'] * len(indexes))
+                    sql = f"INSERT INTO `{table_name}` ({columns_str}) VALUES ({placeholders})"
+                    cursor.executemany(sql, [tuple(row[i] for i in indexes) for row in rows])
+                    imported_rows += len(rows)
+                    if progress:
+                        progress(rows=imported_rows)
+
+                self.connection.commit()
+                return True, f"Successfully imported {imported_rows} rows into table '{table_name}'."
+        
+            # Stream the CSV once: the header row creates the table if needed, then rows are inserted in batches
+            imported_rows = 0
+            with self._open_import_csv(file_path, compression) as csvfile:
+                csv_reader = csv.reader(csvfile)
+                headers = next(csv_reader, [])
+                if not table_exists:
                     # Create the table based on CSV structure
-                    with open(file_path, 'r') as csvfile:
-                        csv_reader = csv.reader(csvfile)
-                        headers = next(csv_reader)
-                        create_table_query = f"CREATE TABLE `{table_name}` ("
-                        create_table_query += ", ".join([f"`{header}` TEXT" for header in headers])
-                        create_table_query += ")"
-                        cursor.execute(create_table_query)
+                    create_table_query = f"CREATE TABLE `{table_name}` ("
+                    create_table_query += ", ".join([f"`{header}` TEXT" for header in headers])
+                    create_table_query += ")"
+                    cursor.execute(create_table_query)
                     self.connection.commit()
                     print(f"Created new table '{table_name}' based on CSV structure.")
 
-            # Get table columns
-            cursor.execute(f"DESCRIBE `{table_name}`")
-            columns = [column[0] for column in cursor.fetchall()]
-        
-            # Read CSV file and insert data
-            with open(file_path, 'r') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
+                # Get table columns
+                cursor.execute(f"DESCRIBE `{table_name}`")
+                columns = [column[0] for column in cursor.fetchall()]
+
+                # Filter rows to only include existing columns
+                indexes = [i for i, col in enumerate(headers) if col in columns]
+                if not indexes:
+                    return False, f"None of the CSV columns match table '{table_name}'."
+                columns_str = ', '.join(f'`{headers[i]}`' for i in indexes)
+                placeholders = ', '.join(['%s'] * len(indexes))
+                sql = f"INSERT INTO `{table_name}` ({columns_str}) VALUES ({placeholders})"
+
+                batch = []
                 for row in csv_reader:
-                    # Filter row to only include existing columns
-                    filtered_row = {k: v for k, v in row.items() if k in columns}
-                    placeholders = ', '.join(['%s'] * len(filtered_row))
-                    columns_str = ', '.join(f'`{col}`' for col in filtered_row.keys())
-                    sql = f"INSERT INTO `{table_name}` ({columns_str}) VALUES ({placeholders})"
-                    cursor.execute(sql, list(filtered_row.values()))
+                    if not row:
+                        continue
+                    batch.append([row[i] if i < len(row) else None for i in indexes])
+                    if len(batch) >= batch_size:
+                        cursor.executemany(sql, batch)
+                        imported_rows += len(batch)
+                        batch = []
+                        if progress:
+                            progress(rows=imported_rows)
+                if batch:
+                    cursor.executemany(sql, batch)
+                    imported_rows += len(batch)
+                    if progress:
+                        progress(rows=imported_rows)
         
             self.connection.commit()
-            return True, f"Successfully imported data into table '{table_name}'."
+            return True, f"Successfully imported {imported_rows} rows into table '{table_name}'."
 
         except Exception as e:
-            self.connection.rollback()
+            if self.connection and self.connection.is_connected():
+                self.connection.rollback()
             return False, f"Error importing data: {str(e)}"
         finally:
             if self.connection and self.connection.is_connected():
+                if cursor:
+                    cursor.close()
+                self.connection.close()
+
+    @staticmethod
+    def _open_import_csv(file_path, compression):
+        """Open a CSV import source (path, binary or text stream) as text."""
+        if isinstance(file_path, (str, os.PathLike)):
+            return open_compressed(os.fspath(file_path), 'r', compression)
+        if isinstance(file_path, io.TextIOBase):
+            return nullcontext(file_path)
+        return read_text_stream(file_path, compression)
+
+    def export_branch(self, output_dir=None, jobs=4, export_format='csv', compression=None,
+                      chunk_rows=500000, batch_size=10000):
+        """
+        Export every table of the current branch concurrently into a directory bundle.
+
+        The bundle contains schema/<table>.sql with the table DDL, data/<table>.<chunk>.<ext>
+        files (tables with an integer primary key are split into primary key ranges),
+        a copy of the branch's migrations and manifest.json with row counts and SHA-256
+        checksums for every file. CSV data files use MySQL's LOAD DATA conventions so
+        import-branch can load them server-side; binary columns are hex-encoded.
+
+        Every worker connection reads from a consistent snapshot. The snapshots are opened
+        while the branch's tables are read-locked, so all chunks see the same point in time.
+        If the tables can't be locked, the export still runs and the manifest records
+        'consistent': false.
+
+        Args:
+            output_dir (str, optional): Bundle directory. Defaults to exports/<db>_bundle_<timestamp>.
+            jobs (int): Number of chunks exported concurrently, each over its own pooled connection.
+            export_format (str): 'csv', 'parquet' or 'arrow'.
+            compression (str, optional): 'gzip' or 'zstd'.
+            chunk_rows (int): Approximate number of rows per chunk file.
+            batch_size (int): Rows fetched per round trip.
+
+        Returns:
+            tuple: (bool, str) - (Success status, Message or bundle directory)
+        """
+        export_format = export_format.lower()
+        if export_format not in ('csv',) + COLUMNAR_FORMATS:
+            return False, f"Unsupported bundle format: {export_format}"
+
+        cursor = None
+        try:
+            if not self.connect():
+                return False, "Failed to connect to the database."
+
+            cursor = self.connection.cursor()
+            branch = self.config['current_branch']
+            db_name = self._branch_db_name(branch)
+            cursor.execute(f"USE `{db_name}`")
+
+            if not output_dir:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_dir = f"exports/{db_name}_bundle_{timestamp}"
+            if os.path.exists(output_dir) and os.listdir(output_dir):
+                return False, f"Bundle directory '{output_dir}' already exists and is not empty."
+            os.makedirs(f"{output_dir}/schema", exist_ok=True)
+            os.makedirs(f"{output_dir}/data", exist_ok=True)
+
+            cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+            tables = [self._decode(row[0]) for row in cursor.fetchall()]
+
+            cursor.execute("""
+                SELECT TABLE_NAME, TABLE_ROWS FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = %s
+            """, (db_name,))
+            estimated_rows = {self._decode(name): rows or 0 for name, rows in cursor.fetchall()}
+
+            cursor.execute("""
+                SELECT k.TABLE_NAME, k.COLUMN_NAME, c.DATA_TYPE
+                FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE k
+                JOIN INFORMATION_SCHEMA.COLUMNS c
+                  ON c.TABLE_SCHEMA = k.TABLE_SCHEMA AND c.TABLE_NAME = k.TABLE_NAME AND c.COLUMN_NAME = k.COLUMN_NAME
+                WHERE k.TABLE_SCHEMA = %s AND k.CONSTRAINT_NAME = 'PRIMARY'
+                ORDER BY k.TABLE_NAME, k.ORDINAL_POSITION
+            """, (db_name,))
+            primary_keys = {}
+            for table_name, column_name, data_type in cursor.fetchall():
+                primary_keys.setdefault(self._decode(table_name), []).append(
+                    (self._decode(column_name), self._decode(data_type).lower())
+                )
+
+            cursor.execute(COLUMNS_QUERY, (db_name,))
+            binary_columns = {}
+            for table_name, column_name, data_type in cursor.fetchall():
+                if self._decode(data_type).lower() in BINARY_TYPES:
+                    binary_columns.setdefault(self._decode(table_name), []).append(self._decode(column_name))
+
+            extension = export_format
+            if compression and export_format == 'csv':
+                extension += COMPRESSION_EXTENSIONS[compression]
+
+            manifest_tables = {}
+            tasks = []
+            for table_name in tables:
+                cursor.execute(f"SHOW CREATE TABLE `{table_name}`")
+                ddl = self._decode(cursor.fetchone()[1])
+                schema_file = f"schema/{table_name}.sql"
+                with open(f"{output_dir}/{schema_file}", 'w') as f:
+                    f.write(f"{ddl};\n")
+
+                pk = primary_keys.get(table_name, [])
+                chunks = [(None, None)]
+                if len(pk) == 1 and pk[0][1] in ('tinyint', 'smallint', 'mediumint', 'int', 'bigint'):
+                    cursor.execute(f"SELECT MIN(`{pk[0][0]}`), MAX(`{pk[0][0]}`) FROM `{table_name}`")
+                    min_value, max_value = cursor.fetchone()
+                    chunks = plan_pk_chunks(min_value, max_value, estimated_rows.get(table_name, 0), chunk_rows)
+                    # The ranges are planned before the snapshot is taken, so the outer chunks
+                    # are left open-ended to catch keys written in between
+                    chunks[0] = (None, chunks[0][1])
+                    chunks[-1] = (chunks[-1][0], None)
+
+                manifest_tables[table_name] = {
+                    'schema': schema_file,
+                    'primary_key': [column for column, _ in pk],
+                    'binary_columns': binary_columns.get(table_name, []),
+                    'rows': 0,
+                    'files': []
+                }
+                for index, chunk in enumerate(chunks):
+                    data_file = f"data/{table_name}.{index:04d}.{extension}"
+                    tasks.append((table_name, [column for column, _ in pk], chunk, data_file))
+
+            # Column definitions are only needed to type Parquet/Arrow files
+            column_definitions = {}
+            if export_format in COLUMNAR_FORMATS:
+                for table_name in tables:
+                    column_definitions[table_name] = self._get_column_definitions(cursor, db_name, table_name)
+
+            workers = min(max(jobs, 1), pooling.CNX_POOL_MAXSIZE)
+            pool = self._create_pool(workers)
+            connections, consistent = self._open_snapshot_connections(cursor, pool, db_name, tables, workers)
+            if not consistent:
+                click.echo("Warning: could not lock the branch's tables; chunks are read from snapshots "
+                           "opened moments apart and may not be consistent with each other.")
+            idle = queue.Queue()
+            for connection in connections:
+                idle.put(connection)
+
+            def export_chunk(table_name, pk_columns, chunk, data_file):
+                # Each chunk runs on one of the snapshot connections
+                connection = idle.get()
+                try:
+                    return self._export_bundle_chunk(
+                        connection, table_name, pk_columns, chunk, f"{output_dir}/{data_file}", export_format,
+                        compression, batch_size, column_definitions.get(table_name), binary_columns.get(table_name, [])
+                    )
+                finally:
+                    idle.put(connection)
+
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {
+                        executor.submit(export_chunk, table_name, pk_columns, chunk, data_file): (table_name, data_file)
+                        for table_name, pk_columns, chunk, data_file in tasks
+                    }
+                    for future in as_completed(futures):
+                        table_name, data_file = futures[future]
+                        row_count = future.result()
+                        manifest_tables[table_name]['rows'] += row_count
+                        manifest_tables[table_name]['files'].append({
+                            'path': data_file,
+                            'rows': row_count,
+                            'sha256': file_sha256(f"{output_dir}/{data_file}")
+                        })
+                        click.echo(f"Exported {data_file} ({row_count} rows)")
+            finally:
+                for connection in connections:
+                    try:
+                        connection.rollback()
+                    finally:
+                        connection.close()
+
+            for table_info in manifest_tables.values():
+                table_info['files'].sort(key=lambda f: f['path'])
+
+            # Ship the branch's migration chain alongside the data
+            branch_migrations_dir = f"migrations/{branch}"
+            if os.path.isdir(branch_migrations_dir):
+                shutil.copytree(branch_migrations_dir, f"{output_dir}/migrations")
+
+            manifest = {
+                'version': BUNDLE_VERSION,
+                'branch': branch,
+                'database': db_name,
+                'created_at': datetime.now().isoformat(),
+                'format': export_format,
+                'compression': compression,
+                'consistent': consistent,
+                'tables': manifest_tables,
+                'migrations': self.migration_manager.migrations.get(branch, [])
+            }
+            with open(f"{output_dir}/{MANIFEST_FILE}", 'w') as f:
+                json.dump(manifest, f, indent=4, default=str)
+
+            return True, output_dir
+
+        except Exception as e:
+            return False, f"Error exporting branch: {str(e)}"
+        finally:
+            if cursor:
+                cursor.close()
+            if self.connection and self.connection.is_connected():
+                self.connection.close()
+
+    def _open_snapshot_connections(self, cursor, pool, db_name, tables, count):
+        """
+        Borrow `count` pooled connections, each inside a consistent-snapshot transaction.
+
+        The snapshots are opened while `cursor`'s session holds read locks on the tables,
+        so no write can land between them and every connection sees the same data.
+
+        Returns:
+            tuple: (connections, True if the snapshots are consistent with each other)
+        """
+        consistent = True
+        try:
+            if tables:
+                cursor.execute("LOCK TABLES " + ", ".join(f"`{table}` READ" for table in tables))
+        except Error:
+            consistent = False
+
+        connections = []
+        try:
+            for _ in range(count):
+                connection = pool.get_connection()
+                connections.append(connection)
+                snapshot_cursor = connection.cursor()
+                try:
+                    snapshot_cursor.execute(f"USE `{db_name}`")
+                    snapshot_cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                    snapshot_cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+                finally:
+                    snapshot_cursor.close()
+        except Exception:
+            for connection in connections:
+                connection.close()
+            raise
+        finally:
+            if consistent and tables:
+                cursor.execute("UNLOCK TABLES")
+        return connections, consistent
+
+    def _export_bundle_chunk(self, connection, table_name, pk_columns, chunk, file_path,
+                             export_format, compression, batch_size, column_definitions=None, binary_columns=()):
+        """Export one primary key range of a table inside the connection's snapshot. Returns the row count."""
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SHOW COLUMNS FROM `{table_name}`")
+            columns = [self._decode(col[0]) for col in cursor.fetchall()]
+            columns_str = ", ".join(f"`{col}`" for col in columns)
+            binary_positions = {columns.index(col) for col in binary_columns if col in columns}
+
+            query = f"SELECT {columns_str} FROM `{table_name}`"
+            params = ()
+            low, high = chunk
+            conditions = []
+            if low is not None:
+                conditions.append(f"`{pk_columns[0]}` >= %s")
+                params += (low,)
+            if high is not None:
+                conditions.append(f"`{pk_columns[0]}` < %s")
+                params += (high,)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            if pk_columns:
+                # Deterministic row order keeps checksums stable across exports
+                query += " ORDER BY " + ", ".join(f"`{col}`" for col in pk_columns)
+            cursor.execute(query, params)
+
+            row_count = 0
+            if export_format == 'csv':
+                with open_compressed(file_path, 'w', compression) as csvfile:
+                    write_mysql_csv_rows(csvfile, [columns])
+                    rows = cursor.fetchmany(batch_size)
+                    while rows:
+                        write_mysql_csv_rows(csvfile, rows, binary_positions)
+                        row_count += len(rows)
+                        rows = cursor.fetchmany(batch_size)
+            else:
+                schema = arrow_schema_for_columns(column_definitions)
+                metadata = {'table': table_name, 'database': db_name}
+                with ColumnarWriter(file_path, export_format, schema, metadata=metadata, compression=compression) as writer:
+                    rows = cursor.fetchmany(batch_size)
+                    while rows:
+                        writer.write_rows(rows)
+                        row_count += len(rows)
+                        rows = cursor.fetchmany(batch_size)
+            return row_count
+        finally:
+            cursor.close()
+
+    def import_branch(self, bundle_dir, branch_name, jobs=4, batch_size=10000):
+        """
+        Restore a bundle written by export_branch into a new branch.
+
+        Data file checksums are verified first. Tables are then created without their
+        secondary indexes and foreign keys, loaded in parallel (LOAD DATA LOCAL INFILE for
+        uncompressed CSV when the server allows it, batched inserts otherwise), indexed,
+        and finally row counts are checked against the manifest. On any failure the new
+        branch database is dropped.
+
+        Args:
+            bundle_dir (str): Bundle directory containing manifest.json
+            branch_name (str): Name of the branch to create
+            jobs (int): Number of files loaded / tables indexed concurrently
+            batch_size (int): Rows per INSERT batch when LOAD DATA is not used
+
+        Returns:
+            tuple: (bool, str) - (Success status, Message)
+        """
+        manifest_path = f"{bundle_dir}/{MANIFEST_FILE}"
+        if not os.path.exists(manifest_path):
+            return False, f"No {MANIFEST_FILE} found in '{bundle_dir}'."
+        if branch_name in self.config['branches']:
+            return False, f"Branch '{branch_name}' already exists!"
+
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        tables = manifest['tables']
+        workers = min(max(jobs, 1), pooling.CNX_POOL_MAXSIZE)
+
+        # Verify bundle integrity before touching the server
+        files = [file_info for table_info in tables.values() for file_info in table_info['files']]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            checksums = executor.map(lambda file_info: file_sha256(f"{bundle_dir}/{file_info['path']}"), files)
+            for file_info, checksum in zip(files, checksums):
+                if checksum != file_info['sha256']:
+                    return False, f"Checksum mismatch for '{file_info['path']}'. The bundle is corrupt."
+
+        db_name = self._branch_db_name(branch_name)
+        cursor = None
+        database_created = False
+        try:
+            if not self.connect():
+                return False, "Failed to connect to the database."
+
+            cursor = self.connection.cursor()
+            cursor.execute(f"CREATE DATABASE `{db_name}`")
+            database_created = True
+            cursor.execute(f"USE `{db_name}`")
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+
+            # Create tables with secondary indexes and foreign keys deferred
+            deferred_indexes = {}
+            deferred_foreign_keys = {}
+            for table_name, table_info in tables.items():
+                with open(f"{bundle_dir}/{table_info['schema']}", 'r') as f:
+                    create_sql, indexes, foreign_keys = split_deferred_indexes(f.read())
+                cursor.execute(create_sql)
+                deferred_indexes[table_name] = indexes
+                deferred_foreign_keys[table_name] = foreign_keys
+
+            use_load_data = False
+            if manifest['format'] == 'csv' and not manifest.get('compression'):
+                cursor.execute("SELECT @@GLOBAL.local_infile")
+                use_load_data = bool(cursor.fetchone()[0])
+
+            pool = self._create_pool(workers, allow_local_infile=use_load_data)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._import_bundle_file, pool, db_name, table_name, f"{bundle_dir}/{file_info['path']}",
+                        manifest['format'], manifest.get('compression'), use_load_data, batch_size,
+                        table_info.get('binary_columns', [])
+                    ): file_info['path']
+                    for table_name, table_info in tables.items()
+                    for file_info in table_info['files']
+                }
+                for future in as_completed(futures):
+                    row_count, method = future.result()
+                    click.echo(f"Loaded {futures[future]} ({row_count} rows via {method})")
+
+                # Build each table's secondary indexes in a single ALTER, tables in parallel
+                futures = {
+                    executor.submit(self._build_deferred_indexes, pool, db_name, table_name, indexes): table_name
+                    for table_name, indexes in deferred_indexes.items() if indexes
+                }
+                for future in as_completed(futures):
+                    future.result()
+                    click.echo(f"Built indexes for {futures[future]}")
+
+            for table_name, foreign_keys in deferred_foreign_keys.items():
+                if foreign_keys:
+                    cursor.execute(f"ALTER TABLE `{table_name}` " + ", ".join(f"ADD {fk}" for fk in foreign_keys))
+
+            for table_name, table_info in tables.items():
+                cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
+                row_count = cursor.fetchone()[0]
+                if row_count != table_info['rows']:
+                    raise ValueError(
+                        f"Row count mismatch for '{table_name}': expected {table_info['rows']}, loaded {row_count}"
+                    )
+
+            # Restore the migration chain alongside the data
+            if os.path.isdir(f"{bundle_dir}/migrations") and not os.path.exists(f"migrations/{branch_name}"):
+                shutil.copytree(f"{bundle_dir}/migrations", f"migrations/{branch_name}")
+            self.migration_manager.replace_branch(branch_name, [
+                dict(migration, branch=branch_name) for migration in manifest.get('migrations', [])
+            ])
+            self.migration_manager._save_migrations()
+
+            def add_branch(config):
+                config['branches'][branch_name] = {
+                    'created_at': datetime.now().isoformat(),
+                    'last_accessed': datetime.now().isoformat(),
+                    'restored_from': bundle_dir
+                }
+                if manifest.get('branch') in config['branches']:
+                    config['branches'][branch_name]['created_from'] = manifest['branch']
+            self._update_config(add_branch)
+
+            return True, f"Successfully restored bundle '{bundle_dir}' into branch '{branch_name}' ({len(tables)} tables)."
+
+        except Exception as e:
+            if database_created and cursor:
+                try:
+                    cursor.execute(f"DROP DATABASE IF EXISTS `{db_name}`")
+                except Error:
+                    pass
+            return False, f"Error importing branch: {str(e)}"
+        finally:
+            if cursor:
                 cursor.close()
+            if self.connection and self.connection.is_connected():
                 self.connection.close()
 
+    def _import_bundle_file(self, pool, db_name, table_name, file_path, file_format, compression,
+                            use_load_data, batch_size, binary_columns=()):
+        """
+        Load one bundle data file over a pooled connection. Returns (row count, load method).
+
+        binary_columns are the columns a CSV bundle stores hex-encoded (bundles before version 2 have none).
+        """
+        connection = pool.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"USE `{db_name}`")
+            cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+
+            if file_format in COLUMNAR_FORMATS:
+                row_count = 0
+                for columns, rows in iter_columnar_batches(file_path, file_format, batch_size):
+                    if rows:
+                        self._insert_rows(cursor, table_name, columns, rows)
+                        row_count += len(rows)
+                connection.commit()
+                return row_count, 'insert'
+
+            with open_compressed(file_path, 'r', compression) as csvfile:
+                columns = parse_mysql_csv_line(csvfile.readline())
+                binary_positions = [index for index, col in enumerate(columns) if col in binary_columns]
+
+                if use_load_data:
+                    # Hex-encoded fields are read into user variables and UNHEX()ed into their columns
+                    targets = [f"@hex{index}" if index in binary_positions else f"`{col}`"
+                               for index, col in enumerate(columns)]
+                    unhex = ", ".join(f"`{columns[index]}` = UNHEX(@hex{index})" for index in binary_positions)
+                    try:
+                        cursor.execute(
+                            f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table_name}` CHARACTER SET utf8mb4 "
+                            f"{LOAD_DATA_OPTIONS} IGNORE 1 LINES ({', '.join(targets)})"
+                            + (f" SET {unhex}" if unhex else ""),
+                            (os.path.abspath(file_path),)
+                        )
+                        connection.commit()
+                        return cursor.rowcount, 'LOAD DATA'
+                    except Error:
+                        # Client-side local_infile can still be refused; fall back to inserts
+                        connection.rollback()
+
+                row_count = 0
+                rows = []
+                for line in csvfile:
+                    rows.append(decode_binary_values(parse_mysql_csv_line(line), binary_positions))
+                    if len(rows) >= batch_size:
+                        self._insert_rows(cursor, table_name, columns, rows)
+                        row_count += len(rows)
+                        rows = []
+                if rows:
+                    self._insert_rows(cursor, table_name, columns, rows)
+                    row_count += len(rows)
+                connection.commit()
+                return row_count, 'insert'
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _insert_rows(self, cursor, table_name, columns, rows):
+        """Insert a batch of row tuples with a single multi-row INSERT."""
+        columns_str = ", ".join(f"`{col}`" for col in columns)
+        placeholders = ", ".join(['%s'] * len(columns))
+        cursor.executemany(f"INSERT INTO `{table_name}` ({columns_str}) VALUES ({placeholders})", rows)
+
+    def _build_deferred_indexes(self, pool, db_name, table_name, indexes):
+        """Add secondary indexes back to a loaded table."""
+        connection = pool.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"USE `{db_name}`")
+            # InnoDB builds one FULLTEXT index per ALTER; everything else goes in a single pass
+            regular = [index for index in indexes if not index.startswith('FULLTEXT ')]
+            fulltext = [index for index in indexes if index.startswith('FULLTEXT ')]
+            if regular:
+                cursor.execute(f"ALTER TABLE `{table_name}` " + ", ".join(f"ADD {index}" for index in regular))
+            for index in fulltext:
+                cursor.execute(f"ALTER TABLE `{table_name}` ADD {index}")
+        finally:
+            cursor.close()
+            connection.close()
+
 @click.group()
 def cli():
     """mydb-cli: A SQL Database Management tool with Git-like Precision!"""
@@ -1245,6 +3069,7 @@ def cli():
 @cli.command()
 def status():
     """Check the status of the database connection and current branch."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
     connection_status = db_manager.connect()
     
@@ -1254,14 +3079,16 @@ def status():
         db_manager.history_manager.add_entry(
             command='status',
             details=f"Checked status. Connection active. Current branch: {db_manager.config['current_branch']}",
-            status='success'
+            status='success',
+            started_at=started_at
         )
     else:
         click.echo("Failed to connect to the database.")
         db_manager.history_manager.add_entry(
             command='status',
             details="Checked status. Failed to connect to the database.",
-            status='failed'
+            status='failed',
+            started_at=started_at
         )
 
 @cli.command()
@@ -1333,46 +3160,96 @@ def drop_table(name):
     db_manager = DatabaseManager()
     db_manager.drop_table(name)
 
+def _migration_profile_data(db_manager, migration_number, direction, executed_queries):
+    """Structured history data for one migration run, read back by migration-profile."""
+    return {
+        'direction': direction,
+        'migrations': [
+            {'branch': db_manager.config['current_branch'], 'number': migration_number, 'statements': executed_queries}
+        ]
+    }
+
 @cli.command()
-def migrate_up():
+@click.option("--all", "apply_all", is_flag=True, help="Apply every pending migration in one session")
+@click.option("--to", "target", type=int, help="Apply pending migrations up to and including this number")
+def migrate_up(apply_all, target):
     """Apply the next pending migration."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
+    if apply_all or target is not None:
+        branch = db_manager.config['current_branch']
+        pending = len(db_manager.migration_manager.get_unapplied_after(branch, db_manager.get_current_migration(), target))
+        success, results = db_manager.migrate_up_all(target_number=target)
+        if results:
+            click.echo(tabulate(
+                [[f"{r['number']:04d}", r['name'], r['status'], f"{r['seconds']:.2f}s", r['statements'],
+                  (r.get('error') or '')[:50]] for r in results],
+                headers=['Number', 'Name', 'Status', 'Time', 'Statements', 'Error'],
+                tablefmt='grid'
+            ))
+        applied = [r for r in results if r['status'] == 'applied']
+        queries_str = "\n".join(q['statement'] for r in applied for q in r['profile'])
+        db_manager.history_manager.add_entry(
+            command='migrate_up',
+            details=f"Applied {len(applied)} of {pending} pending migrations in branch '{branch}'",
+            status='success' if success else 'failed',
+            error=f"Executed queries:\n{queries_str}" if success else next((r.get('error') for r in results if r['status'] == 'failed'), None),
+            data={
+                'direction': 'up',
+                'migrations': [
+                    {'branch': db_manager.config['current_branch'], 'number': r['number'], 'statements': r['profile']}
+                    for r in applied
+                ]
+            },
+            started_at=started_at
+        )
+        return
+
+    migration_number = db_manager.get_current_migration() + 1
     success, executed_queries = db_manager.migrate_up()
     
     if success:
-        queries_str = "\n".join(executed_queries)
+        queries_str = "\n".join(q['statement'] for q in executed_queries)
         db_manager.history_manager.add_entry(
             command='migrate_up',
             details=f"Applied next pending migration in branch '{db_manager.config['current_branch']}'",
             status='success',
-            error=f"Executed queries:\n{queries_str}"
+            error=f"Executed queries:\n{queries_str}",
+            data=_migration_profile_data(db_manager, migration_number, 'up', executed_queries),
+            started_at=started_at
         )
     else:
         db_manager.history_manager.add_entry(
             command='migrate_up',
             details=f"Failed to apply next pending migration in branch '{db_manager.config['current_branch']}'",
-            status='failed'
+            status='failed',
+            started_at=started_at
         )
 
 @cli.command()
 def migrate_down():
     """Rollback the last applied migration."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
+    migration_number = db_manager.get_current_migration()
     success, executed_queries = db_manager.migrate_down()
     
     if success:
-        queries_str = "\n".join(executed_queries)
+        queries_str = "\n".join(q['statement'] for q in executed_queries)
         db_manager.history_manager.add_entry(
             command='migrate_down',
             details=f"Rolled back last applied migration in branch '{db_manager.config['current_branch']}'",
             status='success',
-            error=f"Executed queries:\n{queries_str}"
+            error=f"Executed queries:\n{queries_str}",
+            data=_migration_profile_data(db_manager, migration_number, 'down', executed_queries),
+            started_at=started_at
         )
     else:
         db_manager.history_manager.add_entry(
             command='migrate_down',
             details=f"Failed to roll back last applied migration in branch '{db_manager.config['current_branch']}'",
-            status='failed'
+            status='failed',
+            started_at=started_at
         )
 
 @cli.command()
@@ -1385,29 +3262,195 @@ def create_migration(name, description):
 
 @cli.command()
 @click.option("--number", type=int, help="Specific migration number to apply")
-def apply_migration(number):
+@click.option("--dry-run", is_flag=True, help="Estimate rows, locks and duration without applying")
+@click.option("--branches", help="Comma-separated branches to apply the current branch's migration to concurrently")
+@click.option("--all-branches", is_flag=True, help="Apply the current branch's migration to every branch concurrently")
+@click.option("--jobs", default=4, type=click.IntRange(min=1), help="Number of branches migrated in parallel")
+def apply_migration(number, dry_run, branches, all_branches, jobs):
     """Apply a specific or next pending migration."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
+    branch_names = None
+    if branches or all_branches:
+        branch_names = list(db_manager.config['branches']) if all_branches else [
+            name.strip() for name in branches.split(',') if name.strip()
+        ]
+
+    if dry_run and branch_names:
+        # Plan the current branch's migration against each branch's database; nothing is executed
+        current = db_manager.config['current_branch']
+        rows = []
+        success = True
+        for branch in branch_names:
+            if branch not in db_manager.config['branches']:
+                rows.append([branch, '-', '-', '-', 'unknown branch'])
+                success = False
+                continue
+            planned, report = db_manager.plan_migration(migration_number=number, target_branch=branch)
+            success = success and planned
+            rows.append([
+                branch, sum(e['rows'] for e in report), format_duration(sum(e['seconds'] for e in report)),
+                sum(1 for e in report if e['flags']), '' if planned else 'planning failed'
+            ])
+        click.echo(tabulate(rows, headers=['Branch', 'Est. Rows', 'Est. Time', 'Flagged', 'Error'], tablefmt='grid'))
+        db_manager.history_manager.add_entry(
+            command='apply_migration',
+            details=f"Dry run of migration {number if number else 'next pending'} of branch '{current}' "
+                    f"on branches: {', '.join(branch_names)}",
+            status='success' if success else 'failed',
+            started_at=started_at
+        )
+        return
+
+    if dry_run:
+        success, report = db_manager.plan_migration(migration_number=number)
+        if report:
+            click.echo(tabulate(
+                [[e['index'], e['statement'], e['kind'], e['rows'], e['lock'], format_duration(e['seconds']),
+                  '; '.join(e['flags'])] for e in report],
+                headers=['#', 'Statement', 'Kind', 'Est. Rows', 'Lock', 'Est. Time', 'Flags'],
+                tablefmt='grid'
+            ))
+            flagged = sum(1 for e in report if e['flags'])
+            click.echo(f"Estimated total: {sum(e['rows'] for e in report)} rows, "
+                       f"{format_duration(sum(e['seconds'] for e in report))}, {flagged} flagged statements")
+        db_manager.history_manager.add_entry(
+            command='apply_migration',
+            details=f"Dry run of migration {number if number else 'next pending'} in branch '{db_manager.config['current_branch']}'",
+            status='success' if success else 'failed',
+            started_at=started_at
+        )
+        return
+
+    if branches or all_branches:
+        success, results = db_manager.apply_migration_to_branches(branch_names, migration_number=number, jobs=jobs)
+        if results:
+            click.echo(tabulate(
+                [[r['branch'], f"{r['number']:04d}" if r['number'] else '-', r['status'], f"{r['seconds']:.2f}s",
+                  r['statements'], (r['error'] or '')[:50]] for r in results],
+                headers=['Branch', 'Migration', 'Status', 'Time', 'Statements', 'Error'],
+                tablefmt='grid'
+            ))
+            click.echo(f"Migrated {sum(1 for r in results if r['status'] == 'applied')} of {len(results)} "
+                       f"branches in {time.monotonic() - started_at:.2f}s")
+        db_manager.history_manager.add_entry(
+            command='apply_migration',
+            details=f"Applied migration {number if number else 'next pending'} to branches: {', '.join(branch_names)}",
+            status='success' if success else 'failed',
+            error='; '.join(f"{r['branch']}: {r['error']}" for r in results if r['error']) or None,
+            data={
+                'direction': 'up',
+                'migrations': [
+                    {'branch': r['branch'], 'number': r['number'], 'statements': r['profile']}
+                    for r in results if r['status'] == 'applied'
+                ]
+            },
+            started_at=started_at
+        )
+        return
+
+    next_pending = db_manager.get_next_pending_migration()
+    migration_number = number or (next_pending['migration_number'] if next_pending else None)
     success, executed_queries = db_manager.apply_migration(migration_number=number)
     
     if success:
-        queries_str = "\n".join(executed_queries)
+        queries_str = "\n".join(q['statement'] for q in executed_queries)
         db_manager.history_manager.add_entry(
             command='apply_migration',
             details=f"Applied migration {number if number else 'next pending'} in branch '{db_manager.config['current_branch']}'",
             status='success',
-            error=f"Executed queries:\n{queries_str}"
+            error=f"Executed queries:\n{queries_str}",
+            data=_migration_profile_data(db_manager, migration_number, 'up', executed_queries),
+            started_at=started_at
         )
     else:
         db_manager.history_manager.add_entry(
             command='apply_migration',
             details=f"Failed to apply migration {number if number else 'next pending'} in branch '{db_manager.config['current_branch']}'",
-            status='failed'
+            status='failed',
+            started_at=started_at
         )
 
+@cli.command()
+@click.option("--number", type=int, required=True, help="Migration number to report on")
+@click.option("--branch", help="Branch of the migration (defaults to the current branch)")
+@click.option("--down", is_flag=True, help="Report on the last rollback instead of the last apply")
+def migration_profile(number, branch, down):
+    """Show where the time went in the last run of a migration."""
+    db_manager = DatabaseManager()
+    branch = branch or db_manager.config['current_branch']
+    profile = db_manager.history_manager.get_migration_profile(branch, number, 'down' if down else 'up')
+    if not profile:
+        click.echo(f"No profiled run of migration {number:04d} found in branch '{branch}'")
+        return
+
+    statements = profile['statements']
+    total_seconds = sum(s['seconds'] for s in statements) or 1e-9
+    ranked = sorted(enumerate(statements, start=1), key=lambda item: item[1]['seconds'], reverse=True)
+    click.echo(f"Migration {number:04d} in branch '{branch}', {profile['command']} at {profile['timestamp']}")
+    click.echo(tabulate(
+        [[index, ' '.join(s['statement'].split())[:60], f"{s['seconds']:.3f}s",
+          f"{s['seconds'] * 100 / total_seconds:.1f}%", s['rows'], s['warnings'],
+          f"{s['lock_wait']:.3f}s" if s.get('lock_wait') is not None else '-']
+         for index, s in ranked],
+        headers=['#', 'Statement', 'Time', 'Share', 'Rows', 'Warnings', 'Lock Wait'],
+        tablefmt='grid'
+    ))
+    click.echo(f"Total: {len(statements)} statements, {sum(s['seconds'] for s in statements):.3f}s")
+
+@cli.command()
+@click.option("--upto", type=int, required=True, help="Last migration number to fold into the baseline")
+@click.confirmation_option(prompt="This replaces the migration files up to that number. Continue?")
+def squash_migrations(upto):
+    """Squash the current branch's migrations into one baseline migration."""
+    started_at = time.monotonic()
+    db_manager = DatabaseManager()
+    success, message = db_manager.squash_migrations(upto)
+    click.echo(message)
+    db_manager.history_manager.add_entry(
+        command='squash_migrations',
+        details=f"Squashed migrations up to {upto:04d} in branch '{db_manager.config['current_branch']}'",
+        status='success' if success else 'failed',
+        error=None if success else message,
+        started_at=started_at
+    )
+
+@cli.command()
+@click.option("--branch", help="Branch to verify (defaults to the current branch)")
+@click.option("--accept", is_flag=True, help="Record the live schema as the expected schema")
+def verify_migrations(branch, accept):
+    """Check applied migration files and the live schema for drift."""
+    started_at = time.monotonic()
+    db_manager = DatabaseManager()
+    branch = branch or db_manager.config['current_branch']
+    success, report = db_manager.verify_migrations(branch, accept=accept)
+
+    problems = [[f"{number:04d}", name, state] for number, name, state in report['files'] if state != 'ok']
+    if problems:
+        click.echo(tabulate(problems, headers=['Number', 'Name', 'File'], tablefmt='grid'))
+    else:
+        click.echo(f"All {len(report['files'])} applied migration files match their checksums")
+
+    schema = report['schema']
+    click.echo(f"Schema: {schema['status']}")
+    for kind in ('added', 'removed', 'changed'):
+        if schema.get(kind):
+            click.echo(f"  {kind.capitalize()} tables: {', '.join(schema[kind])}")
+    if accept:
+        click.echo("Recorded the live schema as the expected schema")
+
+    db_manager.history_manager.add_entry(
+        command='verify_migrations',
+        details=f"Verified migrations in branch '{branch}'",
+        status='success' if success else 'failed',
+        error=None if success else f"{len(problems)} file problems, schema {schema['status']}",
+        started_at=started_at
+    )
+
 @cli.command()
 def migration_status():
     """Show status of all migrations in current branch."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
     success, result, current_migration = db_manager.migration_status()
     
@@ -1427,7 +3470,8 @@ def migration_status():
         db_manager.history_manager.add_entry(
             command='migration_status',
             details=f"Checked migration status for branch '{db_manager.config['current_branch']}'",
-            status='success'
+            status='success',
+            started_at=started_at
         )
     else:
         click.echo(f"Error: {result}")
@@ -1435,7 +3479,8 @@ def migration_status():
             command='migration_status',
             details=f"Failed to check migration status for branch '{db_manager.config['current_branch']}'",
             status='failed',
-            error=result
+            error=result,
+            started_at=started_at
         )
 
 @cli.command()
@@ -1443,6 +3488,7 @@ def migration_status():
 @click.option("--target", prompt="Target branch name", help="The branch to merge into.")
 def merge_branch(source, target):
     """Merge changes from source branch into target branch."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
     success, message = db_manager.merge_branch(source, target)
     
@@ -1450,7 +3496,8 @@ def merge_branch(source, target):
         db_manager.history_manager.add_entry(
             command='merge_branch',
             details=f"Merged branch '{source}' into '{target}'",
-            status='success'
+            status='success',
+            started_at=started_at
         )
         click.echo(message)
     else:
@@ -1458,7 +3505,8 @@ def merge_branch(source, target):
             command='merge_branch',
             details=f"Failed to merge branch '{source}' into '{target}'",
             status='failed',
-            error=message
+            error=message,
+            started_at=started_at
         )
         click.echo(f"Merge failed: {message}")
 
@@ -1489,17 +3537,23 @@ def history(limit):
 @cli.command()
 @click.option("--table", prompt="Table name", help="Name of the table to export")
 @click.option("--file", help="Path to save the exported file (optional)")
-@click.option("--format", type=click.Choice(['csv', 'pdf'], case_sensitive=False), default='csv', help="Export format (csv or pdf)")
-def export_data(table, file, format):
-    """Export data from a table to a CSV or PDF file."""
+@click.option("--format", type=click.Choice(['csv', 'pdf', 'parquet', 'arrow'], case_sensitive=False), default='csv', help="Export format (csv, pdf, parquet or arrow)")
+@click.option("--compress", type=click.Choice(['gzip', 'zstd'], case_sensitive=False), help="Compress the exported file (gzip or zstd)")
+@click.option("--max-rows", type=click.IntRange(min=1), help="Export at most this many rows")
+def export_data(table, file, format, compress, max_rows):
+    """Export data from a table to a CSV, PDF, Parquet or Arrow file."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
-    success, result = db_manager.export_data(table, file, format)
+    success, result = db_manager.export_data(
+        table, file, format, compression=compress.lower() if compress else None, max_rows=max_rows
+    )
     
     if success:
         db_manager.history_manager.add_entry(
             command='export_data',
             details=f"Exported data from table '{table}' to {format.upper()} file '{result}'",
-            status='success'
+            status='success',
+            started_at=started_at
         )
         click.echo(f"Data exported successfully. File saved as: {result}")
     else:
@@ -1507,24 +3561,87 @@ def export_data(table, file, format):
             command='export_data',
             details=f"Failed to export data from table '{table}' to {format.upper()} format",
             status='failed',
-            error=result
+            error=result,
+            started_at=started_at
         )
         click.echo(f"Export failed: {result}")
 
+@cli.command()
+@click.option("--table", prompt="Table name", help="Name of the table to profile")
+@click.option("--columns", help="Comma-separated columns to profile (defaults to all)")
+@click.option("--sample", type=int, help="Profile only the first N rows")
+@click.option("--top", type=int, default=DEFAULT_TOP_K, show_default=True, help="Frequent values shown per column")
+@click.option("--branch", help="Branch to profile (defaults to the current branch)")
+def profile_table(table, columns, sample, top, branch):
+    """Profile null ratios, distinct counts, frequent values and distributions of a table's columns."""
+    started_at = time.monotonic()
+    db_manager = DatabaseManager()
+    selected = [column.strip() for column in columns.split(',') if column.strip()] if columns else None
+    success, result = db_manager.profile_table(table, selected, sample_rows=sample, top_k=top, branch_name=branch)
+
+    if not success:
+        db_manager.history_manager.add_entry(
+            command='profile_table',
+            details=f"Failed to profile table '{table}'",
+            status='failed',
+            error=result,
+            started_at=started_at
+        )
+        click.echo(f"Profiling failed: {result}")
+        return
+
+    def number(value):
+        return '' if value is None else f"{value:.6g}"
+
+    summary = []
+    frequent = []
+    for profile in result['columns']:
+        quantiles = profile.get('quantiles', {})
+        summary.append([
+            profile['column'],
+            f"{profile['null_ratio']:.1%}",
+            f"~{profile['distinct']:,}",
+            number(profile.get('min')),
+            number(quantiles.get(0.05)),
+            number(quantiles.get(0.5)),
+            number(quantiles.get(0.95)),
+            number(profile.get('max')),
+            number(profile.get('mean')),
+        ])
+        for value, count in profile['top']:
+            frequent.append([profile['column'], value if len(value) <= 60 else value[:57] + '...', f"{count:,}"])
+
+    click.echo(f"Profiled {result['rows']:,} rows of '{table}'" + (" (sample)" if sample else ""))
+    click.echo(tabulate(summary, headers=['Column', 'Nulls', 'Distinct', 'Min', 'P5', 'Median', 'P95', 'Max', 'Mean'],
+                        tablefmt='grid'))
+    if frequent:
+        click.echo("\nMost frequent values (counts are lower bounds):")
+        click.echo(tabulate(frequent, headers=['Column', 'Value', 'Count'], tablefmt='grid'))
+
+    db_manager.history_manager.add_entry(
+        command='profile_table',
+        details=f"Profiled {len(result['columns'])} columns over {result['rows']} rows of table '{table}'",
+        status='success',
+        started_at=started_at
+    )
+
 @cli.command()
 @click.option("--table", prompt="Table name", help="Name of the table to import data into")
-@click.option("--file", prompt="File path", type=click.Path(exists=True), help="Path of the CSV file to import")
+@click.option("--file", prompt="File path", type=click.Path(exists=True), help="Path of the CSV, Parquet or Arrow file to import")
 @click.option("--create", is_flag=True, help="Create the table if it doesn't exist")
-def import_data(table, file, create):
-    """Import data from a CSV file into a table."""
+@click.option("--format", type=click.Choice(['csv', 'parquet', 'arrow'], case_sensitive=False), help="Import format (detected from the file extension if omitted)")
+def import_data(table, file, create, format):
+    """Import data from a CSV, Parquet or Arrow file into a table."""
+    started_at = time.monotonic()
     db_manager = DatabaseManager()
-    success, message = db_manager.import_data(table, file, create_if_not_exists=create)
+    success, message = db_manager.import_data(table, file, create_if_not_exists=create, import_format=format)
     
     if success:
         db_manager.history_manager.add_entry(
             command='import_data',
             details=f"Imported data into table '{table}' from file '{file}'" + (" (table created)" if create else ""),
-            status='success'
+            status='success',
+            started_at=started_at
         )
         click.echo(message)
     else:
@@ -1532,10 +3649,72 @@ def import_data(table, file, create):
             command='import_data',
             details=f"Failed to import data into table '{table}' from file '{file}'",
             status='failed',
-            error=message
+            error=message,
+            started_at=started_at
         )
         click.echo(f"Import failed: {message}")
     
+@cli.command()
+@click.option("--output", help="Directory to write the bundle to (optional)")
+@click.option("--jobs", type=click.IntRange(min=1), default=4, show_default=True, help="Number of tables/chunks exported concurrently")
+@click.option("--format", type=click.Choice(['csv', 'parquet', 'arrow'], case_sensitive=False), default='csv', help="Data file format")
+@click.option("--compress", type=click.Choice(['gzip', 'zstd'], case_sensitive=False), help="Compress data files (gzip or zstd)")
+@click.option("--chunk-rows", type=click.IntRange(min=1), default=500000, show_default=True, help="Approximate rows per data file for tables with an integer primary key")
+def export_branch(output, jobs, format, compress, chunk_rows):
+    """Export every table of the current branch into a bundle directory."""
+    started_at = time.monotonic()
+    db_manager = DatabaseManager()
+    success, result = db_manager.export_branch(
+        output, jobs=jobs, export_format=format,
+        compression=compress.lower() if compress else None, chunk_rows=chunk_rows
+    )
+
+    if success:
+        db_manager.history_manager.add_entry(
+            command='export_branch',
+            details=f"Exported branch '{db_manager.config['current_branch']}' to bundle '{result}'",
+            status='success',
+            started_at=started_at
+        )
+        click.echo(f"Branch exported successfully. Bundle saved in: {result}")
+    else:
+        db_manager.history_manager.add_entry(
+            command='export_branch',
+            details=f"Failed to export branch '{db_manager.config['current_branch']}'",
+            status='failed',
+            error=result,
+            started_at=started_at
+        )
+        click.echo(f"Export failed: {result}")
+
+@cli.command()
+@click.option("--bundle", prompt="Bundle directory", type=click.Path(exists=True, file_okay=False), help="Bundle directory created by export-branch")
+@click.option("--branch", prompt="Branch name", help="The name of the new branch to restore into")
+@click.option("--jobs", type=click.IntRange(min=1), default=4, show_default=True, help="Number of files loaded concurrently")
+def import_branch(bundle, branch, jobs):
+    """Restore a branch bundle into a new branch."""
+    started_at = time.monotonic()
+    db_manager = DatabaseManager()
+    success, message = db_manager.import_branch(bundle, branch, jobs=jobs)
+
+    if success:
+        db_manager.history_manager.add_entry(
+            command='import_branch',
+            details=f"Restored bundle '{bundle}' into branch '{branch}'",
+            status='success',
+            started_at=started_at
+        )
+        click.echo(message)
+    else:
+        db_manager.history_manager.add_entry(
+            command='import_branch',
+            details=f"Failed to restore bundle '{bundle}' into branch '{branch}'",
+            status='failed',
+            error=message,
+            started_at=started_at
+        )
+        click.echo(f"Import failed: {message}")
+
 @cli.command()
 @click.option('--before', help='Clear history before this date (YYYY-MM-DD)')
 @click.confirmation_option(prompt='Are you sure you want to clear the history?')
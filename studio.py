@@ -1,15 +1,53 @@
 import streamlit as st
-from main import DatabaseManager
+import mysql.connector
+from main import DatabaseManager, MigrationManager
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import os
 from google.generativeai import GenerativeModel
 import google.generativeai as genai
-import csv
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from typing import List, Dict
+from mysql.connector.errors import PoolError
+from utils.branch_layout import branch_set_digest, subtree, tree_layout
+from utils.jobs import FINISHED_STATES, JobRunner, JobStore, job_duration, job_throughput
+from utils.migration_plan import statement_kind
+from utils.performance import (
+    LATENCY_PERCENTILES, PICOSECONDS_PER_SECOND, SCHEMA_LOAD_QUERY, SCHEMA_SIZE_QUERY, SERVER_STATUS_QUERY,
+    SLOW_QUERIES_QUERY, BorrowCounter, latency_summary, pool_stats, row_growth, schema_query
+)
+from utils.query_runner import DEFAULT_MAX_EXECUTION_MS, DEFAULT_QUERY_PAGE_SIZE, QueryRun
+from utils.table_analysis import COLUMNS_QUERY, TableAnalysis, group_columns
+from utils.table_browser import FILTER_OPERATORS, TablePage
+
+# Connections shared by reruns of every Studio session
+STUDIO_POOL_SIZE = 4
+# Tables analyzed at once by Ask Gemini's auto analysis, each on its own connection
+ANALYZE_POOL_SIZE = 8
+DEFAULT_ANALYZE_SAMPLE_ROWS = 100000
+# Seconds between reruns while a query from the SQL assistant is running
+QUERY_POLL_INTERVAL = 0.5
+READ_ONLY_KINDS = ('SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN')
+# Long operations run in the background on this many worker threads
+JOB_WORKERS = 2
+JOB_POLL_INTERVAL = 1.0
+# Jobs whose completion changes branches or tables
+SCHEMA_CHANGING_JOBS = ('create_branch', 'merge_branch', 'import_data')
+# The upload's name tells import_data its format and compression
+IMPORT_UPLOAD_TYPES = ['csv', 'gz', 'zst', 'parquet', 'pq', 'arrow', 'ipc', 'feather']
+# Above this many branches the graph drops node labels (names still show on hover)
+LABELED_BRANCH_LIMIT = 150
+BROWSE_PAGE_SIZES = [25, 50, 100, 500]
+# Performance page: auto-refresh choices (seconds), how long server figures are reused, size samples kept
+PERFORMANCE_REFRESH_INTERVALS = [0, 5, 10, 30, 60]
+PERFORMANCE_CACHE_TTL = 5
+PERFORMANCE_SAMPLES = 720
+LATENCY_WINDOWS = {'Last 24 hours': 1, 'Last 7 days': 7, 'Last 30 days': 30, 'All time': None}
 
 def init_session_state():
     if 'db_manager' not in st.session_state:
@@ -22,19 +60,218 @@ def init_session_state():
     if 'branch_switched' not in st.session_state:
         st.session_state.branch_switched = False
 
+@st.cache_resource(show_spinner=False)
+def get_connection_pool(_db_manager, connection_settings, pool_size=STUDIO_POOL_SIZE):
+    """Create the connection pool once per set of connection settings and size."""
+    return _db_manager._create_pool(pool_size, autocommit=True)
+
+@st.cache_resource(show_spinner=False)
+def get_borrow_counter(connection_settings):
+    """Count the connections borrowed from the Studio pool for these settings, across sessions."""
+    return BorrowCounter()
+
+def _connection_settings(db_manager):
+    return tuple(sorted(db_manager.config['connection'].items()))
+
+def _borrow_connection(pool, timeout=30):
+    """Get a connection from a pool, waiting while other sessions hold all of them."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return pool.get_connection()
+        except PoolError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+@contextmanager
+def studio_connection(db_name=None):
+    """Borrow a pooled connection using the current branch database (or db_name)."""
+    db_manager = st.session_state.db_manager
+    settings = _connection_settings(db_manager)
+    pool = get_connection_pool(db_manager, settings)
+    # The pool is shared by every Studio session, so wait for a free connection
+    connection = _borrow_connection(pool)
+    try:
+        with get_borrow_counter(settings).borrowed():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"USE `{db_name or db_manager._branch_db_name()}`")
+            finally:
+                cursor.close()
+            yield connection
+    finally:
+        # Returns the connection to the pool
+        connection.close()
+
+def check_connection() -> bool:
+    try:
+        with studio_connection() as connection:
+            return connection.is_connected()
+    except Exception:
+        return False
+
+@st.cache_data(show_spinner=False)
+def list_tables(db_name: str) -> List[str]:
+    """Table names in a branch database."""
+    with studio_connection(db_name) as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SHOW TABLES")
+            return [DatabaseManager._decode(row[0]) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+@st.cache_data(show_spinner=False)
+def describe_table(db_name: str, table: str) -> List[Dict]:
+    """DESCRIBE output for a table as a list of rows."""
+    with studio_connection(db_name) as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"DESCRIBE `{table}`")
+            return [
+                {
+                    'Field': DatabaseManager._decode(col[0]),
+                    'Type': DatabaseManager._decode(col[1]),
+                    'Null': col[2],
+                    'Key': col[3],
+                    'Default': DatabaseManager._decode(col[4]),
+                    'Extra': col[5]
+                }
+                for col in cursor.fetchall()
+            ]
+        finally:
+            cursor.close()
+
+@st.cache_data(show_spinner=False)
+def load_table_schema(db_name: str) -> Dict[str, List[str]]:
+    """Columns of every table in a branch database, read in one query."""
+    with studio_connection(db_name) as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = %s
+                ORDER BY TABLE_NAME, ORDINAL_POSITION
+            """, (db_name,))
+            schemas = {}
+            for table, column, column_type in cursor.fetchall():
+                schemas.setdefault(DatabaseManager._decode(table), []).append(
+                    f"{DatabaseManager._decode(column)} ({DatabaseManager._decode(column_type)})"
+                )
+            return schemas
+        finally:
+            cursor.close()
+
+@st.cache_data(show_spinner=False)
+def get_primary_key(db_name: str, table: str) -> List[str]:
+    """Primary key columns of a table in key order."""
+    with studio_connection(db_name) as connection:
+        cursor = connection.cursor()
+        try:
+            return st.session_state.db_manager._get_primary_key(cursor, db_name, table)
+        finally:
+            cursor.close()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def estimate_row_count(db_name: str, table: str, filters: tuple) -> int:
+    """Estimated rows matching the filters, from table statistics or EXPLAIN rather than COUNT(*)."""
+    with studio_connection(db_name) as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            if not filters:
+                cursor.execute("""
+                    SELECT TABLE_ROWS AS table_rows FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                """, (db_name, table))
+                row = cursor.fetchone()
+                return int(row['table_rows'] or 0) if row else 0
+
+            sql, params = TablePage(table, [], [], filters=filters).count_query()
+            cursor.execute(f"EXPLAIN {sql}", params)
+            return int(sum(
+                int(step.get('rows') or 0) * float(step.get('filtered') or 100) / 100
+                for step in cursor.fetchall()
+            ))
+        finally:
+            cursor.close()
+
+def invalidate_schema_cache():
+    """Forget cached table metadata after an action that changes tables or branches."""
+    list_tables.clear()
+    describe_table.clear()
+    load_table_schema.clear()
+    get_primary_key.clear()
+    estimate_row_count.clear()
+    analyze_tables.clear()
+
+@st.cache_resource(show_spinner=False)
+def get_job_runner():
+    """The background job runner shared by every Studio session in this process."""
+    return JobRunner(JobStore(), workers=JOB_WORKERS)
+
+def sync_finished_jobs():
+    """Pick up branch and table changes made by jobs that finished since the last rerun."""
+    finished = {job['id']: job for job in get_job_runner().jobs() if job['status'] in FINISHED_STATES}
+    if 'seen_jobs' not in st.session_state:
+        st.session_state.seen_jobs = set(finished)
+        return
+    new_jobs = [job for job_id, job in finished.items() if job_id not in st.session_state.seen_jobs]
+    if not new_jobs:
+        return
+    st.session_state.seen_jobs.update(job['id'] for job in new_jobs)
+    if any(job['kind'] in SCHEMA_CHANGING_JOBS for job in new_jobs):
+        db_manager = st.session_state.db_manager
+        db_manager.config = db_manager._load_config()
+        db_manager.migration_manager = MigrationManager()
+        invalidate_schema_cache()
+
+def _import_upload(uploaded_file, table_name, create_if_not_exists, progress=None):
+    """Import job reading a Studio upload straight from its in-memory buffer."""
+    uploaded_file.seek(0)
+    return DatabaseManager().import_data(table_name, uploaded_file, create_if_not_exists, progress=progress)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def branch_tree(digest: str, focus: str, _branches: Dict) -> Dict:
+    """
+    Plot coordinates of the branch tree, computed once per branch set (digest) and focus.
+
+    Depth runs left to right and rows top to bottom.
+    """
+    layout = tree_layout(subtree(_branches, focus) if focus else _branches)
+    positions = layout['positions']
+    edge_x, edge_y = [], []
+    for parent, child in layout['edges']:
+        (x0, y0), (x1, y1) = positions[parent], positions[child]
+        edge_x.extend([x0, x1, None])
+        edge_y.extend([-y0, -y1, None])
+    names = list(positions)
+    return {
+        'edge_x': edge_x,
+        'edge_y': edge_y,
+        'node_x': [positions[name][0] for name in names],
+        'node_y': [-positions[name][1] for name in names],
+        'names': names,
+        'rows': layout['rows'],
+    }
+
 def render_sidebar():
     st.sidebar.title("MyDB Studio")
-    pages = ['Overview', 'Branches', 'Tables', 'Migrations', 'History', 'Ask Gemini']
+    pages = ['Overview', 'Branches', 'Tables', 'Browse Data', 'Migrations', 'Jobs', 'History', 'Performance', 'Ask Gemini']
     st.session_state.current_page = st.sidebar.radio("Navigation", pages)
     
     # Always show current branch status
     st.sidebar.markdown("---")
     st.sidebar.markdown(f"**Current Branch:** {st.session_state.db_manager.config['current_branch']}")
+    active_jobs = get_job_runner().active()
+    if active_jobs:
+        st.sidebar.markdown(f"**Background Jobs:** {len(active_jobs)} running")
 def render_overview_page():
     st.title("Database Overview")
     
     # Database Connection Status
-    if st.session_state.db_manager.connect():
+    if check_connection():
         st.success("✅ Database Connection Active")
     else:
         st.error("❌ Database Connection Failed")
@@ -67,11 +304,6 @@ def render_overview_page():
 
 def render_branches_page():
     st.title("Branch Management")
-    
-    # Ensure database connection
-    if not st.session_state.db_manager.connect():
-        st.error("❌ Database Connection Failed")
-        return
 
     col1, col2 = st.columns(2)
     
@@ -80,12 +312,11 @@ def render_branches_page():
         new_branch_name = st.text_input("Branch Name")
         if st.button("Create Branch"):
             if new_branch_name:
-                success = st.session_state.db_manager.create_branch(new_branch_name)
-                if success:
-                    st.success(f"Created branch: {new_branch_name}")
-                    st.rerun()
-                else:
-                    st.error("Failed to create branch")
+                get_job_runner().submit(
+                    'create_branch', f"Create branch '{new_branch_name}'",
+                    DatabaseManager().create_branch, new_branch_name
+                )
+                st.success(f"Creating branch {new_branch_name} in the background; follow it on the Jobs page")
     
     with col2:
         st.subheader("Switch Branch")
@@ -94,82 +325,80 @@ def render_branches_page():
         if st.button("Switch"):
             success = st.session_state.db_manager.switch_branch(selected_branch)
             if success:
+                invalidate_schema_cache()
                 st.success(f"Switched to branch: {selected_branch}")
                 st.rerun()
             else:
                 st.error("Failed to switch branch")
 
     st.markdown("---")
+
+    st.subheader("Merge Branches")
+    branch_names = list(st.session_state.db_manager.config['branches'].keys())
+    col3, col4 = st.columns(2)
+    with col3:
+        merge_source = st.selectbox("Merge From", branch_names, key="merge_source")
+    with col4:
+        merge_target = st.selectbox("Merge Into", branch_names, key="merge_target")
+    if st.button("Merge"):
+        if merge_source == merge_target:
+            st.error("Cannot merge a branch into itself!")
+        else:
+            get_job_runner().submit(
+                'merge_branch', f"Merge '{merge_source}' into '{merge_target}'",
+                DatabaseManager().merge_branch, merge_source, merge_target
+            )
+            st.success("Merge started in the background; follow it on the Jobs page")
+
+    st.markdown("---")
     
     # Branch visualization
     st.subheader("Branch Structure")
     branches = st.session_state.db_manager.config['branches']
     
-    if len(branches) > 0:
-        branch_links = []
-        for branch_name, branch_info in branches.items():
-            parent = branch_info.get('created_from', None)
-            if parent:
-                branch_links.append((parent, branch_name))
-        
-        if branch_links:
-            import networkx as nx
-            G = nx.DiGraph()
-            G.add_edges_from(branch_links)
-            pos = nx.spring_layout(G)
-            
-            edge_x = []
-            edge_y = []
-            for edge in G.edges():
-                x0, y0 = pos[edge[0]]
-                x1, y1 = pos[edge[1]]
-                edge_x.extend([x0, x1, None])
-                edge_y.extend([y0, y1, None])
-                
-            edge_trace = go.Scatter(
-                x=edge_x, y=edge_y,
-                line=dict(width=0.5, color='#888'),
-                hoverinfo='none',
-                mode='lines')
-                
-            node_x = []
-            node_y = []
-            node_text = []
-            for node in G.nodes():
-                x, y = pos[node]
-                node_x.append(x)
-                node_y.append(y)
-                node_text.append(node)
-                
-            node_trace = go.Scatter(
-                x=node_x, y=node_y,
-                mode='markers+text',
-                hoverinfo='text',
-                text=node_text,
-                textposition="top center",
-                marker=dict(
-                    size=20,
-                    color='#1f77b4',
-                    line_width=2))
-                    
-            fig = go.Figure(data=[edge_trace, node_trace],
-                           layout=go.Layout(
-                               showlegend=False,
-                               hovermode='closest',
-                               margin=dict(b=0, l=0, r=0, t=0),
-                               xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                               yaxis=dict(showgrid=False, zeroline=False, showticklabels=False))
-                           )
-                           
-            st.plotly_chart(fig)
+    if len(branches) > 1:
+        focus = st.selectbox(
+            "Show Branches Descending From", ["(all branches)"] + sorted(branches), key="branch_tree_focus"
+        )
+        focus = None if focus == "(all branches)" else focus
+        tree = branch_tree(branch_set_digest(branches), focus, branches)
+        current = st.session_state.db_manager.config['current_branch']
+        labeled = len(tree['names']) <= LABELED_BRANCH_LIMIT
+
+        edge_trace = go.Scattergl(
+            x=tree['edge_x'], y=tree['edge_y'],
+            line=dict(width=0.5, color='#888'),
+            hoverinfo='none',
+            mode='lines')
+
+        node_trace = go.Scattergl(
+            x=tree['node_x'], y=tree['node_y'],
+            mode='markers+text' if labeled else 'markers',
+            hoverinfo='text',
+            text=tree['names'],
+            textposition="top center",
+            marker=dict(
+                size=20 if labeled else 8,
+                color=['#d62728' if name == current else '#1f77b4' for name in tree['names']],
+                line_width=2 if labeled else 0))
+
+        fig = go.Figure(data=[edge_trace, node_trace],
+                       layout=go.Layout(
+                           showlegend=False,
+                           hovermode='closest',
+                           height=min(max(400, tree['rows'] * 30), 4000),
+                           margin=dict(b=0, l=0, r=0, t=0),
+                           xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                           yaxis=dict(showgrid=False, zeroline=False, showticklabels=False))
+                       )
+
+        st.plotly_chart(fig, use_container_width=True)
 
 def render_tables_page():
     st.title("Table Management")
-    
-    # Ensure database connection
-    if not st.session_state.db_manager.connect():
-        st.error("❌ Database Connection Failed")
-        return
+
+    db_name = st.session_state.db_manager._branch_db_name()
+    tables = []
 
     col1, col2 = st.columns(2)
     
@@ -187,6 +416,7 @@ def render_tables_page():
                 columns = [col.strip() for col in columns_text.split('\n') if col.strip()]
                 success = st.session_state.db_manager.create_table(table_name, columns)
                 if success:
+                    invalidate_schema_cache()
                     st.success(f"Created table: {table_name}")
                     st.rerun()
                 else:
@@ -195,45 +425,13 @@ def render_tables_page():
     with col2:
         st.subheader("Describe Table")
         try:
-            if not st.session_state.db_manager.connect():
-                st.error("Failed to connect to database")
-                return
-
-            cursor = st.session_state.db_manager.connection.cursor()
-            current_branch = st.session_state.db_manager.config['current_branch']
-            db_name = st.session_state.db_manager.config['connection']['database']
-            if current_branch != 'main':
-                db_name = f"{db_name}_{current_branch}"
-            
-            cursor.execute(f"USE `{db_name}`")
-            cursor.execute("SHOW TABLES")
-            tables_raw = cursor.fetchall()
-            
-            # Process table names to handle bytearray
-            tables = []
-            for table_row in tables_raw:
-                table_name = table_row[0]
-                if isinstance(table_name, (bytes, bytearray)):
-                    table_name = table_name.decode('utf-8')
-                tables.append(table_name)
+            tables = list_tables(db_name)
             
             if tables:
                 selected_table = st.selectbox("Select Table", tables)
                 if st.button("Describe"):
-                    cursor.execute(f"DESCRIBE `{selected_table}`")
-                    columns = cursor.fetchall()
-                    
-                    if columns:
-                        column_info = []
-                        for col in columns:
-                            column_info.append({
-                                'Field': col[0],
-                                'Type': col[1],
-                                'Null': col[2],
-                                'Key': col[3],
-                                'Default': col[4],
-                                'Extra': col[5]
-                            })
+                    column_info = describe_table(db_name, selected_table)
+                    if column_info:
                         st.write(pd.DataFrame(column_info))
                     else:
                         st.error("Failed to describe table")
@@ -241,9 +439,6 @@ def render_tables_page():
                 st.info("No tables found in current branch")
         except Exception as e:
             st.error(f"Error accessing tables: {str(e)}")
-        finally:
-            if 'cursor' in locals() and cursor:
-                cursor.close()
 
     st.markdown("---")
     
@@ -258,81 +453,132 @@ def render_tables_page():
             export_file_name = st.text_input("Export File Name (optional)", key="export_file_name")
             
             if st.button("Export Data"):
-                try:
-                    if not st.session_state.db_manager.connect():
-                        st.error("Failed to connect to database")
-                        return
-
-                    cursor = st.session_state.db_manager.connection.cursor(dictionary=True)
-                    try:
-                        cursor.execute(f"USE `{db_name}`")
-                        # Ensure table name is properly decoded and quoted
-                        cursor.execute(f"SELECT * FROM `{export_table}`")
-                        rows = cursor.fetchall()
-                        
-                        if not rows:
-                            st.warning(f"No data found in table '{export_table}'")
-                            return
-                        
-                        # Generate file path if not provided
-                        if not export_file_name:
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            os.makedirs("exports", exist_ok=True)
-                            export_file_name = f"exports/{db_name}_{export_table}_{timestamp}.csv"
-                        
-                        # Write to CSV
-                        with open(export_file_name, 'w', newline='') as csvfile:
-                            writer = csv.DictWriter(csvfile, fieldnames=rows[0].keys())
-                            writer.writeheader()
-                            writer.writerows(rows)
-                        
-                        st.success(f"Data exported successfully")
-                        with open(export_file_name, "rb") as file:
-                            st.download_button(
-                                label="Download Exported Data",
-                                data=file.read(),
-                                file_name=os.path.basename(export_file_name),
-                                mime="text/csv"
-                            )
-                    finally:
-                        cursor.close()
-                except Exception as e:
-                    st.error(f"Error during export: {str(e)}")
+                get_job_runner().submit(
+                    'export_data', f"Export '{export_table}' from {db_name}",
+                    DatabaseManager().export_data, export_table, export_file_name or None
+                )
+                st.success("Export started in the background; download it from the Jobs page")
         else:
             st.info("No tables available for export")
 
     with col4:
         st.write("Import Table Data")
         import_table = st.text_input("Table Name to Import Into (create if not exists)")
-        uploaded_file = st.file_uploader("Choose a CSV file to import", type="csv")
+        uploaded_file = st.file_uploader("Choose a file to import", type=IMPORT_UPLOAD_TYPES)
         create_if_not_exists = st.checkbox("Create table if it doesn't exist")
         
         if uploaded_file is not None and st.button("Import Data"):
             try:
-                # Save the uploaded file temporarily
-                with open("temp_import.csv", "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
-                success, message = st.session_state.db_manager.import_data(import_table, "temp_import.csv", create_if_not_exists)
-                if success:
-                    st.success(message)
-                else:
-                    st.error(f"Failed to import data: {message}")
-                
-                # Clean up the temporary file
-                os.remove("temp_import.csv")
+                # The job keeps its own reference to the upload, so it outlives this rerun
+                get_job_runner().submit(
+                    'import_data', f"Import '{uploaded_file.name}' into '{import_table}'",
+                    _import_upload, uploaded_file, import_table, create_if_not_exists
+                )
+                st.success("Import started in the background; follow it on the Jobs page")
             except Exception as e:
                 st.error(f"Error during import: {str(e)}")
-                if os.path.exists("temp_import.csv"):
-                    os.remove("temp_import.csv")
+
+def render_browse_page():
+    st.title("Browse Data")
+
+    db_name = st.session_state.db_manager._branch_db_name()
+    try:
+        tables = list_tables(db_name)
+    except Exception as e:
+        st.error(f"Error accessing tables: {str(e)}")
+        return
+    if not tables:
+        st.info("No tables found in current branch")
+        return
+
+    table = st.selectbox("Table", tables, key="browse_table")
+    try:
+        columns = [col['Field'] for col in describe_table(db_name, table)]
+        key_columns = get_primary_key(db_name, table)
+    except Exception as e:
+        st.error(f"Error describing table {table}: {str(e)}")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        selected_columns = st.multiselect("Columns", columns, default=columns, key=f"browse_columns_{table}")
+    with col2:
+        sort_column = st.selectbox("Sort By", ["(primary key)"] + columns, key=f"browse_sort_{table}")
+        descending = st.checkbox("Descending", key=f"browse_desc_{table}")
+    with col3:
+        page_size = st.selectbox("Rows per Page", BROWSE_PAGE_SIZES, index=1, key="browse_page_size")
+
+    col4, col5, col6 = st.columns(3)
+    with col4:
+        filter_column = st.selectbox("Filter Column", ["(none)"] + columns, key=f"browse_filter_column_{table}")
+    with col5:
+        filter_operator = st.selectbox("Operator", FILTER_OPERATORS, key="browse_filter_operator")
+    with col6:
+        filter_value = st.text_input("Value", key="browse_filter_value",
+                                     disabled=filter_operator in ('IS NULL', 'IS NOT NULL'))
+
+    filters = []
+    if filter_column != "(none)" and (filter_value or filter_operator in ('IS NULL', 'IS NOT NULL')):
+        filters.append((filter_column, filter_operator, filter_value))
+
+    selected_columns = selected_columns or columns
+    page = TablePage(
+        table, selected_columns, key_columns,
+        sort_column=None if sort_column == "(primary key)" else sort_column,
+        descending=descending,
+        filters=filters
+    )
+
+    # Start of each page visited so far: ordering values of the previous page's last row,
+    # or row offsets for tables without a primary key. Changing the view starts over.
+    view = (db_name, table, tuple(page.columns), sort_column, descending, tuple(filters), page_size)
+    if st.session_state.get('browse_view') != view:
+        st.session_state.browse_view = view
+        st.session_state.browse_pages = [None if page.keyset else 0]
+    pages = st.session_state.browse_pages
+    start = pages[-1]
+
+    if page.keyset:
+        sql, params = page.query(page_size, after=start)
+    else:
+        st.warning("This table has no primary key, so pages are read with OFFSET and get slower further in")
+        sql, params = page.query(page_size, offset=start)
+
+    try:
+        with studio_connection(db_name) as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        estimate = estimate_row_count(db_name, table, tuple(filters))
+    except Exception as e:
+        st.error(f"Error reading {table}: {str(e)}")
+        return
+
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    st.caption(f"Page {len(pages)} · about {estimate:,} matching rows")
+    st.dataframe(pd.DataFrame(rows, columns=page.columns)[selected_columns], use_container_width=True)
+
+    nav1, nav2, nav3 = st.columns(3)
+    with nav1:
+        if st.button("⏮ First", disabled=len(pages) == 1):
+            del pages[1:]
+            st.rerun()
+    with nav2:
+        if st.button("◀ Previous", disabled=len(pages) == 1):
+            pages.pop()
+            st.rerun()
+    with nav3:
+        if st.button("Next ▶", disabled=not has_next):
+            pages.append(page.after(rows[-1]) if page.keyset else start + page_size)
+            st.rerun()
 
 def render_migrations_page():
     st.title("Migration Management")
-    
-    # Ensure database connection
-    if not st.session_state.db_manager.connect():
-        st.error("❌ Database Connection Failed")
-        return
 
     col1, col2 = st.columns(2)
     
@@ -386,6 +632,7 @@ def render_migrations_page():
                 if st.button("Apply Next Migration ⬆️"):
                     success = st.session_state.db_manager.apply_migration()
                     if success:
+                        invalidate_schema_cache()
                         st.success("Migration applied successfully")
                         st.rerun()
                     else:
@@ -395,6 +642,7 @@ def render_migrations_page():
                 if st.button("Rollback Migration ⬇️"):
                     success = st.session_state.db_manager.rollback_migration()
                     if success:
+                        invalidate_schema_cache()
                         st.success("Migration rolled back successfully")
                         st.rerun()
                     else:
@@ -429,134 +677,135 @@ def setup_genai(api_key: str) -> None:
     """Initialize the Gemini API with the provided key."""
     genai.configure(api_key=api_key)
 
-def debug_print(message: str):
-    """Helper function to print debug messages to Streamlit."""
-    st.sidebar.markdown(f"**Debug:** {message}")
-
 def get_table_schema() -> Dict[str, List[str]]:
     """Get schema information for all tables in current database."""
-    if not st.session_state.db_manager.connect():
-        return {}
-    
-    connection = st.session_state.db_manager.connection
-    cursor = connection.cursor()
-    
-    # Get current database name
-    current_branch = st.session_state.db_manager.config['current_branch']
-    db_name = st.session_state.db_manager.config['connection']['database']
-    if current_branch != 'main':
-        db_name = f"{db_name}_{current_branch}"
-    
-    schemas = {}
     try:
-        # Switch to the correct database
-        cursor.execute(f"USE `{db_name}`")
-        
-        # Get list of tables
-        cursor.execute("SHOW TABLES")
-        tables_raw = cursor.fetchall()
-        
-        # Debug table names
-        debug_print(f"Raw tables: {tables_raw}")
-        
-        # Extract table names
-        tables = []
-        for table_row in tables_raw:
-            table_name = table_row[0]
-            if isinstance(table_name, bytes):
-                table_name = table_name.decode('utf-8')
-            elif isinstance(table_name, bytearray):
-                table_name = table_name.decode('utf-8')
-            tables.append(table_name)
-        
-        # Debug processed table names
-        debug_print(f"Processed tables: {tables}")
-        
-        for table in tables:
-            try:
-                cursor.execute(f"DESCRIBE `{table}`")
-                columns = cursor.fetchall()
-                schemas[table] = [f"{col[0]} ({col[1]})" for col in columns]
-            except Exception as e:
-                debug_print(f"Error describing table {table}: {str(e)}")
-        
+        return load_table_schema(st.session_state.db_manager._branch_db_name())
     except Exception as e:
         st.error(f"Error fetching schema: {str(e)}")
         return {}
+
+def _analyze_table(pool, db_name, analysis, sample_rows):
+    """Run one table's single-scan analysis on a pooled connection (called from worker threads)."""
+    connection = _borrow_connection(pool)
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"USE `{db_name}`")
+            cursor.execute(analysis.query(sample_rows))
+            return analysis.parse(cursor.fetchone())
+        finally:
+            cursor.close()
     finally:
-        cursor.close()
-    
-    return schemas
+        connection.close()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def analyze_tables(db_name: str, sample_rows: int = None) -> Dict[str, Dict]:
+    """Analyze every table of a branch database, one scan per table, several tables at once."""
+    db_manager = st.session_state.db_manager
+    with studio_connection(db_name) as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(COLUMNS_QUERY, (db_name,))
+            columns = group_columns(
+                tuple(DatabaseManager._decode(value) for value in row) for row in cursor.fetchall()
+            )
+        finally:
+            cursor.close()
 
-def auto_analyze_tables() -> None:
+    pool = get_connection_pool(db_manager, _connection_settings(db_manager), ANALYZE_POOL_SIZE)
+    results = {}
+    with ThreadPoolExecutor(max_workers=ANALYZE_POOL_SIZE) as executor:
+        futures = {
+            executor.submit(_analyze_table, pool, db_name, TableAnalysis(table, table_columns), sample_rows): table
+            for table, table_columns in columns.items()
+        }
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = {'error': str(e)}
+    return dict(sorted(results.items()))
+
+def auto_analyze_tables(sample_rows: int = None) -> None:
     """Automated analysis of database tables."""
-    schemas = get_table_schema()
-    if not schemas:
+    db_name = st.session_state.db_manager._branch_db_name()
+    started = time.monotonic()
+    try:
+        results = analyze_tables(db_name, sample_rows)
+    except Exception as e:
+        st.error(f"Error analyzing tables: {str(e)}")
+        return
+    if not results:
         st.error("No tables found or couldn't access database")
         return
     
     st.write("📊 **Automated Table Analysis**")
+    st.caption(f"{len(results)} tables analyzed in {time.monotonic() - started:.2f}s"
+               + (f", sampling the first {sample_rows:,} rows of each" if sample_rows else ""))
     
-    for table, columns in schemas.items():
+    for table, analysis in results.items():
         with st.expander(f"Analysis for {table}"):
-            cursor = st.session_state.db_manager.connection.cursor()
+            if 'error' in analysis:
+                st.error(f"Error analyzing table {table}: {analysis['error']}")
+                continue
             
-            try:
-                # Get row count
-                cursor.execute(f"SELECT COUNT(*) FROM `{table}`")
-                row_count = cursor.fetchone()[0]
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.metric("Total Rows", row_count)
-                    st.write("**Columns:**")
-                    for col in columns:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.metric("Sampled Rows" if sample_rows else "Total Rows", analysis['rows'])
+                st.write("**Columns:**")
+                for col in analysis['columns']:
+                    if col in analysis['non_null'] and analysis['rows']:
+                        st.write(f"- {col} ({analysis['non_null'][col] / analysis['rows']:.0%} filled)")
+                    else:
                         st.write(f"- {col}")
-                
-                with col2:
-                    # Try to get statistics for numeric columns
-                    try:
-                        cursor.execute(f"""
-                            SELECT 
-                                COLUMN_NAME, 
-                                DATA_TYPE 
-                            FROM INFORMATION_SCHEMA.COLUMNS 
-                            WHERE TABLE_SCHEMA = %s 
-                            AND TABLE_NAME = %s 
-                            AND DATA_TYPE IN ('int', 'decimal', 'float', 'double')
-                        """, (st.session_state.db_manager.config['connection']['database'], table))
-                        
-                        numeric_cols = cursor.fetchall()
-                        
-                        if numeric_cols:
-                            st.write("**Numeric Column Statistics:**")
-                            for col in numeric_cols:
-                                col_name = col[0]
-                                try:
-                                    cursor.execute(f"""
-                                        SELECT 
-                                            MIN(`{col_name}`) as min_val,
-                                            MAX(`{col_name}`) as max_val,
-                                            AVG(`{col_name}`) as avg_val
-                                        FROM `{table}`
-                                    """)
-                                    stats = cursor.fetchone()
-                                    if stats:
-                                        st.write(f"*{col_name}*")
-                                        st.write(f"- Min: {stats[0]}")
-                                        st.write(f"- Max: {stats[1]}")
-                                        st.write(f"- Avg: {round(float(stats[2]), 2) if stats[2] is not None else 'N/A'}")
-                                except Exception as e:
-                                    st.warning(f"Could not calculate statistics for {col_name}: {str(e)}")
-                                    
-                    except Exception as e:
-                        st.warning(f"Could not fetch numeric columns: {str(e)}")
-                
-            except Exception as e:
-                st.error(f"Error analyzing table {table}: {str(e)}")
-            finally:
-                cursor.close()
+            
+            with col2:
+                if analysis['numeric']:
+                    st.write("**Numeric Column Statistics:**")
+                    for col_name, stats in analysis['numeric'].items():
+                        st.write(f"*{col_name}*")
+                        st.write(f"- Min: {stats['min']}")
+                        st.write(f"- Max: {stats['max']}")
+                        st.write(f"- Avg: {round(stats['avg'], 2) if stats['avg'] is not None else 'N/A'}")
+
+def render_column_profile(profile: Dict) -> None:
+    """Show the result of DatabaseManager.profile_table."""
+    st.caption(f"{profile['rows']:,} rows profiled in one pass")
+    summary = []
+    for column in profile['columns']:
+        quantiles = column.get('quantiles', {})
+        summary.append({
+            'Column': column['column'],
+            'Null %': round(column['null_ratio'] * 100, 2),
+            'Distinct (approx.)': column['distinct'],
+            'Min': column.get('min'),
+            'Median': quantiles.get(0.5),
+            'Max': column.get('max'),
+            'Mean': column.get('mean'),
+        })
+    st.dataframe(pd.DataFrame(summary), use_container_width=True)
+
+    for column in profile['columns']:
+        with st.expander(f"{column['column']} details"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Most frequent values**")
+                if column['top']:
+                    st.table(pd.DataFrame(column['top'], columns=['Value', 'Count (at least)']))
+                else:
+                    st.write("No value stands out")
+            with col2:
+                if 'histogram' in column:
+                    edges = column['histogram']['edges']
+                    fig = px.bar(
+                        x=[f"{low:.4g} – {high:.4g}" for low, high in zip(edges, edges[1:])],
+                        y=column['histogram']['counts'],
+                        labels={'x': column['column'], 'y': 'Rows (estimated)'}
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                    st.write({f"p{int(q * 100)}": value for q, value in column['quantiles'].items()})
 
 def sql_chat_assistant(user_input: str, schema_context: str) -> str:
     """Generate SQL queries based on user input using Gemini."""
@@ -596,9 +845,31 @@ def render_ask_gemini_page():
     
     with tab1:
         st.header("Automated Database Analysis")
+        sample = st.checkbox("Sample large tables", value=False)
+        sample_rows = st.number_input("Rows to sample per table", min_value=1000,
+                                      value=DEFAULT_ANALYZE_SAMPLE_ROWS, step=10000, disabled=not sample)
         if st.button("Run Analysis"):
             with st.spinner("Analyzing database..."):
-                auto_analyze_tables()
+                auto_analyze_tables(int(sample_rows) if sample else None)
+
+        st.markdown("---")
+        st.subheader("Column Profile")
+        try:
+            tables = list_tables(st.session_state.db_manager._branch_db_name())
+        except Exception as e:
+            st.error(f"Error accessing tables: {str(e)}")
+            tables = []
+        if tables:
+            profile_table = st.selectbox("Table to Profile", tables, key="profile_table")
+            if st.button("Profile Table"):
+                with st.spinner(f"Profiling {profile_table}..."):
+                    success, result = st.session_state.db_manager.profile_table(
+                        profile_table, sample_rows=int(sample_rows) if sample else None
+                    )
+                if success:
+                    render_column_profile(result)
+                else:
+                    st.error(result)
     
     with tab2:
         st.header("SQL Query Assistant")
@@ -635,44 +906,397 @@ def render_ask_gemini_page():
                     with st.spinner("Generating SQL query..."):
                         response = sql_chat_assistant(prompt, schema_context)
                     st.code(response, language="sql")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("Execute Query"):
-                            cursor = None
-                            try:
-                                cursor = st.session_state.db_manager.connection.cursor()
-                                cursor.execute(response)
-                                results = cursor.fetchall()
-                                if results:
-                                    # Get column names from cursor description
-                                    columns = [desc[0] for desc in cursor.description]
-                                    df = pd.DataFrame(results, columns=columns)
-                                    st.dataframe(df)
-                                else:
-                                    st.info("Query executed successfully but returned no results")
-                            except Exception as e:
-                                st.error(f"Error executing query: {str(e)}")
-                            finally:
-                                if cursor:
-                                    cursor.close()
+                st.session_state.generated_sql = response
                 
                 st.session_state.messages.append({"role": "assistant", "content": f"```sql\n{response}\n```"})
+
+            if st.session_state.get('generated_sql'):
+                render_query_runner(st.session_state.generated_sql)
         else:
             st.error("Unable to fetch database schema. Please check your connection.")
 
+def _query_connection_factory(db_manager):
+    """Connection factory for QueryRun threads, which cannot reach st.session_state."""
+    settings = dict(db_manager.config['connection'], database=db_manager._branch_db_name(), autocommit=True)
+    return lambda: mysql.connector.connect(**settings)
+
+def _strip_code_fence(sql: str) -> str:
+    lines = sql.strip().splitlines()
+    if lines and lines[0].startswith("```"):
+        lines = lines[1:]
+    if lines and lines[-1].strip() == "```":
+        lines = lines[:-1]
+    return "\n".join(lines).strip()
+
+def render_query_runner(sql: str) -> None:
+    """Run SQL in the background with a time limit, paged results and a cancel button."""
+    st.subheader("Run Query")
+    # Keyed by the SQL so a newly generated query replaces the edited text
+    statement = st.text_area("SQL to execute", _strip_code_fence(sql), height=120,
+                             key=f"query_sql_{abs(hash(sql))}")
+    col1, col2 = st.columns(2)
+    with col1:
+        time_limit = st.number_input("Time limit in seconds (SELECT only)", min_value=1,
+                                     value=DEFAULT_MAX_EXECUTION_MS // 1000)
+    with col2:
+        page_size = st.number_input("Rows per page", min_value=10, value=DEFAULT_QUERY_PAGE_SIZE, step=100)
+
+    run = st.session_state.get('query_run')
+    if st.button("Execute Query", disabled=run is not None and run.busy):
+        if run is not None:
+            run.close()
+        run = QueryRun(
+            _query_connection_factory(st.session_state.db_manager), statement,
+            max_execution_ms=int(time_limit * 1000), page_size=int(page_size)
+        )
+        st.session_state.query_run = run
+    if run is None:
+        return
+
+    try:
+        with studio_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                if run.busy or run.state == 'ready':
+                    if run.busy:
+                        if st.button("Cancel Query ⏹"):
+                            run.cancel(cursor)
+                    elif st.button("Close Result"):
+                        # A paused result is not cancelled, only its unread rows are dropped
+                        run.close()
+                rows_examined = run.poll_rows_examined(cursor)
+            finally:
+                cursor.close()
+    except Exception:
+        rows_examined = run.rows_examined
+
+    stats = f"⏱ {run.elapsed:.2f}s · {len(run.rows):,} rows fetched"
+    if rows_examined is not None:
+        stats += f" · {rows_examined:,} rows examined"
+    st.caption(stats)
+
+    if run.state == 'failed':
+        st.error(f"Error executing query: {run.error}")
+    elif run.state == 'cancelled':
+        st.warning("Query cancelled")
+    elif run.state == 'done' and not run.columns:
+        st.info(f"Query executed successfully ({run.rowcount} rows affected)")
+        if statement_kind(run.statement) not in READ_ONLY_KINDS and st.session_state.get('query_run_applied') is not run:
+            # The statement may have changed tables
+            st.session_state.query_run_applied = run
+            invalidate_schema_cache()
+
+    if run.columns:
+        df = pd.DataFrame([tuple(DatabaseManager._decode(value) for value in row) for row in run.rows],
+                          columns=run.columns)
+        st.dataframe(df)
+        if run.state == 'done' and not run.complete:
+            st.caption("The result was closed before all of its rows were read")
+
+    if run.state == 'ready' and run.has_more:
+        if st.button(f"Load {int(page_size)} more rows"):
+            run.request_more(int(page_size))
+            st.rerun()
+
+    if run.busy:
+        time.sleep(QUERY_POLL_INTERVAL)
+        st.rerun()
+
+def render_jobs_page():
+    st.title("Background Jobs")
+
+    runner = get_job_runner()
+    jobs = runner.jobs()
+    if not jobs:
+        st.info("No jobs have been run yet.")
+        return
+
+    status_icons = {'queued': '⏳', 'running': '🔄', 'succeeded': '✅', 'failed': '❌', 'interrupted': '⚠️'}
+    for job in jobs:
+        with st.container(border=True):
+            st.markdown(f"{status_icons.get(job['status'], '')} **{job['description']}** · {job['status']}")
+            started = datetime.fromisoformat(job['started_at']).strftime('%Y-%m-%d %H:%M:%S') if job['started_at'] else 'not started'
+            progress = job['progress']
+
+            if progress.get('tables_total'):
+                st.progress(
+                    progress['tables_done'] / progress['tables_total'],
+                    text=f"{progress['tables_done']}/{progress['tables_total']} tables"
+                    + (f" (last: {progress['table']})" if progress.get('table') else "")
+                )
+
+            details = [f"Started: {started}"]
+            if progress.get('rows') is not None:
+                details.append(f"{progress['rows']:,} rows")
+                throughput = job_throughput(job)
+                if throughput:
+                    details.append(f"{throughput:,.0f} rows/s")
+            st.caption(" · ".join(details))
+
+            if job['status'] == 'failed':
+                st.error(job['error'])
+            elif job['status'] == 'interrupted':
+                st.warning("Studio stopped before this job finished")
+            elif job['status'] == 'succeeded' and job['result']:
+                if job['kind'] == 'export_data' and os.path.exists(job['result']):
+                    with open(job['result'], "rb") as file:
+                        st.download_button(
+                            label="Download Exported Data",
+                            data=file.read(),
+                            file_name=os.path.basename(job['result']),
+                            mime="text/csv",
+                            key=f"download_{job['id']}"
+                        )
+                else:
+                    st.success(job['result'])
+
+    if runner.active():
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+
 def render_history_page():
     st.title("Command History")
-    
-    limit = st.number_input("Number of entries to show", min_value=1, value=10)
-    history_entries = st.session_state.db_manager.history_manager.get_history(limit)
-    
-    if not history_entries:
+
+    history_manager = st.session_state.db_manager.history_manager
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        command = st.selectbox("Command", ["(all)"] + history_manager.get_commands(), key="history_command")
+    with col2:
+        status = st.selectbox("Status", ["(all)", "success", "failed"], key="history_status")
+    with col3:
+        dates = st.date_input("Date Range", value=(), key="history_dates")
+    with col4:
+        page_size = st.selectbox("Entries per Page", BROWSE_PAGE_SIZES, index=1, key="history_page_size")
+
+    # A single picked date is a one-day range until the end date is picked
+    dates = tuple(dates) if isinstance(dates, (list, tuple)) else (dates,)
+    since = datetime.combine(dates[0], datetime.min.time()) if dates else None
+    until = datetime.combine(dates[-1], datetime.min.time()) + timedelta(days=1) if dates else None
+
+    # Changing the filters starts over at the first page
+    view = (command, status, dates, page_size)
+    if st.session_state.get('history_view') != view:
+        st.session_state.history_view = view
+        st.session_state.history_page = 0
+    page = st.session_state.history_page
+
+    total, history_entries = history_manager.query_history(
+        command=None if command == "(all)" else command,
+        status=None if status == "(all)" else status,
+        since=since,
+        until=until,
+        offset=page * page_size,
+        limit=page_size
+    )
+
+    if not total:
         st.info("No history entries found.")
+        return
+
+    pages = (total + page_size - 1) // page_size
+    st.caption(f"Page {page + 1} of {pages} · {total:,} matching entries")
+    columns = ["Timestamp", "Status", "Command", "Details", "Error/SQL Query"]
+    st.dataframe(pd.DataFrame(history_entries, columns=columns), use_container_width=True, hide_index=True)
+
+    nav1, nav2, nav3, nav4 = st.columns(4)
+    with nav1:
+        if st.button("⏮ Newest", disabled=page == 0):
+            st.session_state.history_page = 0
+            st.rerun()
+    with nav2:
+        if st.button("◀ Newer", disabled=page == 0):
+            st.session_state.history_page = page - 1
+            st.rerun()
+    with nav3:
+        if st.button("Older ▶", disabled=page + 1 >= pages):
+            st.session_state.history_page = page + 1
+            st.rerun()
+    with nav4:
+        if st.button("Oldest ⏭", disabled=page + 1 >= pages):
+            st.session_state.history_page = pages - 1
+            st.rerun()
+
+@st.cache_data(ttl=PERFORMANCE_CACHE_TTL, show_spinner=False)
+def server_connection_status() -> Dict:
+    """Server-wide thread counts and the connection limit."""
+    with studio_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SERVER_STATUS_QUERY)
+            status = {DatabaseManager._decode(name): int(value) for name, value in cursor.fetchall()}
+            cursor.execute("SELECT @@max_connections")
+            status['max_connections'] = int(cursor.fetchall()[0][0])
+            return status
+        finally:
+            cursor.close()
+
+def _schema_rows(query: str, schemas: tuple, *params) -> List:
+    with studio_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(schema_query(query, schemas), schemas + params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+@st.cache_data(ttl=PERFORMANCE_CACHE_TTL, show_spinner=False)
+def schema_load(schemas: tuple) -> List[Dict]:
+    """Statement count, time and rows examined per branch database, from the digest summary."""
+    return [
+        {
+            'schema': DatabaseManager._decode(schema),
+            'statements': int(count or 0),
+            'seconds': (total_wait or 0) / PICOSECONDS_PER_SECOND,
+            'rows_examined': int(rows_examined or 0)
+        }
+        for schema, count, total_wait, rows_examined in _schema_rows(SCHEMA_LOAD_QUERY, schemas)
+    ]
+
+@st.cache_data(ttl=PERFORMANCE_CACHE_TTL, show_spinner=False)
+def slow_queries(schemas: tuple, minutes: int, limit: int) -> List[Dict]:
+    """Statement digests seen in the last `minutes`, slowest single execution first."""
+    return [
+        {
+            'schema': DatabaseManager._decode(schema),
+            'query': DatabaseManager._decode(digest_text),
+            'executions': int(count),
+            'avg_seconds': avg_wait / PICOSECONDS_PER_SECOND,
+            'max_seconds': max_wait / PICOSECONDS_PER_SECOND,
+            'rows_examined': int(rows_examined),
+            'rows_sent': int(rows_sent),
+            'last_seen': last_seen
+        }
+        for schema, digest_text, count, avg_wait, max_wait, rows_examined, rows_sent, last_seen
+        in _schema_rows(SLOW_QUERIES_QUERY, schemas, minutes, limit)
+    ]
+
+@st.cache_data(ttl=PERFORMANCE_CACHE_TTL, show_spinner=False)
+def schema_sizes(schemas: tuple) -> Dict[str, Dict]:
+    """Table count, estimated rows and bytes of each branch database."""
+    return {
+        DatabaseManager._decode(schema): {
+            'tables': int(tables),
+            'rows': int(rows),
+            'data_bytes': int(data_bytes),
+            'index_bytes': int(index_bytes)
+        }
+        for schema, tables, rows, data_bytes, index_bytes in _schema_rows(SCHEMA_SIZE_QUERY, schemas)
+    }
+
+def render_performance_page():
+    st.title("Performance")
+
+    db_manager = st.session_state.db_manager
+    branches = {db_manager._branch_db_name(branch): branch for branch in db_manager.config['branches']}
+    schemas = tuple(sorted(branches))
+
+    refresh = st.selectbox(
+        "Auto Refresh", PERFORMANCE_REFRESH_INTERVALS, key="performance_refresh",
+        format_func=lambda seconds: f"Every {seconds}s" if seconds else "Off"
+    )
+
+    st.subheader("Connections")
+    settings = _connection_settings(db_manager)
+    try:
+        pool = pool_stats(get_connection_pool(db_manager, settings), get_borrow_counter(settings))
+    except Exception as e:
+        st.error(f"Error connecting to the database: {str(e)}")
+        return
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Studio Pool In Use", f"{pool['in_use']} / {pool['size']}")
+    try:
+        server = server_connection_status()
+    except Exception as e:
+        st.info(f"Server connection counters are unavailable: {str(e)}")
     else:
-        columns = ["Timestamp", "Status", "Command", "Details", "Error/SQL Query"]
-        df = pd.DataFrame(history_entries, columns=columns)
-        st.table(df)
+        col2.metric("Server Connections", f"{server.get('Threads_connected', 0)} / {server['max_connections']}")
+        col3.metric("Running Threads", server.get('Threads_running', 0))
+        col4.metric("Peak Connections", server.get('Max_used_connections', 0))
+    st.caption(f"{len(get_job_runner().active())} background jobs running")
+
+    st.subheader("Command Latency")
+    window = st.selectbox("Window", list(LATENCY_WINDOWS), key="performance_latency_window")
+    days = LATENCY_WINDOWS[window]
+    since = datetime.now() - timedelta(days=days) if days else None
+    durations = db_manager.history_manager.get_durations(since)
+    for job in get_job_runner().jobs():
+        seconds = job_duration(job)
+        if seconds is not None and (since is None or datetime.fromisoformat(job['started_at']) >= since):
+            durations.setdefault(f"{job['kind']} (Studio job)", []).append(seconds)
+    latency = latency_summary(durations)
+    if latency:
+        columns = ['command', 'count'] + [f'p{percent}' for percent in LATENCY_PERCENTILES] + ['max', 'total']
+        st.dataframe(pd.DataFrame(latency)[columns].round(3), use_container_width=True, hide_index=True)
+        st.caption("Seconds. CLI commands record their duration in the history; Studio operations run as jobs.")
+    else:
+        st.info("No timed commands recorded in this window.")
+
+    # performance_schema can be disabled or not readable by this user
+    st.subheader("Server Load by Branch")
+    try:
+        load = schema_load(schemas)
+    except Exception as e:
+        load = None
+        st.info(f"Statement statistics are unavailable (performance_schema): {str(e)}")
+    if load:
+        df = pd.DataFrame(load)
+        df['branch'] = df['schema'].map(branches)
+        fig = px.bar(df, x='branch', y='seconds', hover_data=['statements', 'rows_examined'],
+                     labels={'seconds': 'Statement time (s)'})
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("Totals since the server's statement statistics were last reset")
+    elif load is not None:
+        st.info("No statements recorded for the branch databases yet.")
+
+    st.subheader("Slowest Recent Queries")
+    col1, col2 = st.columns(2)
+    with col1:
+        minutes = st.number_input("Seen in the Last Minutes", min_value=1, value=60, key="performance_minutes")
+    with col2:
+        limit = st.number_input("Queries", min_value=1, max_value=100, value=20, key="performance_query_limit")
+    try:
+        queries = slow_queries(schemas, int(minutes), int(limit))
+    except Exception as e:
+        queries = None
+        st.info(f"Statement statistics are unavailable (performance_schema): {str(e)}")
+    if queries:
+        df = pd.DataFrame(queries)
+        df.insert(0, 'branch', df.pop('schema').map(branches))
+        st.dataframe(df.round(4), use_container_width=True, hide_index=True)
+    elif queries is not None:
+        st.info("No statements in this window.")
+
+    st.subheader("Branch Sizes")
+    try:
+        sizes = schema_sizes(schemas)
+    except Exception as e:
+        st.error(f"Error reading branch sizes: {str(e)}")
+        sizes = None
+    if sizes:
+        # Row counts sampled on each refresh; growth is measured from the first sample
+        samples = st.session_state.setdefault('performance_samples', [])
+        samples.append((time.time(), {schema: size['rows'] for schema, size in sizes.items()}))
+        del samples[:-PERFORMANCE_SAMPLES]
+        growth = row_growth(samples)
+        rows = []
+        for schema, size in sorted(sizes.items(), key=lambda item: -(item[1]['data_bytes'] + item[1]['index_bytes'])):
+            added, per_minute = growth.get(schema, (None, None))
+            rows.append({
+                'Branch': branches[schema],
+                'Tables': size['tables'],
+                'Rows (est.)': size['rows'],
+                'Data (MB)': round(size['data_bytes'] / 1024 ** 2, 2),
+                'Index (MB)': round(size['index_bytes'] / 1024 ** 2, 2),
+                'Row Growth': added,
+                'Rows/min': round(per_minute, 1) if per_minute is not None else None
+            })
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        if len(samples) > 1:
+            st.caption(f"Growth since {datetime.fromtimestamp(samples[0][0]).strftime('%H:%M:%S')}")
+
+    if refresh:
+        time.sleep(refresh)
+        st.rerun()
 
 def main():
     st.set_page_config(
@@ -681,6 +1305,7 @@ def main():
     )
     
     init_session_state()
+    sync_finished_jobs()
     render_sidebar()
     
     # Render the selected page
@@ -690,10 +1315,16 @@ def main():
         render_branches_page()
     elif st.session_state.current_page == 'Tables':
         render_tables_page()
+    elif st.session_state.current_page == 'Browse Data':
+        render_browse_page()
     elif st.session_state.current_page == 'Migrations':
         render_migrations_page()
+    elif st.session_state.current_page == 'Jobs':
+        render_jobs_page()
     elif st.session_state.current_page == 'History':
         render_history_page()
+    elif st.session_state.current_page == 'Performance':
+        render_performance_page()
     elif st.session_state.current_page == 'Ask Gemini':
         render_ask_gemini_page()
 
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+
+def branch_set_digest(branches):
+    """Digest of the branch names and their lineage; the layout only changes when this does."""
+    lineage = sorted((name, info.get('created_from') or '') for name, info in branches.items())
+    return hashlib.sha256(json.dumps(lineage).encode('utf-8')).hexdigest()
+
+
+def _children(branches):
+    """Map each branch to its children in creation order, and list the roots."""
+    def order(name):
+        return (name != 'main', branches[name].get('created_at') or '', name)
+
+    children = {name: [] for name in branches}
+    roots = []
+    for name, info in branches.items():
+        parent = info.get('created_from')
+        if parent in branches and parent != name:
+            children[parent].append(name)
+        else:
+            roots.append(name)
+    for names in children.values():
+        names.sort(key=order)
+    return children, sorted(roots, key=order)
+
+
+def subtree(branches, root):
+    """The branches descending from root (root included)."""
+    children, _ = _children(branches)
+    selected = {}
+    stack = [root]
+    while stack:
+        name = stack.pop()
+        if name in selected:
+            continue
+        selected[name] = dict(branches[name])
+        stack.extend(children[name])
+    # The root is drawn as a root of its own tree
+    selected[root].pop('created_from', None)
+    return selected
+
+
+def tree_layout(branches):
+    """
+    Lay branches out as a tree following their `created_from` lineage.
+
+    Depth gives the column and leaves take consecutive rows in creation order, with
+    each parent centred on its children, so the result is the same on every call
+    and takes linear time. Traversal is iterative, so deep lineages are fine.
+
+    Args:
+        branches (dict): Branch name to branch info, as in config['branches']
+
+    Returns:
+        dict: {'positions': {name: (depth, row)}, 'edges': [(parent, child)], 'rows': int}
+    """
+    children, roots = _children(branches)
+    positions = {}
+    visited = set()
+    next_row = 0
+
+    for root in roots:
+        stack = [(root, 0, False)]
+        while stack:
+            name, depth, expanded = stack.pop()
+            if expanded:
+                placed = [child for child in children[name] if child in positions]
+                if placed:
+                    row = (positions[placed[0]][1] + positions[placed[-1]][1]) / 2
+                else:
+                    row = next_row
+                    next_row += 1
+                positions[name] = (depth, row)
+                continue
+            if name in visited:
+                continue
+            visited.add(name)
+            stack.append((name, depth, True))
+            for child in reversed(children[name]):
+                stack.append((child, depth + 1, False))
+
+    # Branches caught in a created_from cycle can't be reached from any root
+    for name in sorted(set(branches) - visited):
+        positions[name] = (0, next_row)
+        next_row += 1
+
+    edges = [
+        (info['created_from'], name) for name, info in branches.items()
+        if info.get('created_from') in branches and info['created_from'] != name
+    ]
+    return {'positions': positions, 'edges': edges, 'rows': next_row}
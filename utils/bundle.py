@@ -0,0 +1,184 @@
+import hashlib
+import math
+import re
+from datetime import timedelta
+
+MANIFEST_FILE = 'manifest.json'
+# 2: binary columns of CSV bundles are hex-encoded (manifest 'binary_columns')
+BUNDLE_VERSION = 2
+
+# Column types whose values are raw bytes. CSV bundles store them hex-encoded so every
+# byte survives the text format, and the loader UNHEX()es them.
+BINARY_TYPES = ('binary', 'varbinary', 'tinyblob', 'blob', 'mediumblob', 'longblob', 'geometry', 'point',
+                'linestring', 'polygon', 'multipoint', 'multilinestring', 'multipolygon', 'geometrycollection')
+
+# Bundle CSV files use MySQL's LOAD DATA conventions so they can be loaded without
+# any client-side parsing:
+#   FIELDS TERMINATED BY ',' ENCLOSED BY '"' ESCAPED BY '\\' LINES TERMINATED BY '\n'
+LOAD_DATA_OPTIONS = "FIELDS TERMINATED BY ',' ENCLOSED BY '\"' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'"
+
+_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '"': '\\"',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+    '\0': '\\0',
+    '\x1a': '\\Z',
+})
+_UNESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '0': '\0', 'Z': '\x1a'}
+_FIELD = re.compile(r'(\\N)(?:,|$)|"((?:[^"\\]|\\.)*)"(?:,|$)')
+_ESCAPE_SEQUENCE = re.compile(r'\\(.)', re.DOTALL)
+
+
+def _format_timedelta(value):
+    """Format a TIME value the way MySQL prints it: [-]HH:MM:SS[.ffffff]."""
+    sign = '-' if value < timedelta(0) else ''
+    value = abs(value)
+    hours, remainder = divmod(value.days * 86400 + value.seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    text = f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if value.microseconds:
+        text += f".{value.microseconds:06d}"
+    return text
+
+
+def format_mysql_csv_value(value, binary=False):
+    """Render one value as a LOAD DATA field; NULL becomes an unquoted \\N, binary values are hex-encoded."""
+    if value is None:
+        return '\\N'
+    if binary:
+        return f'"{(value.encode("utf-8") if isinstance(value, str) else bytes(value)).hex()}"'
+    if isinstance(value, (bytes, bytearray)):
+        value = bytes(value).decode('utf-8', errors='replace')
+    elif isinstance(value, set):
+        value = ','.join(sorted(value))
+    elif isinstance(value, timedelta):
+        value = _format_timedelta(value)
+    else:
+        value = str(value)
+    return f'"{value.translate(_ESCAPES)}"'
+
+
+def write_mysql_csv_rows(csvfile, rows, binary_columns=()):
+    """
+    Write row tuples to a text stream in the bundle CSV dialect.
+
+    Args:
+        csvfile: Text stream to write to
+        rows (list): Row tuples
+        binary_columns (collection): Positions of the columns to hex-encode
+    """
+    if not binary_columns:
+        csvfile.writelines(','.join(format_mysql_csv_value(value) for value in row) + '\n' for row in rows)
+        return
+    csvfile.writelines(
+        ','.join(format_mysql_csv_value(value, index in binary_columns) for index, value in enumerate(row)) + '\n'
+        for row in rows
+    )
+
+
+def parse_mysql_csv_line(line):
+    """Parse one bundle CSV line back into a list of values (None for NULL)."""
+    values = []
+    for match in _FIELD.finditer(line.rstrip('\n')):
+        if match.group(1):
+            values.append(None)
+            continue
+        value = match.group(2)
+        if '\\' in value:
+            value = _ESCAPE_SEQUENCE.sub(lambda m: _UNESCAPES.get(m.group(1), m.group(1)), value)
+        values.append(value)
+    return values
+
+
+def decode_binary_values(values, binary_columns):
+    """Turn the hex-encoded binary fields of a parsed bundle CSV line back into bytes, in place."""
+    for index in binary_columns:
+        if values[index] is not None:
+            values[index] = bytes.fromhex(values[index])
+    return values
+
+
+def file_sha256(file_path, block_size=1024 * 1024):
+    """Hash a file in fixed-size blocks so large bundle files are never fully loaded."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def plan_pk_chunks(min_value, max_value, estimated_rows, chunk_rows):
+    """
+    Split an integer primary key range into contiguous chunks.
+
+    Args:
+        min_value (int): Smallest primary key value, or None for an empty table
+        max_value (int): Largest primary key value
+        estimated_rows (int): Approximate row count (INFORMATION_SCHEMA.TABLES.TABLE_ROWS)
+        chunk_rows (int): Target number of rows per chunk
+
+    Returns:
+        list: (low, high) tuples covering low <= pk < high, or [(None, None)] for a single chunk
+    """
+    if min_value is None or max_value is None:
+        return [(None, None)]
+
+    chunk_count = max(1, math.ceil((estimated_rows or 0) / chunk_rows))
+    step = max(1, math.ceil((max_value - min_value + 1) / chunk_count))
+
+    chunks = []
+    low = min_value
+    while low <= max_value:
+        chunks.append((low, low + step))
+        low += step
+    return chunks
+
+
+_SECONDARY_INDEX_PREFIXES = ('KEY ', 'UNIQUE KEY ', 'FULLTEXT KEY ', 'SPATIAL KEY ', 'INDEX ', 'UNIQUE INDEX ')
+_COLUMN_NAME = re.compile(r'^`((?:[^`]|``)+)`')
+
+
+def split_deferred_indexes(ddl):
+    """
+    Split a SHOW CREATE TABLE statement so secondary indexes can be built after loading.
+
+    Secondary indexes and foreign keys are removed from the CREATE TABLE; an index
+    covering an AUTO_INCREMENT column is kept because MySQL requires it.
+
+    Args:
+        ddl (str): Output of SHOW CREATE TABLE
+
+    Returns:
+        tuple: (create_sql, index_definitions, foreign_key_definitions)
+    """
+    ddl = ddl.strip().rstrip(';')
+    start = ddl.find('(\n')
+    end = ddl.rfind('\n)')
+    if start == -1 or end <= start:
+        return ddl, [], []
+
+    lines = [line.rstrip().rstrip(',') for line in ddl[start + 2:end].split('\n')]
+    auto_increment_columns = {
+        f"`{_COLUMN_NAME.match(line.strip()).group(1)}`"
+        for line in lines
+        if ' AUTO_INCREMENT' in line and _COLUMN_NAME.match(line.strip())
+    }
+
+    kept, indexes, foreign_keys = [], [], []
+    for line in lines:
+        definition = line.strip()
+        if definition.startswith(_SECONDARY_INDEX_PREFIXES):
+            key_columns = definition[definition.find('('):]
+            if any(column in key_columns for column in auto_increment_columns):
+                kept.append(line)
+            else:
+                indexes.append(definition)
+        elif definition.startswith('CONSTRAINT ') and ' FOREIGN KEY ' in definition:
+            foreign_keys.append(definition)
+        else:
+            kept.append(line)
+
+    create_sql = ddl[:start + 1] + '\n' + ',\n'.join(kept) + ddl[end:]
+    return create_sql, indexes, foreign_keys
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+DEFAULT_CHUNK_SIZE = 1000
+
+_IDENTIFIER = r'(?:`(?:[^`]|``)+`|[\w$]+)'
+_TARGET = re.compile(
+    rf'^\s*(?:UPDATE(?:\s+LOW_PRIORITY)?(?:\s+IGNORE)?|DELETE(?:\s+LOW_PRIORITY)?(?:\s+QUICK)?(?:\s+IGNORE)?\s+FROM)'
+    rf'\s+({_IDENTIFIER}(?:\s*\.\s*{_IDENTIFIER})?)(?=\s|$)',
+    re.IGNORECASE
+)
+_KEYWORD = re.compile(r'\b(WHERE|ORDER\s+BY|LIMIT)\b', re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`", re.DOTALL)
+
+
+def _top_level_keywords(statement):
+    """Yield (keyword, start, end) for WHERE/ORDER BY/LIMIT outside literals and parentheses."""
+    depth = 0
+    position = 0
+    while position < len(statement):
+        character = statement[position]
+        if character in '\'"`':
+            literal = _LITERAL.match(statement, position)
+            position = literal.end() if literal else len(statement)
+            continue
+        if character == '(':
+            depth += 1
+        elif character == ')':
+            depth -= 1
+        elif depth == 0 and character.isalpha():
+            keyword = _KEYWORD.match(statement, position)
+            if keyword:
+                yield ' '.join(keyword.group(1).upper().split()), keyword.start(), keyword.end()
+                position = keyword.end()
+                continue
+        position += 1
+
+
+class ChunkedStatement:
+    """
+    A single-table UPDATE or DELETE rewritten to run over primary key ranges.
+
+    Built from a `-- mydb:chunked by <column> size <rows> [sleep <seconds>]` directive;
+    each chunk adds `<column> >= low AND <column> < high` to the statement's WHERE clause.
+    Chunk boundaries are looked up in the key's index, so every chunk holds `size` rows
+    however sparse the keys are.
+    """
+
+    def __init__(self, statement, options):
+        settings = dict(zip(options[::2], options[1::2]))
+        if 'by' not in settings:
+            raise ValueError("mydb:chunked needs a key column, e.g. '-- mydb:chunked by id size 5000'")
+        self.key = settings['by']
+        self.size = int(settings.get('size', DEFAULT_CHUNK_SIZE))
+        self.sleep = float(settings.get('sleep', 0))
+        if self.size <= 0:
+            raise ValueError("mydb:chunked size must be positive")
+
+        target = _TARGET.match(statement)
+        if not target:
+            raise ValueError(f"mydb:chunked only applies to single-table UPDATE or DELETE statements: {statement[:60]}")
+        self.table = target.group(1)
+        self.statement = statement
+
+        self._where = None
+        for keyword, start, end in _top_level_keywords(statement):
+            if keyword != 'WHERE':
+                raise ValueError(f"mydb:chunked statements cannot use {keyword}")
+            self._where = (start, end)
+
+    def start_query(self):
+        return f"SELECT MIN({self.key}) FROM {self.table}"
+
+    def next_boundary_query(self):
+        """Query for the key starting the chunk after the one beginning at %s (params: low, size)."""
+        return f"SELECT {self.key} FROM {self.table} WHERE {self.key} >= %s ORDER BY {self.key} LIMIT 1 OFFSET %s"
+
+    def chunk_statement(self, low, high=None):
+        """The statement restricted to low <= key < high, or key >= low for the last chunk (integer bounds, inlined)."""
+        condition = f"{self.key} >= {int(low)}"
+        if high is not None:
+            condition += f" AND {self.key} < {int(high)}"
+        if self._where is None:
+            return f"{self.statement} WHERE {condition}"
+        start, end = self._where
+        return f"{self.statement[:end]} ({self.statement[end:].strip()}) AND {condition}"
+
+    def progress_key(self, db_name):
+        """Identify this statement in a database, so a re-run can resume where it stopped."""
+        return hashlib.sha256(f"{db_name}\n{self.statement}".encode('utf-8')).hexdigest()
+
+
+def has_chunked_directive(file_path):
+    """Whether a migration file mentions a mydb:chunked directive (a plain text scan, no parsing)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return any('mydb:chunked' in line for line in f)
+
+
+# Migrations applied to several branches at once share the progress file
+_progress_lock = threading.Lock()
+
+
+class ChunkProgress:
+    """Next key to process for chunked statements that have not finished, stored as JSON."""
+
+    def __init__(self, path='.mydb/chunk_progress.json'):
+        self.path = path
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def _save(self, progress):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(progress, f, indent=4)
+        os.replace(temp_path, self.path)
+
+    def get(self, key):
+        return self._load().get(key)
+
+    def set(self, key, next_value):
+        with _progress_lock:
+            progress = self._load()
+            progress[key] = next_value
+            self._save(progress)
+
+    def clear(self, key):
+        with _progress_lock:
+            progress = self._load()
+            if progress.pop(key, None) is not None:
+                self._save(progress)
@@ -0,0 +1,208 @@
+import math
+
+from utils.table_analysis import LOB_TYPES, NUMERIC_TYPES
+
+DEFAULT_PROFILE_CHUNK_SIZE = 10000
+DEFAULT_TOP_K = 10
+# HyperLogLog registers are 2**precision bytes per column; 14 gives ~0.8% standard error
+HLL_PRECISION = 14
+# Numeric values kept per column to estimate quantiles
+QUANTILE_SAMPLE_SIZE = 20000
+PROFILE_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+HISTOGRAM_BINS = 10
+
+
+def _require_numpy():
+    """Import numpy and pandas lazily so the rest of the CLI works without them."""
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError:
+        raise ImportError("numpy and pandas are required for column profiling. Install them with: pip install numpy pandas")
+    return np, pd
+
+
+def _bit_length(np, values):
+    """Bit length of each uint64, exact (frexp of 32-bit halves, which floats hold exactly)."""
+    high = values >> np.uint64(32)
+    low = values & np.uint64(0xFFFFFFFF)
+    high_bits = np.frexp(high.astype(np.float64))[1]
+    low_bits = np.frexp(low.astype(np.float64))[1]
+    return np.where(high > 0, high_bits + 32, low_bits)
+
+
+class HyperLogLog:
+    """Approximate distinct count in fixed memory, updated with arrays of 64-bit hashes."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        np, _ = _require_numpy()
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes):
+        np, _ = _require_numpy()
+        if not len(hashes):
+            return
+        precision = np.uint64(self.precision)
+        buckets = (hashes >> (np.uint64(64) - precision)).astype(np.intp)
+        # The remaining bits, with a stop bit so the rank is at most 64 - precision + 1
+        remainder = (hashes << precision) | (np.uint64(1) << (precision - np.uint64(1)))
+        ranks = (65 - _bit_length(np, remainder)).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def estimate(self):
+        np, _ = _require_numpy()
+        registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / registers)
+        raw = alpha * registers ** 2 / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * registers and empty:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(registers * math.log(registers / empty)))
+        return int(round(raw))
+
+
+class TopK:
+    """
+    Frequent values by the Misra-Gries summary, holding at most `capacity` counters.
+
+    Counts are lower bounds, short by at most (values seen) / (capacity + 1).
+    """
+
+    def __init__(self, k=DEFAULT_TOP_K, capacity=None):
+        self.k = k
+        self.capacity = capacity or max(k * 100, 1000)
+        self.counters = {}
+
+    def add(self, values, counts):
+        np, _ = _require_numpy()
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self.counters[value] = self.counters.get(value, 0) + count
+        if len(self.counters) > self.capacity:
+            keys = list(self.counters)
+            totals = np.fromiter(self.counters.values(), dtype=np.int64, count=len(keys))
+            # Subtract the (capacity + 1)-th largest count from every counter and drop the rest
+            cutoff = np.partition(totals, len(totals) - self.capacity - 1)[len(totals) - self.capacity - 1]
+            totals -= cutoff
+            self.counters = {keys[i]: int(totals[i]) for i in np.flatnonzero(totals > 0)}
+
+    def top(self):
+        return sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))[:self.k]
+
+
+class ColumnProfiler:
+    """
+    Streaming profile of one column: nulls, approximate distinct count, frequent
+    values and, for numeric columns, exact min/max/mean with quantiles and a
+    histogram estimated from a fixed-size reservoir sample.
+    """
+
+    def __init__(self, name, numeric=False, top_k=DEFAULT_TOP_K, sample_size=QUANTILE_SAMPLE_SIZE, seed=0):
+        np, _ = _require_numpy()
+        self.name = name
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.top_values = TopK(top_k)
+        self.random = np.random.default_rng(seed)
+        self.sample_size = sample_size
+        self.sample = np.empty(sample_size, dtype=np.float64) if numeric else None
+        self.numeric_seen = 0
+        self.minimum = None
+        self.maximum = None
+        self.total = 0.0
+
+    def update(self, values):
+        """Add one chunk of column values (None for NULL)."""
+        np, pd = _require_numpy()
+        column = np.asarray(values, dtype=object)
+        present = column[column != None]  # noqa: E711 - elementwise comparison
+        self.rows += len(column)
+        self.nulls += len(column) - len(present)
+        if not len(present):
+            return
+
+        # Values are compared as text so every chunk hashes and groups them the same way
+        text = np.array([value.decode('utf-8', errors='replace') if isinstance(value, (bytes, bytearray))
+                         else str(value) for value in present], dtype=object)
+        self.distinct.add(pd.util.hash_array(text, categorize=False))
+        unique, counts = np.unique(text, return_counts=True)
+        self.top_values.add(unique, counts)
+
+        if self.numeric:
+            self._update_numeric(present.astype(np.float64))
+
+    def _update_numeric(self, numbers):
+        np, _ = _require_numpy()
+        chunk_min, chunk_max = float(numbers.min()), float(numbers.max())
+        self.minimum = chunk_min if self.minimum is None else min(self.minimum, chunk_min)
+        self.maximum = chunk_max if self.maximum is None else max(self.maximum, chunk_max)
+        self.total += float(numbers.sum())
+
+        # Reservoir sampling (algorithm R) over the whole chunk at once
+        positions = np.arange(self.numeric_seen, self.numeric_seen + len(numbers))
+        filling = positions < self.sample_size
+        self.sample[positions[filling]] = numbers[filling]
+        slots = (self.random.random(int((~filling).sum())) * (positions[~filling] + 1)).astype(np.int64)
+        keep = slots < self.sample_size
+        self.sample[slots[keep]] = numbers[~filling][keep]
+        self.numeric_seen += len(numbers)
+
+    def result(self):
+        np, _ = _require_numpy()
+        present = self.rows - self.nulls
+        profile = {
+            'column': self.name,
+            'rows': self.rows,
+            'nulls': self.nulls,
+            'null_ratio': self.nulls / self.rows if self.rows else 0.0,
+            # The estimate can't exceed the number of values seen
+            'distinct': min(self.distinct.estimate(), present),
+            'top': self.top_values.top(),
+        }
+        if self.numeric and self.numeric_seen:
+            sample = self.sample[:min(self.numeric_seen, self.sample_size)]
+            counts, edges = np.histogram(sample, bins=HISTOGRAM_BINS, range=(self.minimum, self.maximum))
+            scale = self.numeric_seen / len(sample)
+            profile.update({
+                'min': self.minimum,
+                'max': self.maximum,
+                'mean': self.total / self.numeric_seen,
+                'quantiles': dict(zip(PROFILE_QUANTILES, np.quantile(sample, PROFILE_QUANTILES).tolist())),
+                'histogram': {
+                    'edges': edges.tolist(),
+                    'counts': [int(round(count * scale)) for count in counts],
+                },
+            })
+        return profile
+
+
+class TableProfiler:
+    """Profiles of several columns, fed with chunks of rows as returned by fetchmany."""
+
+    def __init__(self, columns, top_k=DEFAULT_TOP_K):
+        """
+        Args:
+            columns (list): (column_name, data_type) pairs; large-object columns are skipped
+            top_k (int): Number of frequent values reported per column
+        """
+        self.columns = [
+            ColumnProfiler(name, numeric=data_type.lower() in NUMERIC_TYPES, top_k=top_k)
+            for name, data_type in columns if data_type.lower() not in LOB_TYPES
+        ]
+        self.rows = 0
+
+    @property
+    def column_names(self):
+        return [profiler.name for profiler in self.columns]
+
+    def update(self, rows):
+        if not rows:
+            return
+        self.rows += len(rows)
+        for profiler, values in zip(self.columns, zip(*rows)):
+            profiler.update(values)
+
+    def result(self):
+        return {'rows': self.rows, 'columns': [profiler.result() for profiler in self.columns]}
@@ -0,0 +1,263 @@
+import json
+import os
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# File extensions recognised when the import format is not given explicitly
+COLUMNAR_EXTENSIONS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.ipc': 'arrow',
+    '.feather': 'arrow',
+}
+
+MYSQL_TYPE_METADATA_KEY = b'mysql_type'
+
+
+def _require_pyarrow():
+    """Import pyarrow lazily so CSV/PDF users don't need it installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet/Arrow files. Install it with: pip install pyarrow")
+    return pa, pq
+
+
+def _to_str(value):
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    return value
+
+
+def detect_columnar_format(file_path):
+    """Return 'parquet' or 'arrow' based on the file extension, or None."""
+    for extension, file_format in COLUMNAR_EXTENSIONS.items():
+        if file_path.lower().endswith(extension):
+            return file_format
+    return None
+
+
+def arrow_type_for_mysql(data_type, column_type, precision=None, scale=None):
+    """Map an INFORMATION_SCHEMA column definition to an Arrow type."""
+    pa, _ = _require_pyarrow()
+    data_type = _to_str(data_type).lower()
+    column_type = _to_str(column_type).lower()
+    unsigned = 'unsigned' in column_type
+
+    integer_types = {
+        'tinyint': (pa.int8(), pa.uint8()),
+        'smallint': (pa.int16(), pa.uint16()),
+        'mediumint': (pa.int32(), pa.uint32()),
+        'int': (pa.int32(), pa.uint32()),
+        'integer': (pa.int32(), pa.uint32()),
+        'bigint': (pa.int64(), pa.uint64()),
+    }
+    if data_type in integer_types:
+        signed_type, unsigned_type = integer_types[data_type]
+        return unsigned_type if unsigned else signed_type
+    if data_type == 'bit':
+        return pa.uint64()
+    if data_type == 'year':
+        return pa.int16()
+    if data_type == 'float':
+        return pa.float32()
+    if data_type in ('double', 'real'):
+        return pa.float64()
+    if data_type in ('decimal', 'numeric'):
+        precision = int(precision or 10)
+        scale = int(scale or 0)
+        if precision <= 38:
+            return pa.decimal128(precision, scale)
+        if hasattr(pa, 'decimal256'):
+            return pa.decimal256(precision, scale)
+        return pa.string()
+    if data_type == 'date':
+        return pa.date32()
+    if data_type in ('datetime', 'timestamp'):
+        return pa.timestamp('us')
+    if data_type == 'time':
+        return pa.duration('us')
+    if data_type in ('binary', 'varbinary', 'tinyblob', 'blob', 'mediumblob', 'longblob'):
+        return pa.binary()
+    # char, varchar, text, enum, set, json and anything unknown
+    return pa.string()
+
+
+def arrow_schema_for_columns(columns):
+    """
+    Build an Arrow schema for a MySQL table.
+
+    Args:
+        columns (list): Rows of (name, data_type, column_type, precision, scale, is_nullable)
+            as returned by INFORMATION_SCHEMA.COLUMNS
+
+    Returns:
+        pyarrow.Schema: Schema carrying the original MySQL column type as field metadata
+    """
+    pa, _ = _require_pyarrow()
+    fields = []
+    for name, data_type, column_type, precision, scale, is_nullable in columns:
+        fields.append(pa.field(
+            _to_str(name),
+            arrow_type_for_mysql(data_type, column_type, precision, scale),
+            nullable=_to_str(is_nullable) != 'NO',
+            metadata={MYSQL_TYPE_METADATA_KEY: _to_str(column_type).encode('utf-8')}
+        ))
+    return pa.schema(fields)
+
+
+def mysql_type_for_field(field):
+    """Return the MySQL column type to use when creating a table from an Arrow field."""
+    pa, _ = _require_pyarrow()
+    if field.metadata and MYSQL_TYPE_METADATA_KEY in field.metadata:
+        return field.metadata[MYSQL_TYPE_METADATA_KEY].decode('utf-8')
+
+    arrow_type = field.type
+    types = pa.types
+    if types.is_boolean(arrow_type):
+        return 'BOOLEAN'
+    if types.is_integer(arrow_type):
+        name = {8: 'TINYINT', 16: 'SMALLINT', 32: 'INT', 64: 'BIGINT'}[arrow_type.bit_width]
+        return f"{name} UNSIGNED" if types.is_unsigned_integer(arrow_type) else name
+    if types.is_float32(arrow_type):
+        return 'FLOAT'
+    if types.is_floating(arrow_type):
+        return 'DOUBLE'
+    if types.is_decimal(arrow_type):
+        return f"DECIMAL({min(arrow_type.precision, 65)},{arrow_type.scale})"
+    if types.is_date(arrow_type):
+        return 'DATE'
+    if types.is_timestamp(arrow_type):
+        return 'DATETIME(6)'
+    if types.is_duration(arrow_type) or types.is_time(arrow_type):
+        return 'TIME(6)'
+    if types.is_binary(arrow_type) or types.is_large_binary(arrow_type) or types.is_fixed_size_binary(arrow_type):
+        return 'LONGBLOB'
+    if types.is_string(arrow_type) or types.is_large_string(arrow_type):
+        return 'LONGTEXT'
+    return 'TEXT'
+
+
+def _value_converter(arrow_type):
+    """Return a function normalising mysql.connector values for the given Arrow type."""
+    pa, _ = _require_pyarrow()
+    if pa.types.is_string(arrow_type):
+        def convert(value):
+            if value is None or isinstance(value, str):
+                return value
+            if isinstance(value, (bytes, bytearray)):
+                return value.decode('utf-8', errors='replace')
+            if isinstance(value, set):
+                return ','.join(sorted(value))
+            return str(value)
+        return convert
+    if pa.types.is_binary(arrow_type):
+        def convert(value):
+            if isinstance(value, bytearray):
+                return bytes(value)
+            if isinstance(value, str):
+                return value.encode('utf-8')
+            return value
+        return convert
+    if pa.types.is_integer(arrow_type):
+        def convert(value):
+            if isinstance(value, (bytes, bytearray)):
+                return int.from_bytes(value, 'big')
+            return value
+        return convert
+    return lambda value: value
+
+
+def rows_to_record_batch(rows, schema):
+    """Convert a list of row tuples into an Arrow RecordBatch for the given schema."""
+    pa, _ = _require_pyarrow()
+    arrays = []
+    for index, field in enumerate(schema):
+        convert = _value_converter(field.type)
+        arrays.append(pa.array([convert(row[index]) for row in rows], type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class ColumnarWriter:
+    """Write row batches to a Parquet or Arrow IPC file, one row group per batch."""
+
+    def __init__(self, file_path, file_format, schema, metadata=None, compression=None):
+        pa, pq = _require_pyarrow()
+        if metadata:
+            schema = schema.with_metadata({k: json.dumps(v) for k, v in metadata.items()})
+        self.schema = schema
+        self.file_format = file_format
+        if file_format == 'parquet':
+            self._writer = pq.ParquetWriter(file_path, schema, compression=compression or 'snappy')
+        elif file_format == 'arrow':
+            if compression not in (None, 'zstd', 'lz4'):
+                raise ValueError(f"Arrow IPC files support zstd or lz4 compression, not {compression}")
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._sink = pa.OSFile(file_path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, schema, options=options)
+        else:
+            raise ValueError(f"Unsupported columnar format: {file_format}")
+
+    def write_rows(self, rows):
+        pa, _ = _require_pyarrow()
+        batch = rows_to_record_batch(rows, self.schema)
+        if self.file_format == 'parquet':
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
+        if self.file_format == 'arrow':
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_columnar_schema(file_path, file_format):
+    """
+    Read the Arrow schema of a Parquet or Arrow IPC file without loading its data.
+
+    file_path may also be a seekable binary file object.
+    """
+    pa, pq = _require_pyarrow()
+    if file_format == 'parquet':
+        return pq.ParquetFile(file_path).schema_arrow
+    if not isinstance(file_path, (str, os.PathLike)):
+        return pa.ipc.open_file(file_path).schema
+    with pa.memory_map(file_path, 'r') as source:
+        return pa.ipc.open_file(source).schema
+
+
+def iter_columnar_batches(file_path, file_format, batch_size=10000):
+    """
+    Stream a Parquet or Arrow IPC file as lists of row tuples.
+
+    file_path may also be a seekable binary file object.
+
+    Yields:
+        tuple: (column_names, rows) for each batch read from the file
+    """
+    pa, pq = _require_pyarrow()
+    if file_format == 'parquet':
+        batches = pq.ParquetFile(file_path).iter_batches(batch_size=batch_size)
+        for batch in batches:
+            yield batch.schema.names, list(zip(*(column.to_pylist() for column in batch.columns)))
+    elif not isinstance(file_path, (str, os.PathLike)):
+        yield from _iter_ipc_batches(pa.ipc.open_file(file_path))
+    else:
+        with pa.memory_map(file_path, 'r') as source:
+            yield from _iter_ipc_batches(pa.ipc.open_file(source))
+
+
+def _iter_ipc_batches(reader):
+    for index in range(reader.num_record_batches):
+        batch = reader.get_batch(index)
+        yield batch.schema.names, list(zip(*(column.to_pylist() for column in batch.columns)))
@@ -0,0 +1,100 @@
+import gzip
+import io
+from contextlib import contextmanager
+
+COMPRESSION_EXTENSIONS = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+def _require_zstandard():
+    """Import zstandard lazily so gzip and uncompressed files work without it."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstandard is required for .zst files. Install it with: pip install zstandard")
+    return zstandard
+
+
+def detect_compression(file_path):
+    """Return 'gzip' or 'zstd' based on the file extension, or None."""
+    for compression, extension in COMPRESSION_EXTENSIONS.items():
+        if file_path.lower().endswith(extension):
+            return compression
+    return None
+
+
+def strip_compression_extension(file_path):
+    """Remove a trailing .gz/.zst extension, e.g. 'users.csv.gz' -> 'users.csv'."""
+    compression = detect_compression(file_path)
+    if compression:
+        return file_path[:-len(COMPRESSION_EXTENSIONS[compression])]
+    return file_path
+
+
+def open_compressed(file_path, mode='r', compression=None, encoding='utf-8'):
+    """
+    Open a text file through a streaming compressor or decompressor.
+
+    Args:
+        file_path (str): Path of the file to open
+        mode (str): 'r' to read or 'w' to write
+        compression (str, optional): 'gzip', 'zstd' or None for a plain file
+        encoding (str): Text encoding of the uncompressed content
+
+    Returns:
+        file object: Text stream that compresses/decompresses chunk by chunk
+    """
+    if mode not in ('r', 'w'):
+        raise ValueError(f"Unsupported mode: {mode}")
+
+    if compression is None:
+        return open(file_path, mode, encoding=encoding, newline='')
+    if compression == 'gzip':
+        return gzip.open(file_path, f"{mode}t", compresslevel=6, encoding=encoding, newline='')
+    if compression == 'zstd':
+        zstandard = _require_zstandard()
+        raw = open(file_path, f"{mode}b")
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding=encoding, newline='')
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+@contextmanager
+def read_text_stream(stream, compression=None, encoding='utf-8'):
+    """
+    Read a binary file object as text, decompressing it chunk by chunk.
+
+    Unlike open_compressed, the stream belongs to the caller and is left open.
+
+    Args:
+        stream (file object): Binary stream positioned at the start of the content
+        compression (str, optional): 'gzip', 'zstd' or None for plain content
+        encoding (str): Text encoding of the uncompressed content
+
+    Yields:
+        file object: Text stream over the (decompressed) content
+    """
+    if compression is None:
+        raw = stream
+    elif compression == 'gzip':
+        # GzipFile does not close a fileobj it was given
+        raw = gzip.GzipFile(fileobj=stream, mode='rb')
+    elif compression == 'zstd':
+        zstandard = _require_zstandard()
+        raw = zstandard.ZstdDecompressor().stream_reader(stream, closefd=False)
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    text = io.TextIOWrapper(raw, encoding=encoding, newline='')
+    try:
+        yield text
+    finally:
+        # Detach so closing the wrapper doesn't close the caller's stream
+        text.detach()
+        if raw is not stream:
+            raw.close()
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+DEFAULT_JOB_WORKERS = 2
+# Finished jobs kept in the job file; older ones are dropped
+MAX_FINISHED_JOBS = 200
+# Progress is written to the job file at most this often
+PROGRESS_FLUSH_INTERVAL = 1.0
+
+FINISHED_STATES = ('succeeded', 'failed', 'interrupted')
+
+
+class JobStore:
+    """Job records kept in memory and mirrored to a JSON file so they outlive a page refresh."""
+
+    def __init__(self, path='.mydb/jobs.json'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._jobs = self._load()
+        # Jobs that were running when the previous Studio process stopped will never finish
+        interrupted = False
+        for job in self._jobs.values():
+            if job['status'] not in FINISHED_STATES:
+                job.update(status='interrupted', finished_at=datetime.now().isoformat())
+                interrupted = True
+        if interrupted:
+            with self._lock:
+                self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return {job['id']: job for job in json.load(f)}
+
+    def _save(self):
+        finished = [job for job in self._jobs.values() if job['status'] in FINISHED_STATES]
+        for job in sorted(finished, key=lambda job: job['created_at'])[:-MAX_FINISHED_JOBS]:
+            del self._jobs[job['id']]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(list(self._jobs.values()), f, indent=2, default=str)
+        os.replace(temp_path, self.path)
+
+    def add(self, job):
+        with self._lock:
+            self._jobs[job['id']] = job
+            self._save()
+
+    def update(self, job_id, persist=True, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            if persist:
+                self._save()
+
+    def update_progress(self, job_id, fields, persist=True):
+        with self._lock:
+            self._jobs[job_id]['progress'].update(fields)
+            if persist:
+                self._save()
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job, progress=dict(job['progress'])) if job else None
+
+    def list(self):
+        """All jobs, newest first (copies)."""
+        with self._lock:
+            jobs = [dict(job, progress=dict(job['progress'])) for job in self._jobs.values()]
+        return sorted(jobs, key=lambda job: job['created_at'], reverse=True)
+
+
+class JobProgress:
+    """
+    Progress callback handed to a job.
+
+    Called as progress(tables_done=3, tables_total=10, rows=120000, ...); fields
+    are visible in memory at once and written to the job file at most once a second.
+    """
+
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+        self._last_flush = 0.0
+
+    def __call__(self, **fields):
+        now = time.monotonic()
+        flush = now - self._last_flush >= PROGRESS_FLUSH_INTERVAL
+        if flush:
+            self._last_flush = now
+        self.store.update_progress(self.job_id, fields, persist=flush)
+
+
+class JobRunner:
+    """
+    Runs long operations on a worker thread pool, recording each one in a JobStore.
+
+    A job function is called with a `progress` keyword argument and returns either
+    a bool or a (bool, message) tuple, like the DatabaseManager methods it wraps.
+    """
+
+    def __init__(self, store=None, workers=DEFAULT_JOB_WORKERS):
+        self.store = store or JobStore()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mydb-job')
+
+    def submit(self, kind, description, function, *args, **kwargs):
+        """
+        Queue a job.
+
+        Args:
+            kind (str): Operation name, e.g. 'create_branch'
+            description (str): Text shown for the job
+            function (callable): Work to run; receives *args, **kwargs and progress=
+
+        Returns:
+            str: The job id
+        """
+        job_id = uuid.uuid4().hex[:12]
+        self.store.add({
+            'id': job_id,
+            'kind': kind,
+            'description': description,
+            'status': 'queued',
+            'created_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'progress': {},
+            'result': None,
+            'error': None,
+        })
+        self._executor.submit(self._run, job_id, function, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, function, args, kwargs):
+        self.store.update(job_id, status='running', started_at=datetime.now().isoformat())
+        try:
+            outcome = function(*args, progress=JobProgress(self.store, job_id), **kwargs)
+            success, message = outcome if isinstance(outcome, tuple) else (bool(outcome), None)
+            if success:
+                self.store.update(job_id, status='succeeded', result=message,
+                                  finished_at=datetime.now().isoformat())
+            else:
+                self.store.update(job_id, status='failed', error=message or 'Operation failed',
+                                  finished_at=datetime.now().isoformat())
+        except Exception as e:
+            self.store.update(job_id, status='failed', error=str(e), finished_at=datetime.now().isoformat())
+
+    def jobs(self):
+        return self.store.list()
+
+    def active(self):
+        return [job for job in self.store.list() if job['status'] not in FINISHED_STATES]
+
+
+def job_throughput(job):
+    """Rows per second of a job that reports `rows` progress, or None."""
+    rows = job['progress'].get('rows')
+    if not rows or not job['started_at']:
+        return None
+    end = datetime.fromisoformat(job['finished_at']) if job['finished_at'] else datetime.now()
+    seconds = (end - datetime.fromisoformat(job['started_at'])).total_seconds()
+    return rows / seconds if seconds > 0 else None
+
+
+def job_duration(job):
+    """Seconds a finished job ran for, or None."""
+    if not job['started_at'] or not job['finished_at']:
+        return None
+    return (datetime.fromisoformat(job['finished_at']) - datetime.fromisoformat(job['started_at'])).total_seconds()
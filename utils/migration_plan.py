@@ -0,0 +1,104 @@
+import re
+
+from utils.online_ddl import parse_alter_table
+
+# Rough throughput figures used to turn row counts and table sizes into durations.
+# They only need to be the right order of magnitude to plan maintenance windows.
+DML_ROWS_PER_SECOND = 50000
+REBUILD_BYTES_PER_SECOND = 50 * 1024 * 1024
+INDEX_BUILD_BYTES_PER_SECOND = 100 * 1024 * 1024
+
+DML_KINDS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# ALTER TABLE operations from most to least disruptive, with the lock MySQL takes
+ALTER_COST_CLASSES = [
+    ('copy', 'SHARED (writes blocked)', re.compile(
+        r'\b(?:MODIFY|CHANGE)\b|\bCONVERT\s+TO\b|\bENGINE\s*=|\bDROP\s+PRIMARY\s+KEY\b', re.IGNORECASE)),
+    ('rebuild', 'NONE (table rebuilt)', re.compile(
+        r'\bADD\s+(?:COLUMN\b|(?!(?:UNIQUE|FULLTEXT|SPATIAL|INDEX|KEY|CONSTRAINT|PRIMARY|FOREIGN|PARTITION)\b)`?\w)'
+        r'|\bDROP\s+(?:COLUMN\b|(?!(?:INDEX|KEY|FOREIGN|PRIMARY|CONSTRAINT|CHECK|PARTITION)\b)`?\w)'
+        r'|\bADD\s+PRIMARY\s+KEY\b|\bFORCE\b|\bROW_FORMAT\s*=', re.IGNORECASE)),
+    ('index', 'NONE', re.compile(
+        r'\bADD\s+(?:UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?(?:INDEX|KEY)\b|\bADD\s+(?:CONSTRAINT\b.*?\b)?FOREIGN\s+KEY\b',
+        re.IGNORECASE | re.DOTALL)),
+]
+
+_IDENTIFIER = r'(?:`(?:[^`]|``)+`|[\w$]+)'
+_TABLE_STATEMENTS = [
+    ('DROP', re.compile(rf'^\s*DROP\s+(?:TEMPORARY\s+)?TABLE\s+(?:IF\s+EXISTS\s+)?({_IDENTIFIER})', re.IGNORECASE)),
+    ('TRUNCATE', re.compile(rf'^\s*TRUNCATE\s+(?:TABLE\s+)?({_IDENTIFIER})', re.IGNORECASE)),
+    ('CREATE INDEX', re.compile(
+        rf'^\s*CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?INDEX\s+{_IDENTIFIER}\s+ON\s+({_IDENTIFIER})',
+        re.IGNORECASE)),
+    ('DROP INDEX', re.compile(rf'^\s*DROP\s+INDEX\s+{_IDENTIFIER}\s+ON\s+({_IDENTIFIER})', re.IGNORECASE)),
+]
+
+
+def statement_kind(statement):
+    """Return the leading keyword of a statement, upper-cased."""
+    match = re.match(r'\s*(\w+)', statement)
+    return match.group(1).upper() if match else ''
+
+
+def ddl_target(statement):
+    """
+    Find the table a DDL statement works on.
+
+    Returns:
+        tuple: (operation, table_name, alter_spec) or None when no existing table is targeted
+    """
+    parsed = parse_alter_table(statement)
+    if parsed:
+        _, table_name, alter_spec = parsed
+        return 'ALTER', table_name, alter_spec
+    for operation, pattern in _TABLE_STATEMENTS:
+        match = pattern.match(statement)
+        if match:
+            return operation, match.group(1).strip('`').replace('``', '`'), None
+    return None
+
+
+def classify_alter(alter_spec):
+    """Return (cost_class, lock) for an ALTER TABLE specification; 'metadata' when nothing heavier applies."""
+    for cost_class, lock, pattern in ALTER_COST_CLASSES:
+        if pattern.search(alter_spec):
+            return cost_class, lock
+    return 'metadata', 'metadata lock only'
+
+
+def summarize_explain(plan):
+    """
+    Reduce EXPLAIN output to an estimate of rows examined and the tables read by full scans.
+
+    Steps sharing an id form a nested-loop join: each step is read once per row
+    the steps before it produce (their rows times filtered %), so its rows are
+    multiplied by that fan-out. Separate SELECTs (subqueries, UNION parts) are added.
+
+    Args:
+        plan (list): EXPLAIN rows as dictionaries
+
+    Returns:
+        tuple: (int, list) - (Estimated rows examined, Tables scanned in full)
+    """
+    rows_examined = 0
+    full_scans = []
+    fanout = {}
+    for step in plan:
+        rows = int(step.get('rows') or 0)
+        prefix = fanout.get(step.get('id'), 1)
+        rows_examined += prefix * rows
+        filtered = step.get('filtered')
+        fanout[step.get('id')] = prefix * rows * (100 if filtered is None else float(filtered)) / 100
+        if step.get('type') == 'ALL' and step.get('table'):
+            full_scans.append(step['table'])
+    return round(rows_examined), full_scans
+
+
+def format_duration(seconds):
+    if seconds < 1:
+        return '<1s'
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
@@ -0,0 +1,150 @@
+import re
+
+_IDENTIFIER = r'(?:`(?:[^`]|``)+`|[\w$]+)'
+_ALTER_TABLE = re.compile(
+    rf'^\s*ALTER\s+TABLE\s+({_IDENTIFIER})(?:\s*\.\s*({_IDENTIFIER}))?\s+(.+)$',
+    re.IGNORECASE | re.DOTALL
+)
+_ALGORITHM_OR_LOCK = re.compile(r'\b(?:ALGORITHM|LOCK)\s*=', re.IGNORECASE)
+_STRING_LITERAL = re.compile(r"'[^'\\]*(?:\\.[^'\\]*)*'|\"[^\"\\]*(?:\\.[^\"\\]*)*\"")
+_CHANGE_COLUMN = re.compile(rf'\bCHANGE\s+(?:COLUMN\s+)?({_IDENTIFIER})\s+({_IDENTIFIER})', re.IGNORECASE)
+_RENAME = re.compile(r'\bRENAME\s+(?:COLUMN\b|TO\b|AS\b|(?!INDEX\b|KEY\b)[`\w$])', re.IGNORECASE)
+
+# Error codes MySQL returns when an ALTER cannot run with the requested ALGORITHM/LOCK
+ONLINE_DDL_UNSUPPORTED_ERRORS = (1845, 1846)
+
+# MySQL identifiers are limited to 64 characters
+_MAX_IDENTIFIER_LENGTH = 64
+
+
+def quote_identifier(name):
+    return '`' + name.replace('`', '``') + '`'
+
+
+def _unquote_identifier(name):
+    if name.startswith('`'):
+        return name[1:-1].replace('``', '`')
+    return name
+
+
+def parse_alter_table(statement):
+    """
+    Split an ALTER TABLE statement into its table and alter specification.
+
+    Returns:
+        tuple: (schema, table, alter_spec), schema is None when not qualified; None if
+            the statement is not an ALTER TABLE
+    """
+    match = _ALTER_TABLE.match(statement)
+    if not match:
+        return None
+    first, second, alter_spec = match.groups()
+    if second:
+        return _unquote_identifier(first), _unquote_identifier(second), alter_spec.strip()
+    return None, _unquote_identifier(first), alter_spec.strip()
+
+
+def inplace_alter(statement):
+    """Ask MySQL for a non-blocking ALTER unless the statement already picks an algorithm or lock."""
+    if _ALGORITHM_OR_LOCK.search(statement):
+        return statement
+    return f"{statement.rstrip()}, ALGORITHM=INPLACE, LOCK=NONE"
+
+
+def rename_clause(alter_spec):
+    """
+    Return the clause of an alter specification that renames a column or the table, or None.
+
+    CHANGE with an unchanged column name and RENAME INDEX/KEY are not renames.
+    """
+    spec = _STRING_LITERAL.sub("''", alter_spec)
+    for match in _CHANGE_COLUMN.finditer(spec):
+        old, new = match.groups()
+        if _unquote_identifier(old).lower() != _unquote_identifier(new).lower():
+            return match.group()
+    match = _RENAME.search(spec)
+    return match.group() if match else None
+
+
+def _derived_name(table, suffix):
+    return f"{table[:_MAX_IDENTIFIER_LENGTH - len(suffix)]}{suffix}"
+
+
+class ShadowTableCopy:
+    """
+    Statements for an online ALTER done by copying into a shadow table.
+
+    The shadow table is created with the new definition, triggers on the original
+    table mirror every write into it while existing rows are backfilled in primary
+    key order, and the two tables are swapped with a single atomic RENAME TABLE.
+    Only columns present in both definitions are copied; added columns take their
+    defaults and dropped columns are discarded. CREATE TABLE ... LIKE copies no
+    foreign keys and the original's own triggers would be dropped with it, so the
+    caller refuses tables with either, and renames (see rename_clause).
+    """
+
+    def __init__(self, table, alter_spec, primary_key):
+        self.table = table
+        self.alter_spec = alter_spec
+        self.primary_key = primary_key
+        self.shadow_table = _derived_name(f"_{table}", '_new')
+        self.old_table = _derived_name(f"_{table}", '_old')
+        self.triggers = {
+            action: _derived_name(f"mydb_{table}", f"_{action}")
+            for action in ('ins', 'upd', 'del')
+        }
+
+    def create_statements(self):
+        return [
+            f"CREATE TABLE {quote_identifier(self.shadow_table)} LIKE {quote_identifier(self.table)}",
+            f"ALTER TABLE {quote_identifier(self.shadow_table)} {self.alter_spec}",
+        ]
+
+    def trigger_statements(self, columns):
+        """CREATE TRIGGER statements capturing writes made while the backfill runs."""
+        table = quote_identifier(self.table)
+        shadow = quote_identifier(self.shadow_table)
+        column_list = ', '.join(quote_identifier(column) for column in columns)
+        new_values = ', '.join(f"NEW.{quote_identifier(column)}" for column in columns)
+        key = quote_identifier(self.primary_key)
+        replace_new = f"REPLACE INTO {shadow} ({column_list}) VALUES ({new_values})"
+        delete_old = f"DELETE IGNORE FROM {shadow} WHERE {key} <=> OLD.{key}"
+        return [
+            f"CREATE TRIGGER {quote_identifier(self.triggers['ins'])} AFTER INSERT ON {table} "
+            f"FOR EACH ROW {replace_new}",
+            f"CREATE TRIGGER {quote_identifier(self.triggers['upd'])} AFTER UPDATE ON {table} "
+            f"FOR EACH ROW BEGIN {delete_old}; {replace_new}; END",
+            f"CREATE TRIGGER {quote_identifier(self.triggers['del'])} AFTER DELETE ON {table} "
+            f"FOR EACH ROW {delete_old}",
+        ]
+
+    def next_boundary_query(self):
+        """Query for the key starting the chunk after the one beginning at %s (params: low, chunk_size)."""
+        key = quote_identifier(self.primary_key)
+        return (f"SELECT {key} FROM {quote_identifier(self.table)} WHERE {key} >= %s "
+                f"ORDER BY {key} LIMIT 1 OFFSET %s")
+
+    def backfill_statement(self, columns, bounded):
+        """
+        INSERT ... SELECT copying one chunk (params: low[, high]).
+
+        Rows already written by the triggers are newer than the copy, so they are
+        kept with INSERT IGNORE; the shared lock stops the chunk racing a write.
+        """
+        key = quote_identifier(self.primary_key)
+        column_list = ', '.join(quote_identifier(column) for column in columns)
+        condition = f"{key} >= %s AND {key} < %s" if bounded else f"{key} >= %s"
+        return (f"INSERT IGNORE INTO {quote_identifier(self.shadow_table)} ({column_list}) "
+                f"SELECT {column_list} FROM {quote_identifier(self.table)} "
+                f"WHERE {condition} LOCK IN SHARE MODE")
+
+    def swap_statement(self):
+        return (f"RENAME TABLE {quote_identifier(self.table)} TO {quote_identifier(self.old_table)}, "
+                f"{quote_identifier(self.shadow_table)} TO {quote_identifier(self.table)}")
+
+    def drop_trigger_statements(self):
+        return [f"DROP TRIGGER IF EXISTS {quote_identifier(name)}" for name in self.triggers.values()]
+
+    def cleanup_statements(self):
+        """Undo a copy that did not reach the swap."""
+        return self.drop_trigger_statements() + [f"DROP TABLE IF EXISTS {quote_identifier(self.shadow_table)}"]
@@ -0,0 +1,124 @@
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+HEADER_FONT = ('Helvetica-Bold', 14)
+BODY_FONT = ('Helvetica', 12)
+HEADER_ROW_HEIGHT = 32
+BODY_ROW_HEIGHT = 24
+CELL_PADDING = 6
+MARGIN = 36
+MAX_COLUMN_WIDTH = 220
+MIN_COLUMN_WIDTH = 36
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), HEADER_FONT[0]),
+    ('FONTSIZE', (0, 0), (-1, 0), HEADER_FONT[1]),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), BODY_FONT[0]),
+    ('FONTSIZE', (0, 1), (-1, -1), BODY_FONT[1]),
+    ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+    ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+
+def _cell_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode('utf-8', errors='replace')
+    return str(value).replace('\n', ' ')
+
+
+def _fit_text(text, width, font):
+    """Truncate text with '...' so it fits in the given width."""
+    if stringWidth(text, *font) <= width:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if stringWidth(text[:middle] + '...', *font) <= width:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + '...'
+
+
+class PaginatedPDFTable:
+    """
+    Write a table to PDF one page at a time.
+
+    Column widths are computed once from the header and a sample of rows, every page
+    is laid out as its own fixed-height Table and drawn straight onto the canvas, so
+    layout time is linear in the number of rows and only one page of rows is held
+    in memory.
+    """
+
+    def __init__(self, file_path, columns, sample_rows, title=None):
+        natural_widths = []
+        for index, column in enumerate(columns):
+            width = stringWidth(_cell_text(column), *HEADER_FONT)
+            for row in sample_rows:
+                width = max(width, stringWidth(_cell_text(row[index]), *BODY_FONT))
+            natural_widths.append(min(max(width + 2 * CELL_PADDING, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH))
+
+        # Switch to landscape for wide tables, then shrink columns proportionally if still too wide
+        pagesize = letter
+        if sum(natural_widths) > letter[0] - 2 * MARGIN:
+            pagesize = landscape(letter)
+        available_width = pagesize[0] - 2 * MARGIN
+        scale = min(1.0, available_width / sum(natural_widths)) if natural_widths else 1.0
+        self.column_widths = [width * scale for width in natural_widths]
+
+        self.pagesize = pagesize
+        self.title = title
+        self.header = [
+            _fit_text(_cell_text(column), width - 2 * CELL_PADDING, HEADER_FONT)
+            for column, width in zip(columns, self.column_widths)
+        ]
+        self.rows_per_page = max(1, int((pagesize[1] - 2 * MARGIN - HEADER_ROW_HEIGHT) // BODY_ROW_HEIGHT))
+        self.page_count = 0
+        self._pending = []
+        self._canvas = canvas.Canvas(file_path, pagesize=pagesize, pageCompression=1)
+        if title:
+            self._canvas.setTitle(title)
+
+    def add_rows(self, rows):
+        """Buffer rows and draw every page that is complete."""
+        for row in rows:
+            self._pending.append([
+                _fit_text(_cell_text(value), width - 2 * CELL_PADDING, BODY_FONT)
+                for value, width in zip(row, self.column_widths)
+            ])
+            if len(self._pending) == self.rows_per_page:
+                self._draw_page()
+
+    def _draw_page(self):
+        data = [self.header] + self._pending
+        table = Table(
+            data,
+            colWidths=self.column_widths,
+            rowHeights=[HEADER_ROW_HEIGHT] + [BODY_ROW_HEIGHT] * len(self._pending)
+        )
+        table.setStyle(TABLE_STYLE)
+        _, height = table.wrapOn(self._canvas, self.pagesize[0] - 2 * MARGIN, self.pagesize[1] - 2 * MARGIN)
+        table.drawOn(self._canvas, MARGIN, self.pagesize[1] - MARGIN - height)
+
+        self.page_count += 1
+        self._canvas.setFont('Helvetica', 8)
+        self._canvas.drawRightString(self.pagesize[0] - MARGIN, MARGIN / 2, f"Page {self.page_count}")
+        self._canvas.showPage()
+        self._pending = []
+
+    def close(self):
+        if self._pending or not self.page_count:
+            self._draw_page()
+        self._canvas.save()
@@ -0,0 +1,129 @@
+import math
+import threading
+from contextlib import contextmanager
+
+# performance_schema timers count picoseconds
+PICOSECONDS_PER_SECOND = 10 ** 12
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+# SHOW GLOBAL STATUS works whether or not performance_schema is enabled or readable
+SERVER_STATUS_QUERY = """
+    SHOW GLOBAL STATUS
+    WHERE Variable_name IN ('Threads_connected', 'Threads_running', 'Max_used_connections')
+"""
+
+# Totals per schema since the digest statistics were last reset
+SCHEMA_LOAD_QUERY = """
+    SELECT SCHEMA_NAME, SUM(COUNT_STAR), SUM(SUM_TIMER_WAIT), SUM(SUM_ROWS_EXAMINED)
+    FROM performance_schema.events_statements_summary_by_digest
+    WHERE SCHEMA_NAME IN ({schemas})
+    GROUP BY SCHEMA_NAME
+    ORDER BY SUM(SUM_TIMER_WAIT) DESC
+"""
+
+SLOW_QUERIES_QUERY = """
+    SELECT SCHEMA_NAME, DIGEST_TEXT, COUNT_STAR, AVG_TIMER_WAIT, MAX_TIMER_WAIT,
+           SUM_ROWS_EXAMINED, SUM_ROWS_SENT, LAST_SEEN
+    FROM performance_schema.events_statements_summary_by_digest
+    WHERE SCHEMA_NAME IN ({schemas}) AND LAST_SEEN >= NOW() - INTERVAL %s MINUTE
+    ORDER BY MAX_TIMER_WAIT DESC
+    LIMIT %s
+"""
+
+# TABLE_ROWS is InnoDB's estimate, so row counts are approximate but cost no scan
+SCHEMA_SIZE_QUERY = """
+    SELECT TABLE_SCHEMA, COUNT(*), COALESCE(SUM(TABLE_ROWS), 0),
+           COALESCE(SUM(DATA_LENGTH), 0), COALESCE(SUM(INDEX_LENGTH), 0)
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA IN ({schemas}) AND TABLE_TYPE = 'BASE TABLE'
+    GROUP BY TABLE_SCHEMA
+"""
+
+
+def schema_query(query, schemas):
+    """Fill the {schemas} placeholder list of one of the queries above for the given schema names."""
+    return query.format(schemas=', '.join(['%s'] * len(schemas)))
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def latency_summary(durations):
+    """
+    Latency percentiles per command.
+
+    Args:
+        durations (dict): Command name to a list of durations in seconds
+
+    Returns:
+        list: One dict per command with count, total, max and p50/p90/p95/p99,
+            the commands taking the most time in total first
+    """
+    summary = []
+    for command, values in durations.items():
+        values = sorted(values)
+        if not values:
+            continue
+        row = {'command': command, 'count': len(values), 'total': sum(values), 'max': values[-1]}
+        for percent in LATENCY_PERCENTILES:
+            row[f'p{percent}'] = percentile(values, percent)
+        summary.append(row)
+    return sorted(summary, key=lambda row: row['total'], reverse=True)
+
+
+class BorrowCounter:
+    """Counts the connections currently borrowed from a pool, across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+
+    @contextmanager
+    def borrowed(self):
+        """Count one connection as in use until the block exits."""
+        with self._lock:
+            self.in_use += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_use -= 1
+
+
+def pool_stats(pool, counter):
+    """
+    Connections of a MySQLConnectionPool that are idle or borrowed.
+
+    Args:
+        pool: The pool, for its name and size
+        counter (BorrowCounter): Counts the connections borrowed from it
+    """
+    in_use = min(counter.in_use, pool.pool_size)
+    return {'name': pool.pool_name, 'size': pool.pool_size, 'idle': pool.pool_size - in_use, 'in_use': in_use}
+
+
+def row_growth(samples):
+    """
+    Row count change per schema between the first and last of a series of samples.
+
+    Args:
+        samples (list): (unix_time, {schema: rows}) pairs, oldest first
+
+    Returns:
+        dict: {schema: (rows added since the first sample, rows per minute)}
+    """
+    if len(samples) < 2:
+        return {}
+    (first_time, first), (last_time, last) = samples[0], samples[-1]
+    minutes = (last_time - first_time) / 60
+    growth = {}
+    for schema, rows in last.items():
+        if schema in first:
+            delta = rows - first[schema]
+            growth[schema] = (delta, delta / minutes if minutes > 0 else None)
+    return growth
@@ -0,0 +1,211 @@
+import threading
+import time
+
+from mysql.connector import Error
+
+DEFAULT_MAX_EXECUTION_MS = 30000
+DEFAULT_QUERY_PAGE_SIZE = 500
+# An open result holds a connection (and an InnoDB read view); give it up after this long unused
+QUERY_IDLE_TIMEOUT = 300
+
+# MySQL error code for a SELECT stopped by MAX_EXECUTION_TIME
+QUERY_TIMED_OUT = 3024
+
+
+class QueryRun:
+    """
+    One statement executing on its own connection in a background thread.
+
+    Rows are fetched from an unbuffered result a page at a time, only as far as
+    they have been asked for, so a huge result never has to be read in full.
+    SELECTs are bounded by MAX_EXECUTION_TIME; any statement can be stopped with
+    cancel(), which issues KILL QUERY from another connection.
+
+    state is one of 'executing', 'fetching', 'ready' (more rows may follow),
+    'done', 'failed' or 'cancelled'.
+    """
+
+    def __init__(self, connect, statement, max_execution_ms=DEFAULT_MAX_EXECUTION_MS,
+                 page_size=DEFAULT_QUERY_PAGE_SIZE):
+        """
+        Args:
+            connect (callable): Returns a new connection for the statement to run on
+            statement (str): SQL statement to execute
+            max_execution_ms (int): Timeout applied to SELECT statements
+            page_size (int): Rows fetched before waiting for request_more()
+        """
+        self.statement = statement
+        self.max_execution_ms = max_execution_ms
+        self.page_size = page_size
+        self.state = 'executing'
+        self.columns = []
+        self.rows = []
+        self.has_more = False
+        # False when the result was closed before every row was read
+        self.complete = False
+        self.rowcount = None
+        self.error = None
+        self.connection_id = None
+        self.thread_id = None
+        self.rows_examined = None
+        self.started = time.monotonic()
+        self.finished = None
+        self._connect = connect
+        self._wanted = page_size
+        self._closing = False
+        self._cancelled = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        return self.state in ('executing', 'fetching')
+
+    @property
+    def elapsed(self):
+        """Seconds spent executing and fetching so far."""
+        return (time.monotonic() if self.busy or self.finished is None else self.finished) - self.started
+
+    def request_more(self, count=None):
+        """Ask for another page of rows."""
+        with self._condition:
+            if self.state != 'ready':
+                return
+            self._wanted = len(self.rows) + (count or self.page_size)
+            self.state = 'fetching'
+            self._condition.notify()
+
+    def cancel(self, cursor):
+        """
+        Stop the statement and release its connection.
+
+        Args:
+            cursor: Cursor on a different connection, used to issue KILL QUERY
+        """
+        with self._condition:
+            if self.state in ('done', 'failed', 'cancelled'):
+                return
+            self._cancelled = True
+            self._closing = True
+            self._condition.notify()
+        if self.connection_id is not None:
+            try:
+                cursor.execute(f"KILL QUERY {int(self.connection_id)}")
+            except Error:
+                # The statement finished in the meantime
+                pass
+
+    def close(self):
+        """Release the connection of a result that is no longer wanted."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+
+    def poll_rows_examined(self, cursor):
+        """
+        Look up the rows the server has examined for the statement so far.
+
+        Args:
+            cursor: Cursor on a different connection
+
+        Returns:
+            int: Rows examined, or None when performance_schema is not available
+        """
+        if self.thread_id is None or not self.busy:
+            return self.rows_examined
+        try:
+            cursor.execute(
+                "SELECT ROWS_EXAMINED FROM performance_schema.events_statements_current WHERE THREAD_ID = %s",
+                (self.thread_id,)
+            )
+            row = cursor.fetchall()
+        except Error:
+            return self.rows_examined
+        if row and row[0][0] is not None:
+            self.rows_examined = int(row[0][0])
+        return self.rows_examined
+
+    def _record_rows_examined(self, cursor):
+        """Read the finished statement's rows examined on its own connection."""
+        if self.thread_id is None:
+            return
+        try:
+            cursor.execute("""
+                SELECT ROWS_EXAMINED FROM performance_schema.events_statements_history
+                WHERE THREAD_ID = %s ORDER BY EVENT_ID DESC LIMIT 1
+            """, (self.thread_id,))
+            row = cursor.fetchall()
+        except Error:
+            return
+        if row and row[0][0] is not None:
+            self.rows_examined = int(row[0][0])
+
+    def _run(self):
+        connection = None
+        exhausted = False
+        try:
+            connection = self._connect()
+            cursor = connection.cursor()
+            cursor.execute("SELECT CONNECTION_ID()")
+            self.connection_id = cursor.fetchall()[0][0]
+            try:
+                cursor.execute(
+                    "SELECT THREAD_ID FROM performance_schema.threads WHERE PROCESSLIST_ID = CONNECTION_ID()"
+                )
+                row = cursor.fetchall()
+                self.thread_id = row[0][0] if row else None
+            except Error:
+                pass
+            cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {int(self.max_execution_ms)}")
+
+            cursor.execute(self.statement)
+            if not cursor.with_rows:
+                self.rowcount = cursor.rowcount
+                exhausted = True
+            else:
+                self.columns = list(cursor.column_names)
+                self.has_more = True
+                while True:
+                    with self._condition:
+                        if len(self.rows) >= self._wanted and not self._closing:
+                            self.state = 'ready'
+                            self.finished = time.monotonic()
+                            self._condition.wait(QUERY_IDLE_TIMEOUT)
+                            if self.state == 'ready':
+                                # Nobody asked for more in time
+                                self._closing = True
+                        if self._closing:
+                            self.has_more = False
+                            break
+                        self.state = 'fetching'
+                        count = self._wanted - len(self.rows)
+                    batch = cursor.fetchmany(count)
+                    self.rows.extend(batch)
+                    if len(batch) < count:
+                        self.has_more = False
+                        exhausted = True
+                        break
+
+            if exhausted:
+                self.complete = True
+                self._record_rows_examined(cursor)
+            self.state = 'cancelled' if self._cancelled else 'done'
+        except Error as e:
+            if self._cancelled:
+                self.has_more = False
+                self.state = 'cancelled'
+            else:
+                self.error = ("Query exceeded the execution time limit" if e.errno == QUERY_TIMED_OUT else str(e))
+                self.state = 'failed'
+        except Exception as e:
+            self.error = str(e)
+            self.state = 'failed'
+        finally:
+            self.finished = time.monotonic()
+            if connection is not None:
+                try:
+                    # Also abandons an unread result; the server stops sending it
+                    connection.close()
+                except Exception:
+                    pass
@@ -0,0 +1,76 @@
+import re
+
+from utils.online_ddl import quote_identifier
+
+# Delimiter written around trigger and routine bodies, which contain ';'
+ROUTINE_DELIMITER = '$$'
+
+# Triggers in the order MySQL fires them, so recreating them in sequence keeps that order
+TRIGGERS_QUERY = """
+    SELECT TRIGGER_NAME FROM INFORMATION_SCHEMA.TRIGGERS
+    WHERE TRIGGER_SCHEMA = %s
+    ORDER BY EVENT_OBJECT_TABLE, ACTION_TIMING, EVENT_MANIPULATION, ACTION_ORDER
+"""
+
+ROUTINES_QUERY = """
+    SELECT ROUTINE_NAME, ROUTINE_TYPE FROM INFORMATION_SCHEMA.ROUTINES
+    WHERE ROUTINE_SCHEMA = %s
+    ORDER BY ROUTINE_TYPE, ROUTINE_NAME
+"""
+
+_QUOTED = r'`(?:[^`]|``)*`'
+_DEFINER = re.compile(rf"\s+DEFINER\s*=\s*(?:{_QUOTED}|'[^']*'|[\w.%-]+)@(?:{_QUOTED}|'[^']*'|[\w.%-]+)",
+                      re.IGNORECASE)
+_SQL_SECURITY_DEFINER = re.compile(r'\s+SQL\s+SECURITY\s+DEFINER\b', re.IGNORECASE)
+
+
+def strip_definer(ddl):
+    """
+    Remove DEFINER=user@host (and the default SQL SECURITY DEFINER) from a CREATE statement.
+
+    The account that created the object may not exist where the DDL is replayed,
+    so the object is created with the account applying it instead. SQL SECURITY
+    INVOKER is kept.
+    """
+    return _SQL_SECURITY_DEFINER.sub('', _DEFINER.sub('', ddl, count=1))
+
+
+def unqualify(ddl, db_name):
+    """Drop the `db_name`. qualifier SHOW CREATE VIEW puts on every table and column reference."""
+    return ddl.replace(f"{quote_identifier(db_name)}.", '')
+
+
+def order_views(views, db_name):
+    """
+    Order views so each comes after the views it selects from.
+
+    Args:
+        views (list): (name, ddl) pairs as returned by SHOW CREATE VIEW, whose
+            references are qualified with `db_name`
+        db_name (str): Database the DDL was read from
+
+    Returns:
+        list: The same pairs, dependencies first, otherwise by name
+    """
+    prefix = quote_identifier(db_name) + '.'
+    ddl_by_name = dict(views)
+    depends_on = {
+        name: {other for other in ddl_by_name
+               if other != name and prefix + quote_identifier(other) in ddl}
+        for name, ddl in ddl_by_name.items()
+    }
+
+    ordered = []
+    remaining = sorted(ddl_by_name)
+    while remaining:
+        ready = [name for name in remaining if not depends_on[name] - set(ordered)]
+        # A cycle cannot be created in MySQL; fall back to name order rather than loop
+        batch = ready or remaining
+        ordered.extend(batch)
+        remaining = [name for name in remaining if name not in batch]
+    return [(name, ddl_by_name[name]) for name in ordered]
+
+
+def delimited(ddl):
+    """Wrap a trigger or routine definition in DELIMITER commands so its body's ';' do not split it."""
+    return f"DELIMITER {ROUTINE_DELIMITER}\n{ddl}\n{ROUTINE_DELIMITER}\nDELIMITER ;\n"
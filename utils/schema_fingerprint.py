@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import threading
+
+# Normalized information_schema rows that make up a table's fingerprint, as
+# (category, query); every query returns TABLE_NAME first and takes the schema name
+FINGERPRINT_QUERIES = [
+    ('column', """
+        SELECT TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, COLUMN_TYPE, IS_NULLABLE,
+               COLUMN_DEFAULT, EXTRA, COLLATION_NAME
+        FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = %s
+    """),
+    ('index', """
+        SELECT TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX, COLUMN_NAME, NON_UNIQUE, INDEX_TYPE, SUB_PART
+        FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = %s
+    """),
+    ('foreign_key', """
+        SELECT TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION, COLUMN_NAME,
+               REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+    """),
+]
+
+# Bookkeeping tables that change outside of migrations
+IGNORED_TABLES = ('schema_migrations',)
+
+
+def _normalize(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode('utf-8', errors='replace')
+    return str(value)
+
+
+def fingerprint_rows(rows_by_category):
+    """
+    Hash information_schema rows into per-table digests and one overall digest.
+
+    Args:
+        rows_by_category (dict): Category name to rows whose first value is the table name
+
+    Returns:
+        dict: {'fingerprint': str, 'tables': {table_name: digest}}
+    """
+    lines_by_table = {}
+    for category, rows in rows_by_category.items():
+        for row in rows:
+            values = [_normalize(value) for value in row]
+            if values[0] in IGNORED_TABLES:
+                continue
+            lines_by_table.setdefault(values[0], []).append('\x1f'.join([category] + values[1:]))
+
+    tables = {
+        table: hashlib.sha256('\n'.join(sorted(lines)).encode('utf-8')).hexdigest()
+        for table, lines in lines_by_table.items()
+    }
+    overall = hashlib.sha256(
+        '\n'.join(f"{table}\x1f{digest}" for table, digest in sorted(tables.items())).encode('utf-8')
+    ).hexdigest()
+    return {'fingerprint': overall, 'tables': tables}
+
+
+def compare_fingerprints(recorded, live):
+    """
+    Compare two fingerprints table by table.
+
+    Returns:
+        dict: {'added': [...], 'removed': [...], 'changed': [...]} table names, all empty when equal
+    """
+    if recorded['fingerprint'] == live['fingerprint']:
+        return {'added': [], 'removed': [], 'changed': []}
+    recorded_tables, live_tables = recorded['tables'], live['tables']
+    return {
+        'added': sorted(set(live_tables) - set(recorded_tables)),
+        'removed': sorted(set(recorded_tables) - set(live_tables)),
+        'changed': sorted(
+            table for table in set(live_tables) & set(recorded_tables)
+            if live_tables[table] != recorded_tables[table]
+        ),
+    }
+
+
+# Branches migrated concurrently record their fingerprints into the same file
+_store_lock = threading.Lock()
+
+
+class FingerprintStore:
+    """Schema fingerprints recorded per branch after migrations are applied, stored as JSON."""
+
+    def __init__(self, path='.mydb/schema_fingerprints.json'):
+        self.path = path
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def get(self, branch):
+        return self._load().get(branch)
+
+    def set(self, branch, fingerprint, migration_number=None):
+        with _store_lock:
+            fingerprints = self._load()
+            fingerprints[branch] = dict(fingerprint, migration_number=migration_number)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(fingerprints, f, indent=4)
+            os.replace(temp_path, self.path)
@@ -0,0 +1,217 @@
+import queue
+import re
+import threading
+
+DEFAULT_DELIMITER = ';'
+DIRECTIVE_PREFIX = 'mydb:'
+
+# Text up to and including the closing quote of a literal that spans lines. A doubled
+# quote ('it''s') is read as a close immediately followed by a new open, which leaves
+# the scanner in the same state, so it needs no special case.
+_QUOTE_END = {
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*'", re.DOTALL),
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL),
+    '`': re.compile(r'[^`]*`'),
+}
+_DELIMITER_COMMAND = re.compile(r'^\s*DELIMITER\s+(\S+)', re.IGNORECASE)
+_DIRECTIVE = re.compile(r'--\s+' + DIRECTIVE_PREFIX + r'(\S+)(.*)')
+
+
+_LITERALS = [
+    r"'[^'\\]*(?:\\.[^'\\]*)*'",
+    r'"[^"\\]*(?:\\.[^"\\]*)*"',
+    r'`[^`]*`',
+]
+
+
+def _scanner(delimiter):
+    """
+    Build the two regexes used outside literals and comments.
+
+    The first consumes ordinary text and complete literals in one match; the
+    second recognises what stopped it: the delimiter, a comment start, or an
+    opening quote whose literal continues on the next line.
+    """
+    # Characters that may start something special, with the continuations that make them special
+    lookaheads = {'-': [r'-(?=\s|$)'], '/': [r'\*']}
+    always_special = {"'", '"', '`', '#'}
+    if len(delimiter) == 1:
+        always_special.add(delimiter)
+    else:
+        lookaheads.setdefault(delimiter[0], []).append(re.escape(delimiter[1:]))
+
+    excluded = ''.join(re.escape(c) for c in always_special | set(lookaheads))
+    alternatives = [f'[^{excluded}]+'] + _LITERALS + [
+        f"{re.escape(c)}(?!{'|'.join(continuations)})"
+        for c, continuations in lookaheads.items() if c not in always_special
+    ]
+    text = re.compile(f"(?:{'|'.join(alternatives)})*", re.DOTALL)
+    special = re.compile('|'.join([re.escape(delimiter), r'--(?=\s|$)', '#', r'/\*', '[\'"`]']))
+    return text, special
+
+
+def iter_sql_statements(lines, delimiter=DEFAULT_DELIMITER):
+    """
+    Yield SQL statements one at a time from an iterable of lines.
+
+    Delimiters inside quoted strings, identifiers and comments are ignored, comments
+    are stripped (except /*! ... */ and /*+ ... */, which MySQL executes, and
+    `-- mydb:` directives, see split_directives), and DELIMITER commands switch the
+    statement terminator like the mysql client does.
+    Only the statement currently being read is held in memory.
+
+    Args:
+        lines (iterable): Lines of SQL text, e.g. an open file
+        delimiter (str): Initial statement delimiter
+
+    Yields:
+        str: Each statement without its trailing delimiter
+    """
+    text, special = _scanner(delimiter)
+    parts = []
+    quote = None
+    in_comment = False
+    keep_comment = False
+
+    for line in lines:
+        if quote is None and not in_comment and not any(part.strip() for part in parts):
+            command = _DELIMITER_COMMAND.match(line)
+            if command:
+                delimiter = command.group(1)
+                text, special = _scanner(delimiter)
+                continue
+
+        position = 0
+        length = len(line)
+        while position < length:
+            if in_comment:
+                end = line.find('*/', position)
+                if end == -1:
+                    if keep_comment:
+                        parts.append(line[position:])
+                    break
+                if keep_comment:
+                    parts.append(line[position:end + 2])
+                in_comment = False
+                position = end + 2
+                continue
+
+            if quote:
+                match = _QUOTE_END[quote].match(line, position)
+                if not match:
+                    parts.append(line[position:])
+                    break
+                parts.append(match.group())
+                quote = None
+                position = match.end()
+                continue
+
+            # Ordinary text and complete literals are consumed in one match; text is
+            # only sliced off at delimiters, comments and line ends
+            end = text.match(line, position).end()
+            match = special.match(line, end) if end < length else None
+            if not match:
+                parts.append(line[position:])
+                break
+
+            parts.append(line[position:end])
+            token = match.group()
+            position = match.end()
+            if token == delimiter:
+                statement = ''.join(parts).strip()
+                if statement:
+                    yield statement
+                parts = []
+            elif token in _QUOTE_END:
+                quote = token
+                parts.append(token)
+            elif token == '/*':
+                in_comment = True
+                keep_comment = line.startswith(('/*!', '/*+'), end)
+                if keep_comment:
+                    parts.append(token)
+            else:
+                # '--' or '#': the rest of the line is a comment
+                if token == '--' and line.startswith(DIRECTIVE_PREFIX, len(line) - len(line[position:].lstrip())):
+                    parts.append('-- ' + line[position:].strip())
+                parts.append('\n')
+                break
+
+    statement = ''.join(parts).strip()
+    if statement:
+        yield statement
+
+
+def split_directives(statement):
+    """
+    Separate the `-- mydb:` directive lines written in front of a statement.
+
+    For example `-- mydb:chunked by id size 5000` gives {'chunked': ['by', 'id', 'size', '5000']}.
+
+    Args:
+        statement (str): Statement as yielded by iter_sql_statements
+
+    Returns:
+        tuple: (dict, str) - (Directive name to argument list, Statement without the directives)
+    """
+    directives = {}
+    lines = statement.split('\n')
+    index = 0
+    while index < len(lines):
+        line = lines[index].strip()
+        match = _DIRECTIVE.match(line)
+        if match:
+            directives[match.group(1).lower()] = match.group(2).split()
+        elif line:
+            break
+        index += 1
+    return directives, '\n'.join(lines[index:]).strip()
+
+
+def prefetch(iterable, size=64):
+    """
+    Produce items from a background thread into a bounded queue.
+
+    Lets the next statements be read and tokenized while the current one executes,
+    without reading more than `size` items ahead.
+    """
+    items = queue.Queue(maxsize=size)
+    done = object()
+    stop = threading.Event()
+    errors = []
+
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        items.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            while not stop.is_set():
+                try:
+                    items.put(done, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                break
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        # Unblock the producer if the consumer stopped early
+        stop.set()
+        thread.join()
@@ -0,0 +1,77 @@
+from utils.online_ddl import quote_identifier
+
+NUMERIC_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'decimal', 'float', 'double')
+# Large values stored off-page; counting them would read every value, so they are skipped
+LOB_TYPES = ('tinyblob', 'blob', 'mediumblob', 'longblob', 'tinytext', 'text', 'mediumtext', 'longtext',
+             'json', 'geometry')
+
+COLUMNS_QUERY = """
+    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = %s
+    ORDER BY TABLE_NAME, ORDINAL_POSITION
+"""
+
+
+class TableAnalysis:
+    """
+    Aggregates for one table computed in a single scan.
+
+    Every column's non-null count and MIN/MAX/AVG of the numeric columns are read
+    by one SELECT, optionally over only the first `sample_rows` rows.
+    """
+
+    def __init__(self, table, columns):
+        """
+        Args:
+            table (str): Table name
+            columns (list): (column_name, data_type) pairs in table order
+        """
+        self.table = table
+        self.columns = [name for name, _ in columns]
+        self.counted_columns = [name for name, data_type in columns if data_type.lower() not in LOB_TYPES]
+        self.numeric_columns = [name for name, data_type in columns if data_type.lower() in NUMERIC_TYPES]
+
+    def query(self, sample_rows=None):
+        aggregates = ['COUNT(*)']
+        aggregates += [f"COUNT({quote_identifier(column)})" for column in self.counted_columns]
+        for column in self.numeric_columns:
+            quoted = quote_identifier(column)
+            aggregates += [f"MIN({quoted})", f"MAX({quoted})", f"AVG({quoted})"]
+
+        source = quote_identifier(self.table)
+        if sample_rows:
+            read_columns = list(dict.fromkeys(self.counted_columns + self.numeric_columns))
+            column_list = ', '.join(quote_identifier(column) for column in read_columns) or '1'
+            source = f"(SELECT {column_list} FROM {source} LIMIT {int(sample_rows)}) AS sample"
+        return f"SELECT {', '.join(aggregates)} FROM {source}"
+
+    def parse(self, row):
+        """
+        Split the single result row of query() into named results.
+
+        Returns:
+            dict: {'rows': int, 'columns': [...], 'non_null': {column: int},
+                'numeric': {column: {'min', 'max', 'avg'}}}
+        """
+        values = list(row)
+        result = {'rows': int(values.pop(0)), 'columns': self.columns, 'non_null': {}, 'numeric': {}}
+        for column in self.counted_columns:
+            result['non_null'][column] = int(values.pop(0))
+        for column in self.numeric_columns:
+            minimum, maximum, average = values[:3]
+            del values[:3]
+            result['numeric'][column] = {
+                'min': minimum,
+                'max': maximum,
+                'avg': float(average) if average is not None else None,
+            }
+        return result
+
+
+def group_columns(rows):
+    """Group COLUMNS_QUERY rows into {table_name: [(column_name, data_type), ...]}."""
+    columns = {}
+    for table, column, data_type in rows:
+        columns.setdefault(table, []).append((column, data_type))
+    return columns
@@ -0,0 +1,116 @@
+from utils.online_ddl import quote_identifier
+
+FILTER_OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'LIKE', 'NOT LIKE', 'IS NULL', 'IS NOT NULL')
+_UNARY_OPERATORS = ('IS NULL', 'IS NOT NULL')
+
+
+def filter_condition(column, operator, value=None):
+    """
+    Build one parameterized WHERE condition.
+
+    Returns:
+        tuple: (str, list) - (Condition, Parameters)
+    """
+    if operator not in FILTER_OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {operator}")
+    if operator in _UNARY_OPERATORS:
+        return f"{quote_identifier(column)} {operator}", []
+    return f"{quote_identifier(column)} {operator} %s", [value]
+
+
+class TablePage:
+    """
+    Queries for reading a table one page at a time.
+
+    Tables with a primary key are paged by keyset: rows are ordered by the sort
+    column followed by the key, and each page starts strictly after the last row
+    of the previous one, so every page costs the same however deep it is. Tables
+    without a primary key fall back to LIMIT/OFFSET.
+    """
+
+    def __init__(self, table, columns, key_columns, sort_column=None, descending=False, filters=None):
+        self.table = table
+        self.key_columns = list(key_columns)
+        self.descending = descending
+        self.filters = list(filters or [])
+        self.order_columns = list(self.key_columns)
+        if sort_column and sort_column not in self.key_columns:
+            self.order_columns.insert(0, sort_column)
+        # The ordering columns are always read, since the next page starts from their values
+        self.columns = list(columns) + [column for column in self.order_columns if column not in columns]
+
+    @property
+    def keyset(self):
+        return bool(self.key_columns)
+
+    def _filter_clause(self):
+        conditions, params = [], []
+        for column, operator, value in self.filters:
+            condition, condition_params = filter_condition(column, operator, value)
+            conditions.append(condition)
+            params.extend(condition_params)
+        return conditions, params
+
+    def _seek_condition(self, after):
+        """Rows ordered after `after`, the ordering column values of the last row read."""
+        alternatives, params = [], []
+        for position, (column, value) in enumerate(zip(self.order_columns, after)):
+            column_sql = quote_identifier(column)
+            # NULLs sort first ascending and last descending
+            if value is None:
+                if self.descending:
+                    continue
+                greater, greater_params = f"{column_sql} IS NOT NULL", []
+            elif self.descending:
+                greater, greater_params = f"({column_sql} < %s OR {column_sql} IS NULL)", [value]
+            else:
+                greater, greater_params = f"{column_sql} > %s", [value]
+
+            equal = [f"{quote_identifier(previous)} <=> %s" for previous in self.order_columns[:position]]
+            alternatives.append('(' + ' AND '.join(equal + [greater]) + ')')
+            params.extend(list(after[:position]) + greater_params)
+
+        if not alternatives:
+            return '0 = 1', []
+        return '(' + ' OR '.join(alternatives) + ')', params
+
+    def query(self, page_size, after=None, offset=0):
+        """
+        SELECT for one page, reading one extra row to tell whether another page follows.
+
+        Args:
+            page_size (int): Rows per page
+            after (tuple): Ordering column values of the last row of the previous page (keyset)
+            offset (int): Rows to skip (tables without a primary key)
+
+        Returns:
+            tuple: (str, list) - (Query, Parameters)
+        """
+        conditions, params = self._filter_clause()
+        if self.keyset and after is not None:
+            condition, seek_params = self._seek_condition(after)
+            conditions.append(condition)
+            params.extend(seek_params)
+
+        direction = 'DESC' if self.descending else 'ASC'
+        sql = f"SELECT {', '.join(quote_identifier(column) for column in self.columns)} FROM {quote_identifier(self.table)}"
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        if self.order_columns:
+            sql += ' ORDER BY ' + ', '.join(f"{quote_identifier(column)} {direction}" for column in self.order_columns)
+        sql += f" LIMIT {int(page_size) + 1}"
+        if not self.keyset and offset:
+            sql += f" OFFSET {int(offset)}"
+        return sql, params
+
+    def count_query(self):
+        """Query whose EXPLAIN estimates how many rows match the filters."""
+        conditions, params = self._filter_clause()
+        sql = f"SELECT * FROM {quote_identifier(self.table)}"
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        return sql, params
+
+    def after(self, row):
+        """Ordering column values of a row (a dict), to start the following page from."""
+        return tuple(row[column] for column in self.order_columns)